@@ -0,0 +1,62 @@
+# Local stand-in for the PointSet API, serving point sets over HTTP/1.1 keep-alive connections
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandInPSM(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, points : dict[str, bytes]) -> None:
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.points = points
+        self.connections = 0
+        self.requests = 0
+        self.delay = 0.0
+        self.keep_alive = True  # False answers with "Connection: close"
+        self.drop = False       # True closes each connection after its response, without telling the client
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandInPSM":
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server : StandInPSM
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self) -> None:
+        with self.server.lock:
+            self.server.requests += 1
+        time.sleep(self.server.delay)
+        point_set_id = self.path.rsplit("/", 1)[-1]
+        if point_set_id in self.server.points:
+            status, body = 200, self.server.points[point_set_id]
+        else:
+            status, body = 404, b'{"code":"NOT_FOUND","message":"The requested resource could not be found"}'
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        if not self.server.keep_alive:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.drop:
+            self.close_connection = True
+
+    def log_message(self, format : str, *args) -> None:
+        pass
@@ -1,12 +1,14 @@
+import asyncio
 import re
 import os
-import urllib.request as req
-from urllib.error import URLError
 from io import BytesIO
 
 import pytest
 from datasets import IDS, POINTS, UNKNOWN_ID, MALFORMED_ID
+from psm_server import StandInPSM
 
+from triangulator import PSM
+from triangulator.connections import AsyncConnectionPool, ConnectionPool
 from triangulator.pointset import PointSet
 from triangulator.PSM import PointSetManager
 
@@ -28,14 +30,9 @@ class MockResponse:
         self._data.close()
 
 
-def mocked_urlopen(url : str|req.Request, data = None,
-    timeout: float | None = None, *, context = None):
+def mocked_urlopen(url : str):
     # Extract point_set_id from URL
-    if isinstance(url, req.Request):
-        url_str = url.full_url
-    else:
-        url_str = url
-    point_set_id = url_str.rsplit('/', 1)[-1]
+    point_set_id = url.rsplit('/', 1)[-1]
     if not RE_UUID.match(point_set_id):
         message = b'{"code":"BAD_REQUEST","message":"Invalid point set ID \''+ point_set_id.encode() + b'\'"}'
         return MockResponse(message, status=400)
@@ -44,17 +41,14 @@ def mocked_urlopen(url : str|req.Request, data = None,
         return MockResponse(message, status=404)
     return MockResponse(POINTS[point_set_id], status=200)
 
-def mocked_urlopen_other_code(url : str|req.Request, data = None,
-    timeout: float | None = None, *, context = None):
+def mocked_urlopen_other_code(url : str):
     # return a code 100 error
     return MockResponse(b'{"code":"CONTINUE","message":"Continue"}', status=100)
 
-def mocked_urlopen_url_error(url : str|req.Request, data = None,
-    timeout: float | None = None, *, context = None):
-    raise URLError("Mocked connection error")
+def mocked_urlopen_url_error(url : str):
+    raise ConnectionRefusedError("Mocked connection error")
 
-def mocked_urlopen_unavailable_database(url : str|req.Request, data = None,
-    timeout: float | None = None, *, context = None):
+def mocked_urlopen_unavailable_database(url : str):
     return MockResponse(b'{"code":"SERVICE_UNAVAILABLE","message":"Database is currently unavailable"}', status=503)
 
 def mocked_getenv(key: str, default: str | None = None) -> str | None:
@@ -65,50 +59,108 @@ def mocked_getenv(key: str, default: str | None = None) -> str | None:
 class TestPointSetManager:
     @pytest.mark.parametrize("point_set_id", IDS[2:])
     def test_get_point_set_success(self, monkeypatch, point_set_id : str) -> None:
-        monkeypatch.setattr(req, "urlopen", mocked_urlopen)
+        monkeypatch.setattr(PSM.CONNECTIONS, "urlopen", mocked_urlopen)
         monkeypatch.setattr(os, "getenv", mocked_getenv)
         point_set = PointSetManager.get_point_set(point_set_id)
         assert isinstance(point_set, PointSet)
 
 
     def test_get_point_set_not_found(self, monkeypatch) -> None:
-        monkeypatch.setattr(req, "urlopen", mocked_urlopen)
+        monkeypatch.setattr(PSM.CONNECTIONS, "urlopen", mocked_urlopen)
         monkeypatch.setattr(os, "getenv", mocked_getenv)
         with pytest.raises(KeyError) as excinfo:
             PointSetManager.get_point_set(UNKNOWN_ID)
         assert f"The requested resource '{UNKNOWN_ID}' could not be found" in excinfo.value.args[0]
 
     def test_get_point_set_unavailable_database(self, monkeypatch) -> None:
-        monkeypatch.setattr(req, "urlopen", mocked_urlopen_unavailable_database)
+        monkeypatch.setattr(PSM.CONNECTIONS, "urlopen", mocked_urlopen_unavailable_database)
         monkeypatch.setattr(os, "getenv", mocked_getenv)
         with pytest.raises(RuntimeError) as excinfo:
             PointSetManager.get_point_set(IDS[2])
         assert "Database is currently unavailable" in str(excinfo.value)
 
     def test_get_point_set_invalid_id(self, monkeypatch) -> None:
-        monkeypatch.setattr(req, "urlopen", mocked_urlopen)
+        monkeypatch.setattr(PSM.CONNECTIONS, "urlopen", mocked_urlopen)
         monkeypatch.setattr(os, "getenv", mocked_getenv)
         with pytest.raises(ValueError) as excinfo:
             PointSetManager.get_point_set(MALFORMED_ID)
         assert f"Malformed point set ID: {MALFORMED_ID}" in excinfo.value.args[0]
         
     def test_get_point_set_no_api_url(self, monkeypatch) -> None:
-        monkeypatch.setattr(req, "urlopen", mocked_urlopen)
+        monkeypatch.setattr(PSM.CONNECTIONS, "urlopen", mocked_urlopen)
         monkeypatch.setattr(os, "getenv", lambda key, default=None: None)
         with pytest.raises(RuntimeError) as excinfo:
             PointSetManager.get_point_set(IDS[2])
         assert "POINTSET_API_URL environment variable is not set." in str(excinfo.value)
         
     def test_get_point_set_other_error(self, monkeypatch) -> None:
-        monkeypatch.setattr(req, "urlopen", mocked_urlopen_other_code)
+        monkeypatch.setattr(PSM.CONNECTIONS, "urlopen", mocked_urlopen_other_code)
         monkeypatch.setattr(os, "getenv", mocked_getenv)
         with pytest.raises(RuntimeError) as excinfo:
             PointSetManager.get_point_set(IDS[2])
         assert "Failed to retrieve PointSet" in str(excinfo.value)
         
     def test_get_point_set_url_error(self, monkeypatch) -> None:
-        monkeypatch.setattr(req, "urlopen", mocked_urlopen_url_error)
+        monkeypatch.setattr(PSM.CONNECTIONS, "urlopen", mocked_urlopen_url_error)
         monkeypatch.setattr(os, "getenv", mocked_getenv)
         with pytest.raises(ConnectionError) as excinfo:
             PointSetManager.get_point_set(IDS[2])
-        assert "Failed to connect to the PointSet API" in str(excinfo.value)
\ No newline at end of file
+        assert "Failed to connect to the PointSet API" in str(excinfo.value)
+
+    @pytest.fixture
+    def server(self, monkeypatch):
+        with StandInPSM(POINTS) as server:
+            monkeypatch.setenv("POINTSET_API_URL", server.url)
+            monkeypatch.setattr(PSM, "CONNECTIONS", ConnectionPool())
+            monkeypatch.setattr(PSM, "ASYNC_CONNECTIONS", AsyncConnectionPool())
+            yield server
+
+    def test_get_point_set_keep_alive(self, server : StandInPSM) -> None:
+        for point_set_id in IDS:
+            point_set = PointSetManager.get_point_set(point_set_id)
+            assert point_set.to_bytes() == POINTS[point_set_id]
+        with pytest.raises(KeyError):
+            PointSetManager.get_point_set(UNKNOWN_ID)
+        assert server.requests == len(IDS) + 1
+        assert server.connections == 1
+
+    def test_get_point_set_timeout(self, server : StandInPSM, monkeypatch) -> None:
+        server.delay = 0.5
+        monkeypatch.setattr(PSM, "CONNECTIONS", ConnectionPool(read_timeout=0.05))
+        with pytest.raises(ConnectionError):
+            PointSetManager.get_point_set(IDS[0])
+
+    def test_get_point_set_server_down(self, server : StandInPSM) -> None:
+        server.shutdown()
+        server.server_close()
+        with pytest.raises(ConnectionError):
+            PointSetManager.get_point_set(IDS[0])
+
+    def test_get_point_set_async(self, server : StandInPSM) -> None:
+        async def scenario():
+            return await asyncio.gather(*(PointSetManager.get_point_set_async(point_set_id) for point_set_id in IDS))
+
+        for point_set_id, point_set in zip(IDS, asyncio.run(scenario()), strict=True):
+            assert point_set.to_bytes() == POINTS[point_set_id]
+        assert server.connections <= PSM.ASYNC_CONNECTIONS.max_connections
+
+    @pytest.mark.parametrize("point_set_id, error", [(UNKNOWN_ID, KeyError), (MALFORMED_ID, ValueError)])
+    def test_get_point_set_async_error(self, server : StandInPSM, point_set_id : str, error : type) -> None:
+        with pytest.raises(error):
+            asyncio.run(PointSetManager.get_point_set_async(point_set_id))
+
+    def test_get_point_set_async_server_down(self, server : StandInPSM) -> None:
+        server.shutdown()
+        server.server_close()
+        with pytest.raises(ConnectionError):
+            asyncio.run(PointSetManager.get_point_set_async(IDS[0]))
+
+    def test_get_point_set_async_unavailable_database(self, monkeypatch) -> None:
+        async def mocked_get(url : str) -> tuple[int, bytes]:
+            return 503, b'{"code":"SERVICE_UNAVAILABLE","message":"Database is currently unavailable"}'
+
+        monkeypatch.setattr(PSM.ASYNC_CONNECTIONS, "get", mocked_get)
+        monkeypatch.setattr(os, "getenv", mocked_getenv)
+        with pytest.raises(RuntimeError) as excinfo:
+            asyncio.run(PointSetManager.get_point_set_async(IDS[2]))
+        assert "Database is currently unavailable" in str(excinfo.value)
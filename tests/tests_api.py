@@ -1,26 +1,63 @@
+import io
+import json
+import struct
+from collections.abc import Iterator
+from typing import BinaryIO
+
 import pytest
 
-from datasets import IDS, MALFORMED_ID, TRIANGLES, UNKNOWN_ID
+from datasets import IDS, MALFORMED_ID, POINTS, TRIANGLES, UNKNOWN_ID
 from triangulator.http_server import HTTPServer
 from triangulator import http_server
+from triangulator.pointset import PointSet
+from triangulator.triangulator import POINT_SET_DIGESTS, RESULT_CACHE, triangulate
+from triangulator.workers import PoolFullError
 
 
-def mocked_get_and_compute(point_set_id: str) -> bytes:
+def mocked_get_and_stream(point_set_id: str) -> tuple[Iterator[bytes], int | None]:
     if point_set_id in IDS:
-        return TRIANGLES[point_set_id]
+        data = TRIANGLES[point_set_id]
+        return iter([data]), len(data)
     else:
         raise KeyError("Point set ID not found")
+
+def mocked_get_and_stream_unknown_size(point_set_id: str) -> tuple[Iterator[bytes], int | None]:
+    data = TRIANGLES[point_set_id]
+    return (data[i:i + 100] for i in range(0, len(data), 100)), None
     
-def mocked_get_and_compute_invalid(point_set_id: str) -> bytes:
+def mocked_get_and_stream_stored(point_set_id: str) -> tuple[BinaryIO, int]:
+    data = TRIANGLES[point_set_id]
+    return io.BytesIO(data), len(data)
+
+def mocked_get_and_stream_invalid(point_set_id: str) -> tuple[Iterator[bytes], int | None]:
     raise ValueError("Malformed point set ID")
     
-def mocked_get_and_compute_failed(point_set_id: str) -> bytes:
+def mocked_get_and_stream_failed(point_set_id: str) -> tuple[Iterator[bytes], int | None]:
     raise Exception("Computation failed")
 
-def mocked_get_and_compute_no_service(point_set_id: str) -> bytes:
+def mocked_get_and_stream_no_service(point_set_id: str) -> tuple[Iterator[bytes], int | None]:
     raise ConnectionError("Service not available")
 
+def mocked_get_and_stream_busy(point_set_id: str) -> tuple[Iterator[bytes], int | None]:
+    raise PoolFullError(3)
+
+def mocked_get_and_compute_batch(point_set_ids: list[str]) -> Iterator[tuple[int, bytes | Exception]]:
+    # The last point set completes first
+    for index in reversed(range(len(point_set_ids))):
+        point_set_id = point_set_ids[index]
+        yield index, TRIANGLES[point_set_id] if point_set_id in IDS else KeyError("Point set ID not found")
+
+def read_records(data: bytes) -> list[tuple[int, int, bytes]]:
+    records = []
+    while data:
+        index, status, size = struct.unpack_from("!LLL", data)
+        records.append((index, status, data[12:12 + size]))
+        data = data[12 + size:]
+    return records
+
 ENDPOINT = "/triangulation/{point_set_id}"
+BATCH_ENDPOINT = "/triangulation/batch"
+UPLOAD_ENDPOINT = "/triangulation"
 
 @pytest.fixture
 def client():
@@ -33,16 +70,39 @@ def test_triangulation_valid_id(client, monkeypatch : pytest.MonkeyPatch):
     test_id = IDS[0]
     expected_response = TRIANGLES[test_id]
     
-    monkeypatch.setattr(http_server, "get_and_compute", mocked_get_and_compute)
+    monkeypatch.setattr(http_server, "get_and_stream", mocked_get_and_stream)
     
     response = client.get(ENDPOINT.format(point_set_id=test_id))
     
     print(response.data)
     assert response.status_code == 200
     assert response.data == expected_response
+    assert response.content_length == len(expected_response)
+
+def test_triangulation_streamed(client, monkeypatch : pytest.MonkeyPatch):
+    test_id = IDS[0]
+    monkeypatch.setattr(http_server, "get_and_stream", mocked_get_and_stream_unknown_size)
+    
+    response = client.get(ENDPOINT.format(point_set_id=test_id))
+    
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert "Content-Length" not in response.headers
+    assert response.data == TRIANGLES[test_id]
+
+def test_triangulation_stored(client, monkeypatch : pytest.MonkeyPatch):
+    test_id = IDS[0]
+    monkeypatch.setattr(http_server, "get_and_stream", mocked_get_and_stream_stored)
+    
+    response = client.get(ENDPOINT.format(point_set_id=test_id))
+    
+    assert response.status_code == 200
+    assert response.content_type == "application/octet-stream"
+    assert response.content_length == len(TRIANGLES[test_id])
+    assert response.data == TRIANGLES[test_id]
 
 def test_triangulation_unknown_id(client, monkeypatch : pytest.MonkeyPatch):
-    monkeypatch.setattr(http_server, "get_and_compute", mocked_get_and_compute)
+    monkeypatch.setattr(http_server, "get_and_stream", mocked_get_and_stream)
     
     response = client.get(ENDPOINT.format(point_set_id=UNKNOWN_ID))
     
@@ -50,7 +110,7 @@ def test_triangulation_unknown_id(client, monkeypatch : pytest.MonkeyPatch):
     assert b"Point set ID not found" in response.data
     
 def test_triangulation_malformed_id(client, monkeypatch : pytest.MonkeyPatch):
-    monkeypatch.setattr(http_server, "get_and_compute", mocked_get_and_compute_invalid)
+    monkeypatch.setattr(http_server, "get_and_stream", mocked_get_and_stream_invalid)
     
     response = client.get(ENDPOINT.format(point_set_id=MALFORMED_ID))
     
@@ -58,7 +118,7 @@ def test_triangulation_malformed_id(client, monkeypatch : pytest.MonkeyPatch):
     assert b"Malformed point set ID" in response.data
     
 def test_triangulation_no_id(client, monkeypatch : pytest.MonkeyPatch):
-    monkeypatch.setattr(http_server, "get_and_compute", mocked_get_and_compute)
+    monkeypatch.setattr(http_server, "get_and_stream", mocked_get_and_stream)
     
     response = client.get("/triangulation/")
     
@@ -67,7 +127,7 @@ def test_triangulation_no_id(client, monkeypatch : pytest.MonkeyPatch):
 def test_triangulation_internal_error(client, monkeypatch : pytest.MonkeyPatch):
     test_id = IDS[0]
     
-    monkeypatch.setattr(http_server, "get_and_compute", mocked_get_and_compute_failed)
+    monkeypatch.setattr(http_server, "get_and_stream", mocked_get_and_stream_failed)
     
     response = client.get(ENDPOINT.format(point_set_id=test_id))
     
@@ -77,9 +137,85 @@ def test_triangulation_internal_error(client, monkeypatch : pytest.MonkeyPatch):
 def test_triangulation_database_unavailable(client, monkeypatch : pytest.MonkeyPatch):
     test_id = IDS[0]
     
-    monkeypatch.setattr(http_server, "get_and_compute", mocked_get_and_compute_no_service)
+    monkeypatch.setattr(http_server, "get_and_stream", mocked_get_and_stream_no_service)
     
     response = client.get(ENDPOINT.format(point_set_id=test_id))
     
     assert response.status_code == 503
     assert b"SERVICE UNAVAILABLE" in response.data
+
+def test_triangulation_busy(client, monkeypatch : pytest.MonkeyPatch):
+    test_id = IDS[0]
+    
+    monkeypatch.setattr(http_server, "get_and_stream", mocked_get_and_stream_busy)
+    
+    response = client.get(ENDPOINT.format(point_set_id=test_id))
+    
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    assert response.json == {"code": "SERVICE UNAVAILABLE", "message": str(PoolFullError(3))}
+
+def test_triangulation_batch(client, monkeypatch : pytest.MonkeyPatch):
+    monkeypatch.setattr(http_server, "get_and_compute_batch", mocked_get_and_compute_batch)
+    
+    response = client.post(BATCH_ENDPOINT, json={"pointSetIds": [IDS[0], UNKNOWN_ID, IDS[1]]})
+    
+    assert response.status_code == 200
+    assert response.content_type == "application/octet-stream"
+    [(index_1, status_1, payload_1), (index_2, status_2, payload_2), (index_3, status_3, payload_3)] = read_records(response.data)
+    assert (index_1, status_1, payload_1) == (2, 200, TRIANGLES[IDS[1]])
+    assert (index_2, status_2) == (1, 404)
+    assert json.loads(payload_2)["code"] == "NOT FOUND"
+    assert (index_3, status_3, payload_3) == (0, 200, TRIANGLES[IDS[0]])
+
+@pytest.mark.parametrize("body", [
+    b"not json",
+    b"[]",
+    b'{"ids": []}',
+    b'{"pointSetIds": []}',
+    b'{"pointSetIds": [1, 2]}',
+    json.dumps({"pointSetIds": IDS[:1] * (http_server.MAX_BATCH_SIZE + 1)}).encode(),
+])
+def test_triangulation_batch_invalid(client, monkeypatch : pytest.MonkeyPatch, body : bytes):
+    monkeypatch.setattr(http_server, "get_and_compute_batch", None) # not called
+    
+    response = client.post(BATCH_ENDPOINT, data=body, content_type="application/json")
+    
+    assert response.status_code == 400
+    assert response.json["code"] == "BAD REQUEST"
+
+def test_triangulation_upload(client, monkeypatch : pytest.MonkeyPatch):
+    monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", None) # not called
+    RESULT_CACHE.clear()
+    expected = triangulate(PointSet.from_bytes(POINTS[IDS[0]])).to_bytes()
+    
+    streamed = client.post(UPLOAD_ENDPOINT, data=POINTS[IDS[0]], content_type="application/octet-stream")
+    assert streamed.status_code == 200
+    assert streamed.data == expected
+    cached = client.post(UPLOAD_ENDPOINT, data=POINTS[IDS[0]], content_type="application/octet-stream")
+    RESULT_CACHE.clear()
+    POINT_SET_DIGESTS.clear()
+    
+    assert cached.status_code == 200
+    assert cached.content_length == len(expected)
+    assert cached.data == expected
+
+@pytest.mark.parametrize("body, status, code", [
+    (POINTS[IDS[0]], 413, "PAYLOAD TOO LARGE"), # larger than accepted
+    (struct.pack("!L", 1000), 413, "PAYLOAD TOO LARGE"), # announces more points than accepted
+    (b"\x00\x00", 400, "BAD REQUEST"), # incomplete header
+    (struct.pack("!Lff", 3, 0.0, 0.0), 400, "BAD REQUEST"), # fewer points than announced
+    (struct.pack("!Lffff", 2, 0.0, 0.0, 1.0, 1.0), 400, "BAD REQUEST"), # not enough points
+], ids=["too-large", "too-many-points", "incomplete-header", "missing-points", "not-enough-points"])
+def test_triangulation_upload_invalid(body : bytes, status : int, code : str):
+    server = HTTPServer(__name__, max_body_bytes=100)
+    
+    response = server.test_client().post(UPLOAD_ENDPOINT, data=body, content_type="application/octet-stream")
+    
+    assert response.status_code == status
+    assert response.json["code"] == code
+
+def test_triangulation_upload_method_not_allowed(client):
+    response = client.get(UPLOAD_ENDPOINT)
+    
+    assert response.status_code == 405
@@ -0,0 +1,359 @@
+import asyncio
+import http.client
+import json
+import struct
+import threading
+import time
+import uuid
+
+import pytest
+
+from datasets import IDS, POINTS, TRIANGLES
+from triangulator import async_server
+from triangulator.async_server import AsyncHTTPServer
+from triangulator.pointset import PointSet
+from triangulator.triangulator import POINT_SET_DIGESTS, RESULT_CACHE, triangulate
+from triangulator.workers import PoolFullError
+
+ENDPOINT = "/triangulation/{point_set_id}"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    RESULT_CACHE.clear()
+    POINT_SET_DIGESTS.clear()
+    yield
+    RESULT_CACHE.clear()
+    POINT_SET_DIGESTS.clear()
+
+
+def serve(scenario, **kwargs):
+    """Run a scenario against a server started on a free port, in a new event loop."""
+    async def main():
+        server = await AsyncHTTPServer(**kwargs).start("127.0.0.1", 0)
+        async with server:
+            return await scenario(server.sockets[0].getsockname()[1])
+    return asyncio.run(main())
+
+
+def get(port : int, *paths : str, method : str = "GET", body : bytes | None = None) -> list[tuple[http.client.HTTPResponse, bytes]]:
+    """Send requests on one keep-alive connection, from a thread."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    responses = []
+    try:
+        for path in paths:
+            connection.request(method, path, body)
+            response = connection.getresponse()
+            responses.append((response, response.read()))
+    finally:
+        connection.close()
+    return responses
+
+
+def mock_get_point_set_async(points : dict[str, PointSet], calls : list, delay : float = 0.0):
+    async def get_point_set_async(point_set_id : str) -> PointSet:
+        calls.append(point_set_id)
+        await asyncio.sleep(delay)
+        if point_set_id not in points:
+            raise KeyError(f"The requested resource '{point_set_id}' could not be found")
+        return points[point_set_id]
+    return get_point_set_async
+
+
+class TestAsyncHTTPServer:
+    def test_triangulation_streamed(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        calls = []
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set_async", mock_get_point_set_async({IDS[0]: points}, calls))
+
+        async def scenario(port : int):
+            return await asyncio.to_thread(get, port, ENDPOINT.format(point_set_id=IDS[0]), ENDPOINT.format(point_set_id=IDS[0]))
+
+        (streamed, streamed_body), (cached, cached_body) = serve(scenario)
+        expected = triangulate(points).to_bytes()
+        assert streamed.status == 200
+        assert streamed.getheader("Content-Type") == "application/octet-stream"
+        assert streamed.getheader("Transfer-Encoding") == "chunked"
+        assert streamed.getheader("Content-Length") is None
+        assert streamed_body == expected
+        assert cached.status == 200
+        assert cached.getheader("Content-Length") == str(len(expected))
+        assert cached_body == expected
+        assert calls == [IDS[0]]
+
+    def test_triangulation_stored(self, monkeypatch : pytest.MonkeyPatch, tmp_path) -> None:
+        path = tmp_path / "result"
+        path.write_bytes(TRIANGLES[IDS[0]])
+
+        async def mocked_get_and_stream_async(point_set_id : str):
+            return path.open("rb"), len(TRIANGLES[IDS[0]])
+
+        monkeypatch.setattr(async_server, "get_and_stream_async", mocked_get_and_stream_async)
+
+        async def scenario(port : int):
+            return await asyncio.to_thread(get, port, ENDPOINT.format(point_set_id=IDS[0]), ENDPOINT.format(point_set_id=IDS[0]))
+
+        for response, body in serve(scenario):
+            assert response.status == 200
+            assert response.getheader("Content-Length") == str(len(TRIANGLES[IDS[0]]))
+            assert body == TRIANGLES[IDS[0]]
+
+    @pytest.mark.parametrize("error, status, code", [
+        (KeyError("Point set ID not found"), 404, "NOT FOUND"),
+        (ValueError("Malformed point set ID"), 400, "BAD REQUEST"),
+        (ConnectionError("Service not available"), 503, "SERVICE UNAVAILABLE"),
+        (Exception("Computation failed"), 500, "INTERNAL SERVER ERROR"),
+    ])
+    def test_triangulation_error(self, monkeypatch : pytest.MonkeyPatch, error : Exception, status : int, code : str) -> None:
+        async def mocked_get_and_stream_async(point_set_id : str):
+            raise error
+
+        monkeypatch.setattr(async_server, "get_and_stream_async", mocked_get_and_stream_async)
+
+        async def scenario(port : int):
+            return await asyncio.to_thread(get, port, ENDPOINT.format(point_set_id=IDS[0]))
+
+        [(response, body)] = serve(scenario)
+        assert response.status == status
+        assert response.getheader("Content-Type") == "application/json"
+        assert json.loads(body) == {"code": code, "message": str(error)}
+
+    def test_triangulation_busy(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        async def mocked_get_and_stream_async(point_set_id : str):
+            raise PoolFullError(3)
+
+        monkeypatch.setattr(async_server, "get_and_stream_async", mocked_get_and_stream_async)
+
+        async def scenario(port : int):
+            return await asyncio.to_thread(get, port, ENDPOINT.format(point_set_id=IDS[0]), ENDPOINT.format(point_set_id=IDS[0]))
+
+        for response, body in serve(scenario):
+            assert response.status == 503
+            assert response.getheader("Retry-After") == "3"
+            assert json.loads(body)["code"] == "SERVICE UNAVAILABLE"
+
+    def test_triangulation_batch(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        async def mocked_get_and_compute_batch_async(point_set_ids : list[str]):
+            yield 1, KeyError("Point set ID not found")
+            yield 0, TRIANGLES[IDS[0]]
+
+        monkeypatch.setattr(async_server, "get_and_compute_batch_async", mocked_get_and_compute_batch_async)
+        body = json.dumps({"pointSetIds": [IDS[0], "unknown"]}).encode()
+
+        async def scenario(port : int):
+            return await asyncio.to_thread(get, port, "/triangulation/batch", "/triangulation/batch", method="POST", body=body)
+
+        for response, data in serve(scenario):
+            assert response.status == 200
+            assert response.getheader("Transfer-Encoding") == "chunked"
+            index, status, size = struct.unpack_from("!LLL", data)
+            assert (index, status) == (1, 404)
+            assert json.loads(data[12:12 + size])["code"] == "NOT FOUND"
+            data = data[12 + size:]
+            assert struct.unpack_from("!LLL", data) == (0, 200, len(TRIANGLES[IDS[0]]))
+            assert data[12:] == TRIANGLES[IDS[0]]
+
+    @pytest.mark.parametrize("body", [b"not json", b'{"pointSetIds": []}', b'{"pointSetIds": "a"}'])
+    def test_triangulation_batch_invalid(self, body : bytes) -> None:
+        async def scenario(port : int):
+            return await asyncio.to_thread(get, port, "/triangulation/batch", ENDPOINT.format(point_set_id=IDS[0]), method="POST", body=body)
+
+        (response, data), (other, _) = serve(scenario)
+        assert response.status == 400
+        assert json.loads(data)["code"] == "BAD REQUEST"
+        assert other.status == 405 # the connection is kept open
+
+    def test_triangulation_failed_while_streaming(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        def chunks():
+            yield b"1234"
+            raise RuntimeError("Triangulation failed")
+
+        async def mocked_get_and_stream_async(point_set_id : str):
+            return chunks(), None
+
+        monkeypatch.setattr(async_server, "get_and_stream_async", mocked_get_and_stream_async)
+
+        async def scenario(port : int):
+            return await asyncio.to_thread(get, port, ENDPOINT.format(point_set_id=IDS[0]))
+
+        with pytest.raises(http.client.IncompleteRead):
+            serve(scenario)
+
+    @pytest.mark.parametrize("path", ["/triangulation/", "/unknown", ENDPOINT.format(point_set_id=IDS[0]) + "/extra"])
+    def test_unknown_path(self, path : str) -> None:
+        async def scenario(port : int):
+            return await asyncio.to_thread(get, port, path)
+
+        [(response, body)] = serve(scenario)
+        assert response.status == 404
+        assert json.loads(body)["code"] == "NOT FOUND"
+
+    @pytest.mark.parametrize("path, method, allowed", [(ENDPOINT.format(point_set_id=IDS[0]), "POST", "GET"), ("/triangulation", "GET", "POST")])
+    def test_method_not_allowed(self, path : str, method : str, allowed : str) -> None:
+        async def scenario(port : int):
+            return await asyncio.to_thread(get, port, path, method=method)
+
+        [(response, _)] = serve(scenario)
+        assert response.status == 405
+        assert response.getheader("Allow") == allowed
+
+    def test_triangulation_upload(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set_async", None) # not called
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+
+        async def scenario(port : int):
+            return await asyncio.to_thread(get, port, "/triangulation", "/triangulation", method="POST", body=POINTS[IDS[0]])
+
+        (streamed, streamed_body), (cached, cached_body) = serve(scenario)
+        expected = triangulate(points).to_bytes()
+        assert streamed.status == cached.status == 200
+        assert streamed_body == cached_body == expected
+        assert cached.getheader("Content-Length") == str(len(expected))
+
+    @pytest.mark.parametrize("body, status", [
+        (POINTS[IDS[0]], 413), # larger than accepted
+        (struct.pack("!L", 1000), 413), # announces more points than accepted
+        (b"\x00\x00", 400), # incomplete header
+        (struct.pack("!Lff", 3, 0.0, 0.0), 400), # fewer points than announced
+        (struct.pack("!Lff", 1, 0.0, 0.0), 400), # not enough points
+    ], ids=["too-large", "too-many-points", "incomplete-header", "missing-points", "not-enough-points"])
+    def test_triangulation_upload_invalid(self, body : bytes, status : int) -> None:
+        async def scenario(port : int):
+            return await asyncio.to_thread(get, port, "/triangulation", method="POST", body=body)
+
+        [(response, data)] = serve(scenario, max_body_bytes=100)
+        assert response.status == status
+        assert response.getheader("Connection") == "close"
+        assert json.loads(data)["message"]
+
+    def test_triangulation_upload_chunked(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set_async", mock_get_point_set_async({}, []))
+        data = POINTS[IDS[0]]
+
+        def upload(port : int) -> list[tuple[http.client.HTTPResponse, bytes]]:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            try:
+                # Without a Content-Length, the body is sent in chunks
+                connection.request("POST", "/triangulation", iter([data[:5], data[5:]]))
+                upload = connection.getresponse()
+                responses = [(upload, upload.read())]
+                # The connection is still in sync for the next request
+                connection.request("GET", ENDPOINT.format(point_set_id="unknown"))
+                response = connection.getresponse()
+                responses.append((response, response.read()))
+            finally:
+                connection.close()
+            return responses
+
+        async def scenario(port : int):
+            return await asyncio.to_thread(upload, port)
+
+        (uploaded, body), (unknown, _) = serve(scenario)
+        assert uploaded.status == 200
+        assert body == triangulate(PointSet.from_bytes(data)).to_bytes()
+        assert unknown.status == 404
+
+    @pytest.mark.parametrize("head, body, status", [
+        (b"Content-Length: 1000", b"", 413), # rejected before the body is sent
+        (b"Transfer-Encoding: chunked", b"64\r\n" + b"x" * 100 + b"\r\n", 413),
+        (b"Transfer-Encoding: chunked", b"zz\r\n", 400),
+        (b"Transfer-Encoding: chunked", b"2\r\nxxx\r\n", 400),
+        (b"Transfer-Encoding: gzip", b"", 400),
+    ], ids=["too-large", "chunks-too-large", "malformed-chunk-size", "chunk-too-long", "unknown-transfer-coding"])
+    @pytest.mark.parametrize("path", ["/triangulation/batch", "/triangulation"])
+    def test_body_rejected(self, path : str, head : bytes, body : bytes, status : int) -> None:
+        async def scenario(port : int):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST " + path.encode() + b" HTTP/1.1\r\n" + head + b"\r\n\r\n" + body)
+            # The server answers and closes the connection without waiting for the rest of the body
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return response
+
+        head, _, data = serve(scenario, max_body_bytes=50).partition(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 %d" % status)
+        assert b"Connection: close" in head
+        assert json.loads(data)["message"]
+
+    @pytest.mark.parametrize("fields", [
+        [b"X-Field-%d: 1" % i for i in range(async_server.MAX_HEADER_FIELDS + 1)],
+        [b"X-Field: " + b"x" * 60000, b"X-Other: " + b"x" * 10000],
+    ], ids=["too-many", "too-long"])
+    def test_headers_too_large(self, fields : list[bytes]) -> None:
+        async def scenario(port : int):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET " + ENDPOINT.format(point_set_id=IDS[0]).encode() + b" HTTP/1.1\r\n" + b"\r\n".join(fields) + b"\r\n\r\n")
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return response
+
+        head, _, data = serve(scenario).partition(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 431 Request Header Fields Too Large")
+        assert b"Connection: close" in head
+        assert json.loads(data)["code"] == "REQUEST HEADER FIELDS TOO LARGE"
+
+    def test_http_1_0(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set_async", mock_get_point_set_async({IDS[0]: points}, []))
+
+        async def scenario(port : int):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {ENDPOINT.format(point_set_id=IDS[0])} HTTP/1.0\r\n\r\n".encode())
+            response = await reader.read()  # the server closes the connection at the end of the body
+            writer.close()
+            return response
+
+        head, _, body = serve(scenario).partition(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 200 OK")
+        assert b"Transfer-Encoding" not in head
+        assert b"Connection: close" in head
+        assert body == triangulate(points).to_bytes()
+
+    @pytest.mark.parametrize("request_line", [b"garbage\r\n", b"GET / SPDY/3\r\n"])
+    def test_malformed_request(self, request_line : bytes) -> None:
+        async def scenario(port : int):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request_line + b"\r\n")
+            response = await reader.read()
+            writer.close()
+            return response
+
+        assert serve(scenario).startswith(b"HTTP/1.1 400 Bad Request")
+
+    def test_idle_connection_closed(self) -> None:
+        async def scenario(port : int):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return response
+
+        assert serve(scenario, keep_alive_timeout=0.05) == b""
+
+    def test_slow_point_set_api(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        # Requests waiting for a slow PointSet API hold no thread
+        points = PointSet([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)])
+        ids = [str(uuid.uuid4()) for _ in range(200)]
+        calls = []
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set_async",
+                            mock_get_point_set_async(dict.fromkeys(ids, points), calls, delay=0.5))
+        threads = []
+
+        async def request(port : int, point_set_id : str) -> bytes:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {ENDPOINT.format(point_set_id=point_set_id)} HTTP/1.1\r\nConnection: close\r\n\r\n".encode())
+            response = await reader.read()
+            writer.close()
+            return response
+
+        async def scenario(port : int):
+            requests = asyncio.gather(*(request(port, point_set_id) for point_set_id in ids))
+            while len(calls) < len(ids):
+                await asyncio.sleep(0.01)
+            threads.append(threading.active_count())
+            return await requests
+
+        start = time.monotonic()
+        responses = serve(scenario)
+        assert time.monotonic() - start < 5
+        assert all(response.startswith(b"HTTP/1.1 200 OK") for response in responses)
+        assert threads[0] < 50
@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+from triangulator import cache
+from triangulator.cache import ResultCache
+
+
+class TestResultCache:
+    def test_get_put(self) -> None:
+        results = ResultCache(100)
+        assert results.get("a") is None
+        assert results.put("a", b"12345")
+        assert results.get("a") == b"12345"
+        assert "a" in results
+        assert "b" not in results
+        assert (results.hits, results.misses, results.evictions) == (1, 1, 0)
+        assert results.size == 5
+        assert len(results) == 1
+
+    def test_replace(self) -> None:
+        results = ResultCache(100)
+        results.put("a", b"12345")
+        results.put("a", b"123")
+        assert results.get("a") == b"123"
+        assert results.size == 3
+        assert results.evictions == 0
+
+    def test_lru_eviction(self) -> None:
+        results = ResultCache(10)
+        results.put("a", b"1234")
+        results.put("b", b"1234")
+        results.get("a") # b becomes the least recently used
+        results.put("c", b"1234")
+        assert "a" in results
+        assert "b" not in results
+        assert "c" in results
+        assert results.evictions == 1
+        assert results.size == 8
+
+    def test_too_large(self) -> None:
+        results = ResultCache(10)
+        results.put("a", b"1234")
+        assert not results.put("b", b"12345678901")
+        assert "a" in results
+        assert "b" not in results
+        assert not ResultCache(0).put("a", b"1")
+
+    def test_ttl(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        now = [1000.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        results = ResultCache(100, ttl=10)
+        results.put("a", b"1234")
+        now[0] += 9
+        assert results.get("a") == b"1234"
+        now[0] += 1
+        assert "a" not in results
+        assert results.get("a") is None
+        assert results.size == 0
+        assert (results.hits, results.misses) == (1, 1)
+
+    def test_clear(self) -> None:
+        results = ResultCache(100)
+        results.put("a", b"1234")
+        results.get("a")
+        results.clear()
+        assert len(results) == 0
+        assert results.size == 0
+        assert (results.hits, results.misses, results.evictions) == (0, 0, 0)
+
+    @pytest.mark.parametrize("max_bytes, ttl", [(-1, None), (10, 0), (10, -5)])
+    def test_invalid(self, max_bytes : int, ttl : float | None) -> None:
+        with pytest.raises(ValueError):
+            ResultCache(max_bytes, ttl)
+
+    @pytest.mark.parametrize("environment, expected", [
+        ({}, (cache.DEFAULT_CACHE_BYTES, cache.DEFAULT_CACHE_TTL)),
+        ({"TRIANGULATION_CACHE_BYTES": "1000"}, (1000, None)),
+        ({"TRIANGULATION_CACHE_BYTES": "0", "TRIANGULATION_CACHE_TTL": "2.5"}, (0, 2.5)),
+    ])
+    def test_from_environment(self, monkeypatch : pytest.MonkeyPatch, environment : dict[str, str], expected : tuple) -> None:
+        monkeypatch.delenv("TRIANGULATION_CACHE_BYTES", raising=False)
+        monkeypatch.delenv("TRIANGULATION_CACHE_TTL", raising=False)
+        for name, value in environment.items():
+            monkeypatch.setenv(name, value)
+        results = ResultCache.from_environment()
+        assert (results.max_bytes, results.ttl) == expected
+
+    def test_from_environment_invalid(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TRIANGULATION_CACHE_BYTES", "a lot")
+        with pytest.raises(ValueError):
+            ResultCache.from_environment()
+
+    def test_thread_safety(self) -> None:
+        results = ResultCache(1000)
+
+        def worker(n : int) -> None:
+            for i in range(500):
+                key = str((n * 7 + i) % 40)
+                if results.get(key) is None:
+                    results.put(key, bytes(50))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results.hits + results.misses == 8 * 500
+        assert results.size == 50 * len(results) <= 1000
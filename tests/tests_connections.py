@@ -0,0 +1,268 @@
+import asyncio
+import http.client
+import threading
+
+import pytest
+
+from datasets import IDS, POINTS
+from psm_server import StandInPSM
+from triangulator import connections
+from triangulator.connections import AsyncConnectionPool, ConnectionPool
+
+
+@pytest.fixture
+def server():
+    with StandInPSM(POINTS) as server:
+        yield server
+
+
+def get(pool : ConnectionPool, url : str) -> tuple[int, bytes]:
+    with pool.urlopen(url) as response:
+        return response.status, response.read()
+
+
+class TestConnectionPool:
+    def test_reuse(self, server : StandInPSM) -> None:
+        pool = ConnectionPool()
+        for point_set_id in IDS[:5]:
+            assert get(pool, f"{server.url}/pointset/{point_set_id}") == (200, POINTS[point_set_id])
+        assert server.requests == 5
+        assert server.connections == pool.connections == 1
+
+    def test_error_status(self, server : StandInPSM) -> None:
+        pool = ConnectionPool()
+        status, _ = get(pool, f"{server.url}/pointset/unknown")
+        assert status == 404
+        assert get(pool, f"{server.url}/pointset/{IDS[0]}") == (200, POINTS[IDS[0]])
+        assert server.connections == 1
+
+    def test_concurrent(self, server : StandInPSM) -> None:
+        server.delay = 0.02
+        pool = ConnectionPool(max_connections=2)
+        results = []
+
+        def worker(point_set_id : str) -> None:
+            for _ in range(3):
+                results.append(get(pool, f"{server.url}/pointset/{point_set_id}") == (200, POINTS[point_set_id]))
+
+        threads = [threading.Thread(target=worker, args=(point_set_id,)) for point_set_id in IDS[:8]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [True] * 24
+        assert server.connections == pool.connections <= 2
+
+    def test_connection_close(self, server : StandInPSM) -> None:
+        server.keep_alive = False
+        pool = ConnectionPool()
+        for point_set_id in IDS[:3]:
+            assert get(pool, f"{server.url}/pointset/{point_set_id}") == (200, POINTS[point_set_id])
+        assert server.connections == pool.connections == 3
+
+    def test_stale_connection(self, server : StandInPSM) -> None:
+        server.drop = True
+        pool = ConnectionPool()
+        for point_set_id in IDS[:3]:
+            assert get(pool, f"{server.url}/pointset/{point_set_id}") == (200, POINTS[point_set_id])
+        assert server.requests == 3
+
+    def test_unread_response(self, server : StandInPSM) -> None:
+        pool = ConnectionPool()
+        with pool.urlopen(f"{server.url}/pointset/{IDS[0]}") as response:
+            response.read(10)
+        assert get(pool, f"{server.url}/pointset/{IDS[1]}") == (200, POINTS[IDS[1]])
+        assert server.connections == pool.connections == 2
+
+    def test_read_timeout(self, server : StandInPSM) -> None:
+        server.delay = 0.5
+        pool = ConnectionPool(read_timeout=0.05)
+        with pytest.raises(TimeoutError):
+            get(pool, f"{server.url}/pointset/{IDS[0]}")
+
+    def test_pool_exhausted(self, server : StandInPSM) -> None:
+        pool = ConnectionPool(max_connections=1, connect_timeout=0.05)
+        with pool.urlopen(f"{server.url}/pointset/{IDS[0]}") as response:
+            with pytest.raises(TimeoutError):
+                get(pool, f"{server.url}/pointset/{IDS[1]}")
+            response.read()
+        assert get(pool, f"{server.url}/pointset/{IDS[1]}") == (200, POINTS[IDS[1]])
+
+    def test_close(self, server : StandInPSM) -> None:
+        pool = ConnectionPool()
+        get(pool, f"{server.url}/pointset/{IDS[0]}")
+        pool.close()
+        get(pool, f"{server.url}/pointset/{IDS[0]}")
+        assert server.connections == pool.connections == 2
+
+    def test_unreachable(self, server : StandInPSM) -> None:
+        url = server.url
+        server.shutdown()
+        server.server_close()
+        with pytest.raises(OSError):
+            get(ConnectionPool(connect_timeout=1), f"{url}/pointset/{IDS[0]}")
+
+    @pytest.mark.parametrize("url", ["ftp://localhost/pointset", "/pointset", "http:///pointset"])
+    def test_invalid_url(self, url : str) -> None:
+        with pytest.raises(ValueError):
+            get(ConnectionPool(), url)
+
+    @pytest.mark.parametrize("max_connections, connect_timeout, read_timeout", [(0, 1, 1), (1, 0, 1), (1, 1, -1)])
+    def test_invalid(self, max_connections : int, connect_timeout : float, read_timeout : float) -> None:
+        with pytest.raises(ValueError):
+            ConnectionPool(max_connections, connect_timeout, read_timeout)
+
+    def test_from_environment(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        for name in ("POINTSET_API_MAX_CONNECTIONS", "POINTSET_API_CONNECT_TIMEOUT", "POINTSET_API_READ_TIMEOUT"):
+            monkeypatch.delenv(name, raising=False)
+        pool = ConnectionPool.from_environment()
+        assert (pool.max_connections, pool.connect_timeout, pool.read_timeout) == \
+            (connections.DEFAULT_MAX_CONNECTIONS, connections.DEFAULT_CONNECT_TIMEOUT, connections.DEFAULT_READ_TIMEOUT)
+
+        monkeypatch.setenv("POINTSET_API_MAX_CONNECTIONS", "4")
+        monkeypatch.setenv("POINTSET_API_READ_TIMEOUT", "2.5")
+        pool = ConnectionPool.from_environment()
+        assert (pool.max_connections, pool.read_timeout) == (4, 2.5)
+
+
+class TestAsyncConnectionPool:
+    def test_reuse(self, server : StandInPSM) -> None:
+        pool = AsyncConnectionPool()
+
+        async def scenario():
+            return [await pool.get(f"{server.url}/pointset/{point_set_id}") for point_set_id in IDS[:5]]
+
+        assert asyncio.run(scenario()) == [(200, POINTS[point_set_id]) for point_set_id in IDS[:5]]
+        assert server.requests == 5
+        assert server.connections == pool.connections == 1
+
+    def test_error_status(self, server : StandInPSM) -> None:
+        pool = AsyncConnectionPool()
+
+        async def scenario():
+            return await pool.get(f"{server.url}/pointset/unknown"), await pool.get(f"{server.url}/pointset/{IDS[0]}")
+
+        (status, _), response = asyncio.run(scenario())
+        assert status == 404
+        assert response == (200, POINTS[IDS[0]])
+        assert server.connections == 1
+
+    def test_concurrent(self, server : StandInPSM) -> None:
+        server.delay = 0.02
+        pool = AsyncConnectionPool(max_connections=2)
+
+        async def scenario():
+            return await asyncio.gather(*(pool.get(f"{server.url}/pointset/{point_set_id}") for point_set_id in IDS * 2))
+
+        assert asyncio.run(scenario()) == [(200, POINTS[point_set_id]) for point_set_id in IDS * 2]
+        assert server.connections == pool.connections <= 2
+
+    def test_connection_close(self, server : StandInPSM) -> None:
+        server.keep_alive = False
+        pool = AsyncConnectionPool()
+
+        async def scenario():
+            return [await pool.get(f"{server.url}/pointset/{point_set_id}") for point_set_id in IDS[:3]]
+
+        assert asyncio.run(scenario()) == [(200, POINTS[point_set_id]) for point_set_id in IDS[:3]]
+        assert server.connections == pool.connections == 3
+
+    def test_stale_connection(self, server : StandInPSM) -> None:
+        server.drop = True
+        pool = AsyncConnectionPool()
+
+        async def scenario():
+            return [await pool.get(f"{server.url}/pointset/{point_set_id}") for point_set_id in IDS[:3]]
+
+        assert asyncio.run(scenario()) == [(200, POINTS[point_set_id]) for point_set_id in IDS[:3]]
+        assert server.requests == 3
+
+    def test_read_timeout(self, server : StandInPSM) -> None:
+        server.delay = 0.5
+        pool = AsyncConnectionPool(read_timeout=0.05)
+        with pytest.raises(TimeoutError):
+            asyncio.run(pool.get(f"{server.url}/pointset/{IDS[0]}"))
+
+    def test_pool_exhausted(self, server : StandInPSM) -> None:
+        server.delay = 0.5
+        pool = AsyncConnectionPool(max_connections=1, connect_timeout=0.05)
+
+        async def scenario():
+            first = asyncio.ensure_future(pool.get(f"{server.url}/pointset/{IDS[0]}"))
+            await asyncio.sleep(0.01)
+            with pytest.raises(TimeoutError):
+                await pool.get(f"{server.url}/pointset/{IDS[1]}")
+            return await first
+
+        assert asyncio.run(scenario()) == (200, POINTS[IDS[0]])
+
+    def test_unreachable(self, server : StandInPSM) -> None:
+        url = server.url
+        server.shutdown()
+        server.server_close()
+        with pytest.raises(OSError):
+            asyncio.run(AsyncConnectionPool(connect_timeout=1).get(f"{url}/pointset/{IDS[0]}"))
+
+    @pytest.mark.parametrize("response, expected", [
+        (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n3\r\nabc\r\n2;x=y\r\nde\r\n0\r\nX-Trailer: 1\r\n\r\n", (200, b"abcde", True)),
+        (b"HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\nabc", (200, b"abc", True)),
+        (b"HTTP/1.0 200 OK\r\nContent-Length: 3\r\n\r\nabc", (200, b"abc", False)),
+        (b"HTTP/1.1 404 Not Found\r\n\r\nnot found", (404, b"not found", False)),
+    ], ids=["chunked", "content-length", "http-1.0", "until-closed"])
+    def test_response_framing(self, response : bytes, expected : tuple) -> None:
+        connections = []
+
+        async def respond(reader : asyncio.StreamReader, writer : asyncio.StreamWriter) -> None:
+            connections.append(writer)
+            while await reader.readline():
+                while await reader.readline() not in (b"\r\n", b""):
+                    pass
+                writer.write(response)
+                await writer.drain()
+                if not expected[2]:
+                    break
+            writer.close()
+
+        async def scenario():
+            server = await asyncio.start_server(respond, "127.0.0.1", 0)
+            async with server:
+                pool = AsyncConnectionPool()
+                status, body = await pool.get(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/pointset")
+                idle = pool.connections == 1 and len(connections) == 1
+                second = await pool.get(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/pointset")
+                pool.close()
+                return status, body, idle and len(connections) == 1, second
+
+        status, body, reused, second = asyncio.run(scenario())
+        assert (status, body, reused) == expected
+        assert second == expected[:2]
+
+    @pytest.mark.parametrize("response, error", [
+        (b"SPDY/3 200 OK\r\n\r\n", http.client.BadStatusLine),
+        (b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nabc", http.client.IncompleteRead),
+        (b"", http.client.RemoteDisconnected),
+    ])
+    def test_invalid_response(self, response : bytes, error : type) -> None:
+        async def respond(reader : asyncio.StreamReader, writer : asyncio.StreamWriter) -> None:
+            await reader.readline()
+            writer.write(response)
+            await writer.drain()
+            writer.close()
+
+        async def scenario():
+            server = await asyncio.start_server(respond, "127.0.0.1", 0)
+            async with server:
+                await AsyncConnectionPool().get(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/pointset")
+
+        with pytest.raises(error):
+            asyncio.run(scenario())
+
+    def test_invalid_url(self) -> None:
+        with pytest.raises(ValueError):
+            asyncio.run(AsyncConnectionPool().get("ftp://localhost/pointset"))
+
+    def test_from_environment(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("POINTSET_API_MAX_CONNECTIONS", "4")
+        pool = AsyncConnectionPool.from_environment()
+        assert isinstance(pool, AsyncConnectionPool)
+        assert pool.max_connections == 4
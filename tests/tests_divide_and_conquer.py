@@ -0,0 +1,41 @@
+import pytest
+
+from triangulator.divide_and_conquer import divide_and_conquer
+from triangulator.pointset import PointSet
+from triangulator.predicates import in_circle, orientation
+from triangulator.triangulator import triangulate
+from datasets import IDS, POINTS
+
+
+def coordinates(points : PointSet) -> tuple[list[float], list[float]]:
+    return [p.x for p in points], [p.y for p in points]
+
+
+class TestDivideAndConquer:
+    @pytest.mark.parametrize("points, expected", [
+        ([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)], 1),
+        ([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0), (1.0, 1.0)], 2), # collinear base
+        ([(0.0, 0.0), (2.0, 0.0), (1.0, 1.0), (0.0, 2.0), (2.0, 2.0)], 4),
+        ([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0), (3.0, 0.0)], 0), # all collinear
+    ])
+    def test_triangle_count(self, points : list[tuple[float, float]], expected : int) -> None:
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        assert len(divide_and_conquer(xs, ys)) == expected
+
+    @pytest.mark.parametrize("dataset_id", IDS)
+    def test_delaunay_and_clockwise(self, dataset_id : str) -> None:
+        xs, ys = coordinates(PointSet.from_bytes(POINTS[dataset_id]))
+        triangles = divide_and_conquer(xs, ys)
+        for a, b, c in triangles:
+            assert orientation(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]) < 0
+            for i in range(len(xs)):
+                if i not in (a, b, c):
+                    assert not in_circle(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], xs[i], ys[i])
+
+    @pytest.mark.parametrize("dataset_id", IDS)
+    def test_contains_bowyer_watson(self, dataset_id : str) -> None:
+        points = PointSet.from_bytes(POINTS[dataset_id])
+        bowyer_watson = {frozenset(t.indices) for t in triangulate(points)}
+        result = {frozenset(t.indices) for t in triangulate(points, engine="divide-and-conquer")}
+        assert bowyer_watson <= result
@@ -0,0 +1,88 @@
+from random import Random
+
+import pytest
+
+from triangulator.divide_and_conquer import divide_and_conquer
+from triangulator.dynamic import DynamicTriangulation
+from triangulator.mesh import _canonical
+from triangulator.pointset import PointSet
+from triangulator.predicates import in_circle, orientation
+from triangulator.triangles import Triangles
+from triangulator.triangulator import triangulate
+from datasets import IDS, POINTS
+
+
+def recomputed(points : list[tuple[float, float]]) -> Triangles:
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return Triangles(points=points, triangles=_canonical(divide_and_conquer(xs, ys)))
+
+
+class TestDynamicTriangulation:
+    @pytest.mark.parametrize("points", [
+        PointSet([]), # empty set
+        PointSet([(0, 0), (1, 0)]), # not enough points
+        PointSet([(0, 0), (1, 0), (2, 0)]), # collinear points
+    ])
+    def test_init_failure(self, points : PointSet) -> None:
+        with pytest.raises(ValueError):
+            DynamicTriangulation(points)
+
+    @pytest.mark.parametrize("dataset_id", IDS)
+    def test_init_same_as_triangulate(self, dataset_id : str) -> None:
+        points = PointSet.from_bytes(POINTS[dataset_id])
+        assert DynamicTriangulation(points).to_triangles() == triangulate(points, engine="sweep-hull")
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_updates_same_as_recomputing(self, seed : int) -> None:
+        rng = Random(seed)
+        points = [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(50)]
+        dynamic = DynamicTriangulation(PointSet(points))
+        for _ in range(100):
+            if rng.random() < 0.5:
+                point = (rng.uniform(-20, 120), rng.uniform(-20, 120)) # sometimes outside the convex hull
+                assert dynamic.insert_point(point) == len(points)
+                points.append(point)
+            else:
+                i = rng.randrange(len(points))
+                dynamic.remove_point(points[i])
+                points[i] = points[-1] # the last point takes the index of the removed one
+                points.pop()
+            assert dynamic.to_triangles() == recomputed(points)
+
+    def test_updates_on_grid(self) -> None:
+        # Cocircular points, and points inserted on existing edges and on the convex hull
+        rng = Random(3)
+        points = [(float(x), float(y)) for x in range(0, 8, 2) for y in range(0, 8, 2)]
+        dynamic = DynamicTriangulation(PointSet(points))
+        for x in range(8):
+            for y in range(8):
+                if (x, y) not in points:
+                    dynamic.insert_point((x, y))
+                    points.append((x, y))
+        for _ in range(40):
+            dynamic.remove_point(points.pop(rng.randrange(len(points))))
+        result = dynamic.to_triangles()
+        all_points = list(result.points)
+        assert len(result) == len(recomputed([(p.x, p.y) for p in all_points]))
+        for triangle in result:
+            a, b, c = (all_points[i] for i in sorted(triangle.indices))
+            assert orientation(a.x, a.y, b.x, b.y, c.x, c.y) != 0
+            for p in all_points:
+                assert not in_circle(a.x, a.y, b.x, b.y, c.x, c.y, p.x, p.y)
+
+    def test_insert_duplicate(self) -> None:
+        dynamic = DynamicTriangulation(PointSet([(0, 0), (1, 0), (0, 1)]))
+        with pytest.raises(ValueError):
+            dynamic.insert_point((1, 0))
+
+    @pytest.mark.parametrize("points, point", [
+        ([(0, 0), (1, 0), (0, 1), (1, 1)], (2, 2)), # unknown point
+        ([(0, 0), (1, 0), (0, 1)], (0, 0)), # not enough points left
+        ([(0, 0), (1, 0), (2, 0), (3, 0), (1, 1)], (1, 1)), # collinear points left
+    ])
+    def test_remove_failure(self, points : list[tuple[float, float]], point : tuple[float, float]) -> None:
+        dynamic = DynamicTriangulation(PointSet(points))
+        with pytest.raises(ValueError):
+            dynamic.remove_point(point)
+        assert dynamic.to_triangles() == recomputed(points)
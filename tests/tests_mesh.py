@@ -0,0 +1,99 @@
+import pytest
+
+from triangulator.divide_and_conquer import divide_and_conquer
+from triangulator.mesh import HalfEdgeMesh
+from triangulator.pointset import PointSet
+from triangulator.sweep_hull import sweep_hull
+from triangulator.triangulator import triangulate
+from datasets import IDS, POINTS
+
+
+# A square split in four around its center, 4:
+#   3 --- 2
+#   | \ / |
+#   |  4  |
+#   | / \ |
+#   0 --- 1
+SQUARE = [(0, 4, 1), (1, 4, 2), (2, 4, 3), (3, 4, 0)]
+
+
+class TestHalfEdgeMesh:
+    def test_from_triangles(self) -> None:
+        mesh = HalfEdgeMesh.from_triangles(SQUARE)
+        assert list(mesh) == SQUARE
+        assert len(mesh) == 4
+        assert mesh.triangle(2) == (2, 4, 3)
+        for e in range(12):
+            if mesh.twins[e] != -1:
+                assert mesh.twins[mesh.twins[e]] == e
+                assert mesh.origin(mesh.twins[e]) == mesh.destination(e)
+        assert mesh.vertices.itemsize * 3 + mesh.twins.itemsize * 3 == 24
+
+    def test_next_prev(self) -> None:
+        assert [HalfEdgeMesh.next(e) for e in range(6)] == [1, 2, 0, 4, 5, 3]
+        assert [HalfEdgeMesh.prev(e) for e in range(6)] == [2, 0, 1, 5, 3, 4]
+
+    @pytest.mark.parametrize("t, expected", [(0, (3, 1, -1)), (1, (0, 2, -1)), (3, (2, 0, -1))])
+    def test_neighbours(self, t : int, expected : tuple[int, int, int]) -> None:
+        assert HalfEdgeMesh.from_triangles(SQUARE).neighbours(t) == expected
+
+    @pytest.mark.parametrize("v, expected", [
+        (4, {0, 1, 2, 3}), # interior vertex
+        (0, {1, 4, 3}), # boundary vertex
+        (5, set()), # not in the mesh
+    ])
+    def test_one_ring(self, v : int, expected : set[int]) -> None:
+        ring = HalfEdgeMesh.from_triangles(SQUARE).one_ring(v)
+        assert len(ring) == len(expected)
+        assert set(ring) == expected
+
+    def test_one_ring_boundary_order(self) -> None:
+        ring = HalfEdgeMesh.from_triangles(SQUARE).one_ring(0)
+        assert ring[1] == 4 # boundary neighbours first and last
+
+    def test_boundary(self) -> None:
+        mesh = HalfEdgeMesh.from_triangles(SQUARE)
+        boundary = mesh.boundary()
+        assert len(boundary) == 4
+        for e, f in zip(boundary, boundary[1:] + boundary[:1]):
+            assert mesh.twins[e] == -1
+            assert mesh.destination(e) == mesh.origin(f)
+        assert HalfEdgeMesh([]).boundary() == []
+
+    def test_boundary_pinch_vertex(self) -> None:
+        # Two triangles sharing only vertex 0: two boundary loops touching there
+        mesh = HalfEdgeMesh.from_triangles([(0, 1, 2), (0, 3, 4)])
+        boundary = mesh.boundary()
+        assert sorted(boundary) == list(range(6))
+        for loop in (boundary[:3], boundary[3:]):
+            assert len({e // 3 for e in loop}) == 1
+            for e, f in zip(loop, loop[1:] + loop[:1]):
+                assert mesh.destination(e) == mesh.origin(f)
+
+    @pytest.mark.parametrize("vertices, twins", [
+        ([0, 1], None), # not a multiple of 3
+        ([0, 1, 2], [-1, -1]), # missing twins
+    ])
+    def test_invalid(self, vertices : list[int], twins : list[int] | None) -> None:
+        with pytest.raises(ValueError):
+            HalfEdgeMesh(vertices, twins)
+
+    @pytest.mark.parametrize("dataset_id", IDS)
+    @pytest.mark.parametrize("engine", [divide_and_conquer, sweep_hull])
+    def test_engine_twins(self, dataset_id : str, engine) -> None:
+        points = PointSet.from_bytes(POINTS[dataset_id])
+        mesh = engine([p.x for p in points], [p.y for p in points])
+        assert list(mesh.twins) == list(HalfEdgeMesh(mesh.vertices).twins)
+
+    def test_twins_lazy(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        expected = triangulate(points)
+        # Exporting the mesh of the default engine does not find its twins
+        monkeypatch.setattr(HalfEdgeMesh, "_find_twins", None)
+        assert triangulate(points) == expected
+
+    @pytest.mark.parametrize("dataset_id", IDS[:3])
+    def test_to_triangles(self, dataset_id : str) -> None:
+        points = PointSet.from_bytes(POINTS[dataset_id])
+        mesh = sweep_hull([p.x for p in points], [p.y for p in points])
+        assert mesh.to_triangles(points) == triangulate(points, engine="sweep-hull")
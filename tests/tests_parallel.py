@@ -0,0 +1,47 @@
+from random import Random
+
+import pytest
+
+from triangulator.divide_and_conquer import divide_and_conquer
+from triangulator.mesh import _canonical
+from triangulator.parallel import _strips, parallel_divide_and_conquer
+from triangulator.pointset import PointSet
+from triangulator.triangulator import triangulate
+from datasets import IDS, POINTS
+
+
+class TestParallel:
+    @pytest.mark.parametrize("grid", [False, True])
+    def test_same_as_single_process(self, grid : bool) -> None:
+        rng = Random(5)
+        points = set()
+        while len(points) < 1500:
+            if grid: # cocircular points, where the choice of diagonals depends on the merges
+                points.add((float(rng.randint(0, 50)), float(rng.randint(0, 50))))
+            else:
+                points.add((rng.uniform(-1000, 1000), rng.uniform(-1000, 1000)))
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        expected = _canonical(divide_and_conquer(xs, ys))
+        assert _canonical(parallel_divide_and_conquer(xs, ys, workers=4, min_partition_size=100)) == expected
+
+    @pytest.mark.parametrize("n, depth, expected", [
+        (10, 0, [(0, 10)]),
+        (10, 1, [(0, 5), (5, 10)]),
+        (11, 2, [(0, 2), (2, 5), (5, 8), (8, 11)]),
+    ])
+    def test_strips(self, n : int, depth : int, expected : list[tuple[int, int]]) -> None:
+        assert _strips(0, n, depth) == expected
+
+    @pytest.mark.parametrize("dataset_id", IDS[:3])
+    def test_triangulate_workers(self, dataset_id : str) -> None:
+        points = PointSet.from_bytes(POINTS[dataset_id])
+        expected = triangulate(points, engine="divide-and-conquer")
+        assert triangulate(points, engine="divide-and-conquer", workers=2, min_partition_size=2) == expected
+
+    @pytest.mark.parametrize("workers, min_partition_size", [(0, 100), (2, 0)])
+    def test_invalid_parameters(self, workers : int, min_partition_size : int) -> None:
+        with pytest.raises(ValueError):
+            parallel_divide_and_conquer([0.0, 1.0, 0.0], [0.0, 0.0, 1.0], workers, min_partition_size)
+        with pytest.raises(ValueError):
+            triangulate(PointSet([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)]), workers=workers, min_partition_size=min_partition_size)
@@ -1,3 +1,6 @@
+import io
+from struct import pack
+
 import pytest
 
 from triangulator.pointset import PointSet
@@ -67,4 +70,145 @@ class TestPointSet:
     def test_from_bytes_with_size_wrong_size(self) -> None:
         data = (3).to_bytes(4, byteorder='little') + b'\x00' * 16  # only 1 point instead of 3
         with pytest.raises(ValueError):
-            PointSet.from_bytes(data)
\ No newline at end of file
+            PointSet.from_bytes(data)
+
+    def test_init_duplicates(self) -> None:
+        with pytest.raises(ValueError):
+            PointSet([ (0.0, 0.0), (1.0, 1.0), (0.0, 0.0) ])
+
+    def test_contains(self, sample_pointset: PointSet) -> None:
+        assert (1.0, 1.0) in sample_pointset
+        assert Point(2.0, 2.0) in sample_pointset
+        assert (3.0, 3.0) not in sample_pointset
+        assert "not a point" not in sample_pointset
+
+    def test_set_point_updates_index(self, sample_pointset: PointSet) -> None:
+        sample_pointset.set_point(1, (5.0, 5.0))
+        assert (1.0, 1.0) not in sample_pointset
+        assert sample_pointset.add_point((1.0, 1.0)) == 3
+        with pytest.raises(ValueError):
+            sample_pointset.add_point((5.0, 5.0))
+        with pytest.raises(ValueError):
+            sample_pointset.set_point(0, (5.0, 5.0)) # already at index 1
+        sample_pointset.set_point(-1, (1.0, 1.0)) # same point, same index
+        assert sample_pointset.get_point(3) == (1.0, 1.0)
+
+    def test_remove_point_updates_index(self, sample_pointset: PointSet) -> None:
+        sample_pointset.remove_point((0.0, 0.0))
+        assert sample_pointset.get_point(0) == (1.0, 1.0)
+        sample_pointset.remove_point((2.0, 2.0))
+        assert list(sample_pointset) == [ (1.0, 1.0) ]
+        assert sample_pointset.add_point((0.0, 0.0)) == 1
+
+    def test_from_coordinates(self, sample_pointset: PointSet) -> None:
+        pointset = PointSet.from_coordinates([0.0, 1.0, 2.0], [0.0, 1.0, 2.0])
+        assert pointset == sample_pointset
+        assert (2.0, 2.0) in pointset
+        with pytest.raises(ValueError):
+            pointset.add_point((1.0, 1.0))
+
+    @pytest.mark.parametrize("xs, ys", [
+        ([0.0, 1.0, 0.0], [0.0, 1.0, 0.0]), # duplicate points
+        ([0.0, 1.0], [0.0]), # missing coordinate
+    ])
+    def test_from_coordinates_invalid(self, xs : list[float], ys : list[float]) -> None:
+        with pytest.raises(ValueError):
+            PointSet.from_coordinates(xs, ys)
+
+    def test_from_bytes_duplicates(self) -> None:
+        data = PointSet([ (0.0, 0.0), (1.0, 1.0) ]).to_bytes()
+        data = (3).to_bytes(4, byteorder='big') + data[4:] + data[4:12] # first point repeated
+        with pytest.raises(ValueError, match="already exists"):
+            PointSet.from_bytes(data)
+
+    def test_columns(self, sample_pointset: PointSet) -> None:
+        assert sample_pointset.xs.typecode == 'd'
+        assert sample_pointset.xs.tolist() == [0.0, 1.0, 2.0]
+        assert sample_pointset.ys.tolist() == [0.0, 1.0, 2.0]
+        sample_pointset.remove_point((1.0, 1.0))
+        sample_pointset.add_point((3.0, 4.0))
+        assert sample_pointset.xs.tolist() == [0.0, 2.0, 3.0]
+        assert sample_pointset.ys.tolist() == [0.0, 2.0, 4.0]
+
+    def test_index_rebuilt_after_remove(self) -> None:
+        pointset = PointSet.from_coordinates([0.0, 1.0, 2.0, 3.0], [0.0, 1.0, 2.0, 3.0])
+        pointset.remove_point((1.0, 1.0))
+        pointset.set_point(2, (5.0, 5.0))
+        assert list(pointset) == [ (0.0, 0.0), (2.0, 2.0), (5.0, 5.0) ]
+        with pytest.raises(ValueError):
+            pointset.add_point((2.0, 2.0))
+        assert pointset.add_point((3.0, 3.0)) == 3
+
+    def test_to_bytes_format(self) -> None:
+        pointset = PointSet([ (0.1, -2.5), (1e10, 3.0) ])
+        assert pointset.to_bytes() == pack('!Lffff', 2, 0.1, -2.5, 1e10, 3.0)
+
+    def test_to_bytes_overflow(self) -> None:
+        with pytest.raises(OverflowError):
+            PointSet([ (1e300, 0.0) ]).to_bytes()
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+    def test_iter_bytes_write_to(self, sample_pointset: PointSet, chunk_size : int) -> None:
+        chunks = list(sample_pointset.iter_bytes(chunk_size))
+        assert len(chunks) == 1 + -(-3 // chunk_size)
+        assert b"".join(chunks) == sample_pointset.to_bytes()
+        stream = io.BytesIO()
+        assert sample_pointset.write_to(stream, chunk_size) == 4 + 3 * 8
+        assert stream.getvalue() == sample_pointset.to_bytes()
+
+    def test_from_bytes_memoryview(self, sample_pointset: PointSet) -> None:
+        buffer = bytearray(b"header") + sample_pointset.to_bytes() + b"trailer"
+        pointset = PointSet.from_bytes_with_size(memoryview(buffer)[10:-7], 3)
+        assert pointset == sample_pointset
+        assert PointSet.from_bytes(memoryview(buffer)[6:-7]) == sample_pointset
+
+    def test_open_mmap(self, sample_pointset: PointSet, tmp_path) -> None:
+        path = tmp_path / "points.bin"
+        path.write_bytes(sample_pointset.to_bytes())
+        pointset = PointSet.open_mmap(path)
+        assert pointset == sample_pointset
+        assert sample_pointset == pointset
+        assert len(pointset) == 3
+        assert pointset.get_point(-1) == (2.0, 2.0)
+        assert (1.0, 1.0) in pointset
+        assert pointset.to_bytes() == sample_pointset.to_bytes()
+
+    @pytest.mark.parametrize("index", [slice(None), slice(1, None), slice(None, None, 2), slice(None, None, -1), slice(2, 0, -2), slice(3, 5)])
+    def test_open_mmap_slices(self, tmp_path, index : slice) -> None:
+        xs, ys = [0.0, 1.5, 2.0, -3.25, 4.0], [5.0, 6.0, 7.5, 8.0, 9.0]
+        path = tmp_path / "points.bin"
+        path.write_bytes(PointSet.from_coordinates(xs, ys).to_bytes())
+        pointset = PointSet.open_mmap(path)
+        assert pointset.xs[index].tolist() == xs[index]
+        assert pointset.ys[index].tolist() == ys[index]
+        assert pointset.xs.tolist() == xs
+
+    def test_open_mmap_read_only(self, sample_pointset: PointSet, tmp_path) -> None:
+        path = tmp_path / "points.bin"
+        path.write_bytes(sample_pointset.to_bytes())
+        pointset = PointSet.open_mmap(path)
+        with pytest.raises(TypeError):
+            pointset.add_point((3.0, 3.0))
+        with pytest.raises(TypeError):
+            pointset.set_point(0, (3.0, 3.0))
+        with pytest.raises(TypeError):
+            pointset.remove_point((0.0, 0.0))
+        assert pointset == sample_pointset
+
+    @pytest.mark.parametrize("data", [b"", b"\x00\x00", (2).to_bytes(4, byteorder='big') + bytes(8)])
+    def test_open_mmap_invalid(self, tmp_path, data : bytes) -> None:
+        path = tmp_path / "points.bin"
+        path.write_bytes(data)
+        with pytest.raises(ValueError):
+            PointSet.open_mmap(path)
+
+    def test_digest(self, sample_pointset: PointSet, tmp_path) -> None:
+        digest = sample_pointset.digest()
+        assert len(digest) == 32
+        assert PointSet.from_coordinates([0.0, 1.0, 2.0], [0.0, 1.0, 2.0]).digest() == digest
+        assert PointSet([ (1.0, 1.0), (0.0, 0.0), (2.0, 2.0) ]).digest() != digest # same points, other order
+        assert PointSet([ (0.0, 0.0), (1.0, 1.0), (2.0, 2.000001) ]).digest() != digest
+        assert PointSet().digest() != PointSet([ (0.0, 0.0) ]).digest()
+        path = tmp_path / "points.bin"
+        path.write_bytes(sample_pointset.to_bytes())
+        assert PointSet.open_mmap(path).digest() == digest
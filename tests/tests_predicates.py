@@ -0,0 +1,84 @@
+from fractions import Fraction
+from math import ulp
+from random import Random
+
+import pytest
+
+from triangulator.predicates import in_circle, in_circle_det, orientation
+
+np = pytest.importorskip("numpy")
+from triangulator.predicates import in_circle_batch, orientation_batch  # noqa: E402
+
+
+class TestPredicates:
+    @pytest.mark.parametrize("triangle, expected", [
+        ((0.0, 0.0, 1.0, 0.0, 0.0, 1.0), 1.0), # counter-clockwise
+        ((0.0, 0.0, 0.0, 1.0, 1.0, 0.0), -1.0), # clockwise
+        ((0.0, 0.0, 1.0, 1.0, 2.0, 2.0), 0.0), # collinear
+    ])
+    def test_orientation(self, triangle : tuple[float, ...], expected : float) -> None:
+        assert orientation(*triangle) == expected
+        assert orientation_batch(*triangle) == expected
+
+    @pytest.mark.parametrize("point, expected", [
+        ((0.5, 0.5), True),
+        ((2.0, 2.0), False),
+        ((1.0, 1.0), False), # on the circle
+    ])
+    def test_in_circle_both_orientations(self, point : tuple[float, float], expected : bool) -> None:
+        assert in_circle(0.0, 0.0, 1.0, 0.0, 0.0, 1.0, *point) == expected
+        assert in_circle(0.0, 0.0, 0.0, 1.0, 1.0, 0.0, *point) == expected
+
+    @pytest.mark.parametrize("i", range(0, 256, 17))
+    def test_orientation_near_degenerate(self, i : int) -> None:
+        # Points a few ulps away from the line y = x, where the naive determinant often has the wrong sign
+        x = 0.5 + i * ulp(0.5)
+        y = 0.5 + (i % 7) * ulp(0.5)
+        exact = (Fraction(12) - Fraction(x)) * (Fraction(24) - Fraction(y)) - (Fraction(12) - Fraction(y)) * (Fraction(24) - Fraction(x))
+        result = orientation(x, y, 12.0, 12.0, 24.0, 24.0)
+        assert (result > 0) == (exact > 0)
+        assert (result < 0) == (exact < 0)
+        assert orientation_batch(x, y, 12.0, 12.0, 24.0, 24.0)[0] == result
+
+    @pytest.mark.parametrize("offset", [0.0, 1e6, 1e12])
+    def test_in_circle_cocircular(self, offset : float) -> None:
+        # The four corners of a square are cocircular, wherever the square is
+        square = (offset, offset, offset + 1.0, offset, offset + 1.0, offset + 1.0)
+        assert in_circle_det(*square, offset, offset + 1.0) == 0
+        assert not in_circle(*square, offset, offset + 1.0)
+        assert in_circle(*square, offset + 0.5, offset + 0.5)
+
+    def test_in_circle_near_cocircular(self) -> None:
+        rng = Random(7)
+        for _ in range(200):
+            x, y = rng.choice([-1.0, 1.0]) * ulp(1.0) * rng.randint(0, 4), 1.0 + ulp(1.0) * rng.randint(-4, 4)
+            values = (-1.0, 0.0, 0.0, -1.0, 1.0, 0.0, x, y)
+            a0, b0, c0, p0 = (Fraction(values[k]) for k in (0, 2, 4, 6))
+            a1, b1, c1, p1 = (Fraction(values[k]) for k in (1, 3, 5, 7))
+            ax, ay, bx, by, cx, cy = a0 - p0, a1 - p1, b0 - p0, b1 - p1, c0 - p0, c1 - p1
+            exact = (ax * ax + ay * ay) * (bx * cy - cx * by) + (bx * bx + by * by) * (cx * ay - ax * cy) + (cx * cx + cy * cy) * (ax * by - bx * ay)
+            result = in_circle_det(*values)
+            assert (result > 0) == (exact > 0)
+            assert (result < 0) == (exact < 0)
+            assert in_circle_batch(*values)[0] == in_circle(*values)
+
+    def test_extreme_magnitudes(self) -> None:
+        assert orientation(0.0, 0.0, 1e300, 1e-300, 1e300, 2e-300) > 0
+        assert orientation(0.0, 0.0, 1e-150, 1e-150, 1e-150, 2e-150) > 0
+        assert in_circle_det(-1e200, 0.0, 0.0, -1e200, 1e200, 0.0, 0.0, 1e-200) > 0
+
+    def test_batch_matches_scalar(self) -> None:
+        rng = Random(42)
+        coords = [[rng.uniform(-1000, 1000) for _ in range(500)] for _ in range(8)]
+        inside = in_circle_batch(*(np.array(c) for c in coords))
+        signs = orientation_batch(*(np.array(c) for c in coords[:6]))
+        for i in range(500):
+            values = [c[i] for c in coords]
+            assert inside[i] == in_circle(*values)
+            assert signs[i] == orientation(*values[:6])
+
+    def test_batch_broadcasts_point(self) -> None:
+        x0 = np.array([0.0, 10.0])
+        y0 = np.array([0.0, 10.0])
+        inside = in_circle_batch(x0, y0, x0 + 1.0, y0, x0, y0 + 1.0, 0.5, 0.5)
+        assert inside.tolist() == [True, False]
@@ -0,0 +1,199 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from triangulator.singleflight import SingleFlight
+
+
+def wait_until(condition, timeout : float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_concurrently(target, count : int) -> list:
+    outcomes = [None] * count
+
+    def worker(i : int) -> None:
+        try:
+            outcomes[i] = target()
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+class TestSingleFlight:
+    def test_do_shared(self) -> None:
+        flights = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute() -> str:
+            calls.append(1)
+            release.wait()
+            return "result"
+
+        threads, outcomes = run_concurrently(lambda: flights.do("a", compute), 8)
+        wait_until(lambda: flights.shared == 7)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert outcomes == ["result"] * 8
+        assert len(calls) == 1
+
+    def test_do_error_shared(self) -> None:
+        flights = SingleFlight()
+        release = threading.Event()
+
+        def compute() -> str:
+            release.wait()
+            raise KeyError("Point set ID not found")
+
+        threads, outcomes = run_concurrently(lambda: flights.do("a", compute), 4)
+        wait_until(lambda: flights.shared == 3)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert all(isinstance(outcome, KeyError) for outcome in outcomes)
+
+    def test_do_sequential(self) -> None:
+        flights = SingleFlight()
+        calls = []
+        assert flights.do("a", lambda: calls.append(1) or 1) == 1
+        with pytest.raises(ValueError):
+            flights.do("a", lambda: int("x"))
+        assert flights.do("a", lambda: calls.append(1) or 2) == 2
+        assert len(calls) == 2
+        assert flights.shared == 0
+
+    def test_do_different_keys(self) -> None:
+        flights = SingleFlight()
+        inner = flights.do("a", lambda: flights.do("b", lambda: "b"))
+        assert inner == "b"
+        assert flights.shared == 0
+
+    def test_do_async_shared(self) -> None:
+        flights = SingleFlight()
+        calls = []
+
+        async def compute() -> str:
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def scenario():
+            return await asyncio.gather(*(flights.do_async("a", compute) for _ in range(8)))
+
+        assert asyncio.run(scenario()) == ["result"] * 8
+        assert len(calls) == 1
+        assert flights.shared == 7
+
+    def test_do_async_error_shared(self) -> None:
+        flights = SingleFlight()
+
+        async def compute() -> str:
+            await asyncio.sleep(0.01)
+            raise KeyError("Point set ID not found")
+
+        async def scenario():
+            return await asyncio.gather(*(flights.do_async("a", compute) for _ in range(4)), return_exceptions=True)
+
+        assert all(isinstance(outcome, KeyError) for outcome in asyncio.run(scenario()))
+
+    def test_do_async_cancelled_caller(self) -> None:
+        flights = SingleFlight()
+
+        async def compute() -> str:
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def scenario():
+            first = asyncio.ensure_future(flights.do_async("a", compute))
+            second = asyncio.ensure_future(flights.do_async("a", compute))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second, await flights.do_async("a", compute)
+
+        assert asyncio.run(scenario()) == ("result", "result")
+        assert flights.shared == 1
+
+    def test_join_shared(self) -> None:
+        flights = SingleFlight()
+        started = []
+
+        def start() -> Future:
+            started.append(1)
+            return Future()
+
+        first, leader = flights.join("a", start)
+        assert leader
+        second, leader = flights.join("a", start)
+        assert second is first and not leader
+        assert flights.shared == 1
+        first.set_result("result")
+        # Finished computations are not joined anymore
+        third, leader = flights.join("a", start)
+        assert third is not first and leader
+        assert len(started) == 2
+
+    def test_join_start_fails(self) -> None:
+        flights = SingleFlight()
+
+        def start() -> Future:
+            raise RuntimeError("Pool full")
+
+        with pytest.raises(RuntimeError):
+            flights.join("a", start)
+        assert flights.do("a", lambda: "result") == "result"
+
+    def test_join_done(self) -> None:
+        flights = SingleFlight()
+        done = Future()
+        done.set_result("result")
+        assert flights.join("a", lambda: done) == (done, True)
+        assert flights.do("a", lambda: "other") == "other"
+
+    def test_do_joins_started(self) -> None:
+        flights = SingleFlight()
+        job, _ = flights.join("a", Future)
+        threads, outcomes = run_concurrently(lambda: flights.do("a", lambda: "other"), 3)
+        wait_until(lambda: flights.shared == 3)
+        job.set_result("result")
+        for thread in threads:
+            thread.join()
+        assert outcomes == ["result"] * 3
+
+    def test_join_shares_do(self) -> None:
+        flights = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def compute() -> str:
+            started.set()
+            release.wait()
+            return "result"
+
+        threads, outcomes = run_concurrently(lambda: flights.do("a", compute), 1)
+        started.wait()
+        job, leader = flights.join("a", Future)
+        assert not leader
+        release.set()
+        assert job.result(timeout=5) == "result"
+        threads[0].join()
+        assert outcomes == ["result"]
+
+    def test_join_error_shared(self) -> None:
+        flights = SingleFlight()
+        first, _ = flights.join("a", Future)
+        second, _ = flights.join("a", Future)
+        first.set_exception(RuntimeError("Triangulation failed"))
+        with pytest.raises(RuntimeError):
+            second.result()
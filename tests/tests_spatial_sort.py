@@ -0,0 +1,32 @@
+import pytest
+
+from triangulator.spatial_sort import brio_order, hilbert_keys, hilbert_order
+
+
+class TestSpatialSort:
+    def test_hilbert_keys_follow_curve(self) -> None:
+        xs = [1.0, 0.0, 1.0, 0.0]
+        ys = [0.0, 1.0, 1.0, 0.0]
+        keys = hilbert_keys(xs, ys)
+        assert keys[3] < keys[1] < keys[2] < keys[0]
+
+    def test_hilbert_keys_empty(self) -> None:
+        assert hilbert_keys([], []) == []
+
+    def test_hilbert_order_grid_is_continuous(self) -> None:
+        xs = [float(i % 8) for i in range(64)]
+        ys = [float(i // 8) for i in range(64)]
+        order = hilbert_order(xs, ys)
+        assert sorted(order) == list(range(64))
+        for a, b in zip(order, order[1:]):
+            assert abs(xs[a] - xs[b]) + abs(ys[a] - ys[b]) == 1.0
+
+    @pytest.mark.parametrize("n", [0, 1, 10, 1000])
+    def test_brio_order_is_permutation(self, n : int) -> None:
+        xs = [float((i * 7919) % 1009) for i in range(n)]
+        ys = [float((i * 104729) % 1013) for i in range(n)]
+        order = brio_order(xs, ys)
+        assert sorted(order) == list(range(n))
+        assert brio_order(xs, ys) == order
+        if n >= 10:
+            assert brio_order(xs, ys, seed=1) != order
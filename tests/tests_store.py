@@ -0,0 +1,200 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from datasets import IDS, MALFORMED_ID
+from triangulator import store
+from triangulator.store import ResultStore
+
+
+def key(name : str) -> str:
+    return hashlib.sha256(name.encode()).hexdigest()
+
+
+class TestResultStore:
+    def test_put_open(self, tmp_path) -> None:
+        results = ResultStore(tmp_path, 100)
+        assert results.open(key("a")) is None
+        results.put(key("a"), [b"123", b"45"])
+        assert key("a") in results
+        assert key("b") not in results
+        with results.open(key("a")) as file:
+            assert file.read() == b"12345"
+        assert results.size == 5
+
+    def test_persistent(self, tmp_path) -> None:
+        ResultStore(tmp_path, 100).put(key("a"), [b"12345"])
+        ResultStore(tmp_path, 100).set_digest(IDS[0], bytes.fromhex(key("a")))
+        reopened = ResultStore(tmp_path, 100)
+        assert reopened.digest_of(IDS[0]) == bytes.fromhex(key("a"))
+        with reopened.open(key("a")) as file:
+            assert file.read() == b"12345"
+
+    def test_replace(self, tmp_path) -> None:
+        results = ResultStore(tmp_path, 100)
+        results.put(key("a"), [b"12345"])
+        results.put(key("a"), [b"123"])
+        with results.open(key("a")) as file:
+            assert file.read() == b"123"
+        assert results.size == 3
+
+    def test_interrupted_write(self, tmp_path) -> None:
+        results = ResultStore(tmp_path, 100)
+        results.put(key("a"), [b"12345"])
+        with pytest.raises(RuntimeError), results.writing(key("a")) as file:
+            file.write(b"678")
+            raise RuntimeError("Triangulation failed")
+        with results.open(key("a")) as file:
+            assert file.read() == b"12345"
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_closed_generator(self, tmp_path) -> None:
+        results = ResultStore(tmp_path, 100)
+
+        def chunks():
+            with results.writing(key("a")) as file:
+                for chunk in (b"123", b"45"):
+                    file.write(chunk)
+                    yield chunk
+
+        generator = chunks()
+        next(generator)
+        generator.close()
+        assert key("a") not in results
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_too_large(self, tmp_path) -> None:
+        results = ResultStore(tmp_path, 4)
+        results.put(key("a"), [b"12345"])
+        assert key("a") not in results
+        assert results.size == 0
+
+    def test_lru_eviction(self, tmp_path) -> None:
+        results = ResultStore(tmp_path, 10)
+        results.put(key("a"), [b"1234"])
+        results.put(key("b"), [b"1234"])
+        results.set_digest(IDS[0], bytes.fromhex(key("a")))
+        results.set_digest(IDS[1], bytes.fromhex(key("b")))
+        os.utime(tmp_path / "results" / key("a"), (1, 1))
+        os.utime(tmp_path / "results" / key("b"), (2, 2))
+        results.open(key("a")).close() # b becomes the least recently used
+        results.put(key("c"), [b"1234"])
+        assert key("a") in results
+        assert key("b") not in results
+        assert key("c") in results
+        assert results.size == 8
+        assert results.digest_of(IDS[0]) == bytes.fromhex(key("a"))
+        assert results.digest_of(IDS[1]) is None
+
+    def test_eviction_after_restart(self, tmp_path, monkeypatch : pytest.MonkeyPatch) -> None:
+        results = ResultStore(tmp_path, 10)
+        results.put(key("a"), [b"1234"])
+        results.put(key("b"), [b"1234"])
+        results.set_digest(IDS[0], bytes.fromhex(key("a")))
+        results.set_digest(IDS[1], bytes.fromhex(key("a")))
+        results.set_digest(IDS[1], bytes.fromhex(key("b"))) # now points to b
+        os.utime(tmp_path / "results" / key("a"), (1, 1))
+        os.utime(tmp_path / "results" / key("b"), (2, 2))
+
+        reopened = ResultStore(tmp_path, 10)
+        assert reopened.size == 8
+        # Evictions use the index built when the store was opened, not the directory
+        monkeypatch.setattr(Path, "iterdir", None)
+        monkeypatch.setattr(Path, "read_bytes", None)
+        reopened.put(key("c"), [b"1234"])
+        assert key("a") not in reopened
+        assert key("b") in reopened
+        assert reopened.size == 8
+        assert not (tmp_path / "ids" / IDS[0]).exists()
+        assert (tmp_path / "ids" / IDS[1]).exists()
+
+    def test_open_evicted(self, tmp_path) -> None:
+        results = ResultStore(tmp_path, 5)
+        results.put(key("a"), [b"12345"])
+        with results.open(key("a")) as file:
+            results.put(key("b"), [b"12345"])
+            assert key("a") not in results
+            assert file.read() == b"12345"
+
+    def test_leftovers(self, tmp_path) -> None:
+        ResultStore(tmp_path, 100)
+        (tmp_path / "results" / "crashed.tmp").write_bytes(b"123")
+        (tmp_path / "ids" / "crashed.tmp").write_bytes(b"123")
+        ResultStore(tmp_path, 100)
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_digest_pending(self, tmp_path) -> None:
+        results = ResultStore(tmp_path, 100)
+        results.set_digest(IDS[0], bytes.fromhex(key("a")))
+        # Nothing is written before the result is stored
+        assert not list((tmp_path / "ids").iterdir())
+        assert results.digest_of(IDS[0]) is None
+        results.put(key("a"), [b"12345"])
+        assert results.digest_of(IDS[0]) == bytes.fromhex(key("a"))
+
+    def test_digest_never_stored(self, tmp_path, monkeypatch : pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(store, "MAX_PENDING_IDS", 2)
+        results = ResultStore(tmp_path, 100)
+        for point_set_id, name in zip(IDS[:3], "abc"):
+            results.set_digest(point_set_id, bytes.fromhex(key(name)))
+        assert not list((tmp_path / "ids").iterdir())
+        # The oldest pending ID was forgotten
+        for name in "abc":
+            results.put(key(name), [b"12"])
+        assert [results.digest_of(point_set_id) for point_set_id in IDS[:3]] == [None, bytes.fromhex(key("b")), bytes.fromhex(key("c"))]
+
+    def test_digest_changed(self, tmp_path) -> None:
+        results = ResultStore(tmp_path, 100)
+        results.put(key("a"), [b"12345"])
+        results.set_digest(IDS[0], bytes.fromhex(key("a")))
+        # The point set changed, and its new result is not stored yet
+        results.set_digest(IDS[0], bytes.fromhex(key("b")))
+        assert results.digest_of(IDS[0]) is None
+
+    def test_orphan_ids(self, tmp_path) -> None:
+        ResultStore(tmp_path, 100)
+        (tmp_path / "ids" / IDS[0]).write_bytes(bytes.fromhex(key("a")))
+        assert ResultStore(tmp_path, 100).digest_of(IDS[0]) is None
+        assert not (tmp_path / "ids" / IDS[0]).exists()
+
+    @pytest.mark.parametrize("point_set_id, digest", [
+        (MALFORMED_ID, bytes(32)),
+        ("../" + IDS[0], bytes(32)),
+        (IDS[0], bytes(16)),
+    ])
+    def test_set_digest_invalid(self, tmp_path, point_set_id : str, digest : bytes) -> None:
+        with pytest.raises(ValueError):
+            ResultStore(tmp_path, 100).set_digest(point_set_id, digest)
+
+    def test_digest_of_unknown(self, tmp_path) -> None:
+        results = ResultStore(tmp_path, 100)
+        assert results.digest_of(IDS[0]) is None
+        assert results.digest_of(MALFORMED_ID) is None
+
+    @pytest.mark.parametrize("name", ["abc", "../" + key("a"), key("a").upper()])
+    def test_invalid_key(self, tmp_path, name : str) -> None:
+        results = ResultStore(tmp_path, 100)
+        with pytest.raises(ValueError):
+            results.put(name, [b"12345"])
+        with pytest.raises(ValueError):
+            results.open(name)
+        assert name not in results
+
+    def test_invalid_size(self, tmp_path) -> None:
+        with pytest.raises(ValueError):
+            ResultStore(tmp_path, -1)
+
+    def test_from_environment(self, tmp_path, monkeypatch : pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("TRIANGULATION_STORE_DIR", raising=False)
+        monkeypatch.delenv("TRIANGULATION_STORE_BYTES", raising=False)
+        assert ResultStore.from_environment() is None
+
+        monkeypatch.setenv("TRIANGULATION_STORE_DIR", str(tmp_path))
+        results = ResultStore.from_environment()
+        assert results.max_bytes == store.DEFAULT_STORE_BYTES
+        assert (tmp_path / "results").is_dir()
+
+        monkeypatch.setenv("TRIANGULATION_STORE_BYTES", "1000")
+        assert ResultStore.from_environment().max_bytes == 1000
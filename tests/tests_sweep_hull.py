@@ -0,0 +1,58 @@
+from random import Random
+
+import pytest
+
+from triangulator.divide_and_conquer import divide_and_conquer
+from triangulator.pointset import PointSet
+from triangulator.predicates import in_circle, orientation
+from triangulator.sweep_hull import sweep_hull
+from datasets import IDS, POINTS
+
+
+class TestSweepHull:
+    @pytest.mark.parametrize("points, expected", [
+        ([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)], 1),
+        ([(0.0, 0.0), (1.0, 0.0)], 0), # not enough points
+        ([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0), (3.0, 0.0)], 0), # all collinear
+        ([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0), (1.0, 1.0)], 2), # collinear hull edge
+        ([(0.0, 0.0), (2.0, 0.0), (1.0, 1.0), (0.0, 2.0), (2.0, 2.0)], 4),
+    ])
+    def test_triangle_count(self, points : list[tuple[float, float]], expected : int) -> None:
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        assert len(sweep_hull(xs, ys)) == expected
+
+    @pytest.mark.parametrize("dataset_id", IDS)
+    def test_delaunay_and_clockwise(self, dataset_id : str) -> None:
+        points = PointSet.from_bytes(POINTS[dataset_id])
+        xs = [p.x for p in points]
+        ys = [p.y for p in points]
+        triangles = sweep_hull(xs, ys)
+        for a, b, c in triangles:
+            assert orientation(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]) < 0
+            for i in range(len(xs)):
+                if i not in (a, b, c):
+                    assert not in_circle(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], xs[i], ys[i])
+
+    def test_same_as_divide_and_conquer(self) -> None:
+        rng = Random(7)
+        points = {(rng.uniform(-1000, 1000), rng.uniform(-1000, 1000)) for _ in range(2000)}
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        expected = {frozenset(t) for t in divide_and_conquer(xs, ys)}
+        assert {frozenset(t) for t in sweep_hull(xs, ys)} == expected
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_nearly_collinear(self, seed : int) -> None:
+        # Rounded sweep distances put some points on the hull or inside it
+        rng = Random(seed)
+        xs = [rng.uniform(0, 40) for _ in range(40)]
+        ys = [rng.uniform(-1e-9, 1e-9) for _ in range(40)]
+        triangles = sweep_hull(xs, ys)
+        assert {i for triangle in triangles for i in triangle} == set(range(len(xs)))
+        for a, b, c in triangles:
+            assert orientation(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]) < 0
+            for i in range(len(xs)):
+                if i not in (a, b, c):
+                    assert not in_circle(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], xs[i], ys[i])
+        assert {frozenset(t) for t in triangles} == {frozenset(t) for t in divide_and_conquer(xs, ys)}
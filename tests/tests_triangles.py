@@ -1,3 +1,6 @@
+import io
+from struct import pack
+
 import pytest
 
 from triangulator.triangles import Triangles
@@ -19,10 +22,10 @@ class TestTriangles:
             sample_triangles.get_triangle(2)
     
     def test_set_triangle(self, sample_triangles: Triangles) -> None:
-        sample_triangles.set_triangle(1, (5, 6, 7))
-        assert sample_triangles.get_triangle(1) == Triangle(5, 6, 7)
+        sample_triangles.set_triangle(1, (1, 3, 4))
+        assert sample_triangles.get_triangle(1) == Triangle(1, 3, 4)
         with pytest.raises(IndexError):
-            sample_triangles.set_triangle(2, (8, 9, 10))
+            sample_triangles.set_triangle(2, (0, 3, 4))
     
     def test_len_nb_triangles(self, sample_triangles: Triangles) -> None:
         assert len(sample_triangles) == 2
@@ -67,7 +70,7 @@ class TestTriangles:
         (Triangles([(0,0), (1,0), (0,1)], [(0,1,2)]), Triangles([(0,0), (1,0), (0,1)], [(0,1,2)]), True),
         (Triangles([(0,0), (1,0), (0,1)], [(0,1,2)]), Triangles([(0,0), (1,0), (0,1)], [(1,2,0)]), True),
         (Triangles([(0,0), (1,0), (0,2)], [(0,1,2)]), Triangles([(0,0), (1,0), (0,1)], [(0,1,2)]), False),
-        (Triangles([(0,0), (1,0), (0,1)], [(0,1,2), (1,2,0)]), Triangles([(0,0), (1,0), (0,1)], [(0,1,2)]), False)
+        (Triangles([(0,0), (1,0), (0,1), (1,1)], [(0,1,2), (1,3,2)]), Triangles([(0,0), (1,0), (0,1), (1,1)], [(0,1,2)]), False)
     ])
     def test_triangles_equality(self, t1 : Triangles, t2 : Triangles, expected : bool) -> None:
         assert (t1 == t2) == expected
@@ -75,3 +78,108 @@ class TestTriangles:
     def test_triangles_equality_type_error(self, sample_triangles: Triangles) -> None:
         with pytest.raises(TypeError):
             _ = sample_triangles == "not a triangles object"
+
+    @pytest.mark.parametrize("triangle, error", [
+        ((0, 1, 5), IndexError), # index out of bounds
+        ((0, 1, -1), IndexError), # negative index
+        ((0, 1, 1), ValueError), # non-distinct points
+        ((2, 1, 0), ValueError), # same points as (0, 1, 2)
+    ])
+    def test_add_triangle_invalid(self, sample_triangles: Triangles, triangle : tuple[int, int, int], error : type[Exception]) -> None:
+        with pytest.raises(error):
+            sample_triangles.add_triangle(triangle)
+        assert len(sample_triangles) == 2
+
+    def test_add_triangle(self, sample_triangles: Triangles) -> None:
+        assert sample_triangles.add_triangle((1, 3, 4)) == 2
+        assert sample_triangles.get_triangle(2) == Triangle(1, 3, 4)
+        assert list(sample_triangles.indices) == [0, 1, 2, 2, 3, 4, 1, 3, 4]
+
+    @pytest.mark.parametrize("triangle", [(5, 6, 7), (0, 0, 1), (4, 3, 2)])
+    def test_set_triangle_invalid(self, sample_triangles: Triangles, triangle : tuple[int, int, int]) -> None:
+        with pytest.raises(ValueError):
+            sample_triangles.set_triangle(0, triangle)
+        assert sample_triangles.get_triangle(0) == Triangle(0, 1, 2)
+
+    def test_remove_triangle_by_value(self, sample_triangles: Triangles) -> None:
+        sample_triangles.remove_triangle(Triangle(2, 1, 0))
+        assert list(sample_triangles) == [Triangle(2, 3, 4)]
+        sample_triangles.add_triangle((0, 1, 2))
+        sample_triangles.remove_triangle((4, 2, 3))
+        assert list(sample_triangles.indices) == [0, 1, 2]
+        with pytest.raises(ValueError):
+            sample_triangles.remove_triangle((1, 1, 2))
+
+    def test_from_indices(self, sample_triangles: Triangles) -> None:
+        triangles = Triangles.from_indices(sample_triangles.points, [0, 1, 2, 2, 3, 4])
+        assert triangles == sample_triangles
+        assert triangles.points is not sample_triangles.points
+        with pytest.raises(ValueError):
+            triangles.add_triangle((4, 3, 2))
+
+    @pytest.mark.parametrize("indices", [
+        [0, 1, 2, 2], # incomplete triangle
+        [0, 1, 5], # index out of bounds
+        [0, 1, -1], # negative index
+        [0, 1, 1], # non-distinct points
+        [0, 1, 2, 1, 2, 0], # duplicate triangles
+    ])
+    def test_from_indices_invalid(self, sample_triangles: Triangles, indices : list[int]) -> None:
+        with pytest.raises(ValueError):
+            Triangles.from_indices(sample_triangles.points, indices)
+
+    def test_to_bytes_keeps_vertex_order(self) -> None:
+        triangles = Triangles([(0,0), (0,1), (1,0)], [(2,1,0)])
+        assert triangles.to_bytes()[-12:] == bytes([0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0])
+
+    def test_to_bytes_format(self, sample_triangles: Triangles) -> None:
+        assert sample_triangles.to_bytes() == sample_triangles.points.to_bytes() + pack('!LIIIIII', 2, 0, 1, 2, 2, 3, 4)
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+    def test_iter_bytes_write_to(self, sample_triangles: Triangles, chunk_size : int) -> None:
+        assert b"".join(sample_triangles.iter_bytes(chunk_size)) == sample_triangles.to_bytes()
+        stream = io.BytesIO()
+        assert sample_triangles.write_to(stream, chunk_size) == len(sample_triangles.to_bytes())
+        assert stream.getvalue() == sample_triangles.to_bytes()
+
+    def test_from_bytes_memoryview(self, sample_triangles: Triangles) -> None:
+        buffer = bytearray(sample_triangles.to_bytes())
+        triangles = Triangles.from_bytes(memoryview(buffer))
+        assert triangles == sample_triangles
+        assert list(triangles.indices) == [0, 1, 2, 2, 3, 4]
+
+    @pytest.mark.parametrize("indices", [
+        (0, 1, 2, 0, 1), # incomplete last triangle
+        (0, 1, 2), # one triangle missing
+    ])
+    def test_from_bytes_truncated_triangles(self, sample_triangles: Triangles, indices : tuple[int, ...]) -> None:
+        data = sample_triangles.points.to_bytes() + pack('!L', 2) + pack(f'!{len(indices)}I', *indices)
+        with pytest.raises(ValueError):
+            Triangles.from_bytes(data)
+
+    def test_open_mmap(self, sample_triangles: Triangles, tmp_path) -> None:
+        path = tmp_path / "triangles.bin"
+        with path.open("wb") as stream:
+            sample_triangles.write_to(stream)
+        triangles = Triangles.open_mmap(path)
+        assert triangles == sample_triangles
+        assert list(triangles) == list(sample_triangles)
+        assert triangles.get_triangle(1) == Triangle(2, 3, 4)
+        assert triangles.to_bytes() == sample_triangles.to_bytes()
+        with pytest.raises(TypeError):
+            triangles.add_triangle((1, 3, 4))
+        with pytest.raises(TypeError):
+            triangles.remove_triangle(0)
+        with pytest.raises(TypeError):
+            triangles.set_triangle(0, (1, 3, 4))
+
+    @pytest.mark.parametrize("cut", [4, 10, 1])
+    def test_open_mmap_invalid(self, sample_triangles: Triangles, tmp_path, cut : int) -> None:
+        path = tmp_path / "triangles.bin"
+        path.write_bytes(sample_triangles.to_bytes()[:-cut])
+        with pytest.raises(ValueError):
+            Triangles.open_mmap(path)
+
+    def test_iter_triangle_bytes(self, sample_triangles: Triangles) -> None:
+        chunks = list(sample_triangles.iter_triangle_bytes(1))
+        assert chunks == [pack('!L', 2), pack('!III', 0, 1, 2), pack('!III', 2, 3, 4)]
@@ -1,12 +1,42 @@
+import asyncio
+import threading
+import time
+
 import pytest
 
+from triangulator import PSM, triangulator
+from triangulator.connections import ConnectionPool
 from triangulator.pointset import PointSet
 from triangulator.triangles import Triangles
-from triangulator.triangulator import triangulate, _are_collinear, get_and_compute
+from triangulator.triangulator import triangulate, _are_collinear, _in_circumcircle, get_and_compute, get_and_stream, get_and_stream_async, get_and_compute_batch, get_and_compute_async, get_and_compute_batch_async, compute_and_stream, RESULT_CACHE, POINT_SET_DIGESTS, FETCHES, TRIANGULATIONS
+from triangulator.store import ResultStore
+from triangulator.workers import PoolFullError, WorkerPool
 from datasets import IDS, TRIANGLES, POINTS
+from psm_server import StandInPSM
 
 
 class TestTriangulator:
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        RESULT_CACHE.clear()
+        POINT_SET_DIGESTS.clear()
+        yield
+        RESULT_CACHE.clear()
+        POINT_SET_DIGESTS.clear()
+
+    @pytest.fixture
+    def result_store(self, tmp_path, monkeypatch : pytest.MonkeyPatch) -> ResultStore:
+        results = ResultStore(tmp_path, 1024 * 1024)
+        monkeypatch.setattr(triangulator, "RESULT_STORE", results)
+        return results
+
+    @pytest.fixture
+    def worker_pool(self, monkeypatch : pytest.MonkeyPatch) -> WorkerPool:
+        pool = WorkerPool(2, 2)
+        monkeypatch.setattr(triangulator, "WORKERS", pool)
+        yield pool
+        pool.shutdown()
+
     @pytest.fixture
     def sample_triangles(self) -> Triangles:
         points = [ (0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0), (0.5, 0.5) ]
@@ -19,23 +49,55 @@ class TestTriangulator:
         (PointSet([(0.0, 0.0), (2.0, 0.0), (1.0, 1.0), (0.0, 2.0), (2.0, 2.0)]),
          Triangles([(0.0, 0.0), (2.0, 0.0), (1.0, 1.0), (0.0, 2.0), (2.0, 2.0)], [(0, 1, 2), (0, 2, 3), (1, 4, 2), (3, 2, 4)])),
     ])
-    def test_triangulate_success(self, dataset : tuple[PointSet, Triangles]) -> None:
+    @pytest.mark.parametrize("engine", ["bowyer-watson", "divide-and-conquer", "sweep-hull"])
+    def test_triangulate_success(self, dataset : tuple[PointSet, Triangles], engine : str) -> None:
         points, expected = dataset
-        result = triangulate(points)
+        result = triangulate(points, engine=engine)
         print(f"Result:   {result}\nExpected: {expected}")
         assert result == expected
 
 
 
+    @pytest.mark.parametrize("dataset_id", IDS)
+    def test_triangulate_delaunay(self, dataset_id : str) -> None:
+        points = PointSet.from_bytes(POINTS[dataset_id])
+        result = triangulate(points)
+        all_points = list(points)
+        seen = set()
+        for triangle in result:
+            indices = tuple(sorted(triangle.indices))
+            assert len(indices) == 3
+            assert indices not in seen
+            seen.add(indices)
+            for i, point in enumerate(all_points):
+                if i not in indices:
+                    assert not _in_circumcircle(point, indices, all_points)
+
+
+    @pytest.mark.parametrize("order", ["input", "hilbert", "brio"])
+    def test_triangulate_insertion_order(self, order : str) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        assert triangulate(points, order=order) == triangulate(points, order="input")
+
+    def test_triangulate_unknown_order(self) -> None:
+        with pytest.raises(ValueError):
+            triangulate(PointSet([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)]), order="random")
+
+    def test_triangulate_unknown_engine(self) -> None:
+        with pytest.raises(ValueError):
+            triangulate(PointSet([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)]), engine="quickhull")
+
+
     @pytest.mark.parametrize("points", [
         PointSet([]), # empty set
         PointSet([(0, 0)]), # not enough points
         PointSet([(0, 0), (1, 0)]), # not enough points
         PointSet([(0, 0), (1, 0), (2, 0)]), # duplicate points
     ])
-    def test_triangulate_failure(self, points : PointSet) -> None:
+    @pytest.mark.parametrize("engine", ["bowyer-watson", "divide-and-conquer", "sweep-hull"])
+    def test_triangulate_failure(self, points : PointSet, engine : str) -> None:
         with pytest.raises(ValueError):
-            triangulate(points)
+            triangulate(points, engine=engine)
             
             
     @pytest.mark.parametrize("points, expected", [
@@ -44,11 +106,49 @@ class TestTriangulator:
         (PointSet([(0, 0), (1, 0), (0, 1)]), False), # non-collinear points
         (PointSet([(0, 0), (1, 1), (2, 2), (3, 3)]), True), # collinear points
         (PointSet([(0, 0), (1, 0), (0, 1), (1, 1)]), False), # non-collinear points
+        (PointSet([(0, 0), (1e-6, 0), (0, 1e-6)]), False), # tiny but non-collinear points
     ])
     def test_are_collinear(self, points : PointSet, expected : bool) -> None:
         result = _are_collinear(points)
         assert result == expected
+
+    @pytest.mark.parametrize("offset, expected", [(0.0, True), (1.0, False)])
+    def test_are_collinear_large(self, offset : float, expected : bool) -> None:
+        points = PointSet([(float(i), 2.0 * i) for i in range(199)] + [(199.0, 398.0 + offset)])
+        assert _are_collinear(points) == expected
+
+    @pytest.mark.parametrize("engine", ["bowyer-watson", "divide-and-conquer", "sweep-hull"])
+    def test_triangulate_shifted_grid(self, engine : str) -> None:
+        # A grid far from the origin: every cell is cocircular and rounding errors are large
+        points = PointSet([(1e9 + 0.125 * i, 1e9 + 0.125 * j) for i in range(6) for j in range(6)])
+        result = triangulate(points, engine=engine)
+        all_points = list(points)
+        assert len(result) > 0
+        for triangle in result:
+            indices = tuple(triangle.indices)
+            for i, point in enumerate(all_points):
+                if i not in indices:
+                    assert not _in_circumcircle(point, indices, all_points)
+
+    def test_triangulate_batched_cavity(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        expected = triangulate(points)
+        monkeypatch.setattr("triangulator.triangulator.BATCH_MIN_SIZE", 1)
+        assert triangulate(points) == expected
         
+    @pytest.mark.parametrize("engine", ["bowyer-watson", "divide-and-conquer", "sweep-hull"])
+    def test_triangulate_mmap(self, engine : str, tmp_path) -> None:
+        path = tmp_path / "points.bin"
+        path.write_bytes(POINTS[IDS[0]])
+        expected = triangulate(PointSet.from_bytes(POINTS[IDS[0]]), engine=engine)
+        assert triangulate(PointSet.open_mmap(path), engine=engine) == expected
+
+    @pytest.mark.parametrize("engine", ["bowyer-watson", "divide-and-conquer", "sweep-hull"])
+    @pytest.mark.parametrize("points", [PointSet.from_bytes(POINTS[IDS[0]]), PointSet([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)])])
+    def test_triangulate_shares_points(self, points : PointSet, engine : str) -> None:
+        # The result is built without copying nor validating the points again
+        assert triangulate(points, engine=engine).points is points
+
     def test_get_and_compute(self, sample_triangles, monkeypatch : pytest.MonkeyPatch) -> None:
         
         def mock_triangulate(points : PointSet) -> Triangles:
@@ -62,4 +162,475 @@ class TestTriangulator:
 
         result = get_and_compute(IDS[0])
 
-        assert result == sample_triangles.to_bytes()
\ No newline at end of file
+        assert result == sample_triangles.to_bytes()
+
+    def test_get_and_stream(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        calls = []
+
+        def mock_triangulate(points : PointSet) -> Triangles:
+            calls.append(points)
+            return triangulate(points)
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: points)
+        monkeypatch.setattr("triangulator.triangulator.triangulate", mock_triangulate)
+
+        chunks, size = get_and_stream(IDS[0])
+        assert size is None
+        assert next(chunks) == points.to_bytes()[:4] # the point block comes before the computation
+        assert calls == []
+        assert points.to_bytes()[:4] + b"".join(chunks) == triangulate(points).to_bytes()
+        assert len(calls) == 1
+
+    @pytest.mark.parametrize("points", [
+        PointSet([(0, 0), (1, 0)]), # not enough points
+        PointSet([(0, 0), (1, 0), (2, 0)]), # collinear points
+    ])
+    def test_get_and_stream_invalid(self, points : PointSet, monkeypatch : pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: points)
+        with pytest.raises(ValueError):
+            get_and_stream(IDS[0])
+
+    def test_get_and_compute_cached(self, sample_triangles, monkeypatch : pytest.MonkeyPatch) -> None:
+        calls = []
+
+        def mock_get_point_set(point_set_id : str) -> PointSet:
+            calls.append(point_set_id)
+            return PointSet()
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", mock_get_point_set)
+        monkeypatch.setattr("triangulator.triangulator.triangulate", lambda points: sample_triangles)
+
+        assert get_and_compute(IDS[0]) == sample_triangles.to_bytes()
+        assert get_and_compute(IDS[0]) == sample_triangles.to_bytes()
+        assert calls == [IDS[0]]
+        assert (RESULT_CACHE.hits, RESULT_CACHE.misses) == (1, 1)
+
+    def test_get_and_stream_cached(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: points)
+        chunks, _ = get_and_stream(IDS[0])
+        expected = b"".join(chunks)
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", None) # not called anymore
+        chunks, size = get_and_stream(IDS[0])
+        assert size == len(expected)
+        assert b"".join(chunks) == expected
+        assert get_and_compute(IDS[0]) == expected
+
+    def test_get_and_compute_same_points(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        other = PointSet.from_bytes(POINTS[IDS[1]])
+        point_sets = {"a": points, "b": PointSet.from_bytes(POINTS[IDS[0]]), "c": other}
+        calls = []
+
+        def mock_triangulate(points : PointSet) -> Triangles:
+            calls.append(points)
+            return triangulate(points)
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: point_sets[point_set_id])
+        monkeypatch.setattr("triangulator.triangulator.triangulate", mock_triangulate)
+
+        assert get_and_compute("a") == get_and_compute("b") == triangulate(points).to_bytes()
+        assert b"".join(get_and_stream("b")[0]) == get_and_compute("a")
+        assert get_and_compute("c") == triangulate(other).to_bytes()
+        assert len(calls) == 2
+        assert len(RESULT_CACHE) == 2
+
+    def test_get_and_compute_evicted(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        calls = []
+
+        def mock_get_point_set(point_set_id : str) -> PointSet:
+            calls.append(point_set_id)
+            return points
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", mock_get_point_set)
+        expected = get_and_compute(IDS[0])
+        RESULT_CACHE.clear()
+        assert get_and_compute(IDS[0]) == expected
+        assert calls == [IDS[0], IDS[0]]
+        assert (RESULT_CACHE.hits, RESULT_CACHE.misses) == (0, 1)
+
+    def test_get_and_compute_stored(self, result_store : ResultStore, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: points)
+        expected = get_and_compute(IDS[0])
+        assert points.digest().hex() in result_store
+
+        # After a restart, the result is read from the store, without retrieving the points again
+        RESULT_CACHE.clear()
+        POINT_SET_DIGESTS.clear()
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", None)
+        assert get_and_compute(IDS[0]) == expected
+        assert points.digest().hex() in RESULT_CACHE
+
+    def test_get_and_compute_invalid_not_stored(self, result_store : ResultStore, tmp_path, monkeypatch : pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: PointSet([(0.0, 0.0), (1.0, 1.0), (2.0, 2.0)]))
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                get_and_compute(IDS[0])
+        # No digest is written for a point set whose result is never stored
+        assert not list((tmp_path / "ids").iterdir())
+
+    def test_get_and_stream_stored(self, result_store : ResultStore, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: points)
+        chunks, _ = get_and_stream(IDS[0])
+        expected = b"".join(chunks)
+        assert points.digest().hex() in result_store
+
+        RESULT_CACHE.clear()
+        POINT_SET_DIGESTS.clear()
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", None)
+        file, size = get_and_stream(IDS[0])
+        with file:
+            assert size == len(expected)
+            assert file.read() == expected
+
+    def test_get_and_stream_interrupted(self, result_store : ResultStore, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: points)
+        chunks, _ = get_and_stream(IDS[0])
+        next(chunks)
+        chunks.close() # the client went away
+        assert points.digest().hex() not in result_store
+        assert result_store.size == 0
+
+    def test_get_and_compute_keep_alive(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        with StandInPSM(POINTS) as server:
+            monkeypatch.setenv("POINTSET_API_URL", server.url)
+            monkeypatch.setattr(PSM, "CONNECTIONS", ConnectionPool())
+            for point_set_id in IDS[:3]:
+                assert get_and_compute(point_set_id) == triangulate(PointSet.from_bytes(POINTS[point_set_id])).to_bytes()
+            assert server.connections == 1
+
+    def run_herd(self, target, count : int, monkeypatch : pytest.MonkeyPatch, points : PointSet | Exception) -> tuple[list, list, list]:
+        release = threading.Event()
+        fetches, triangulations = [], []
+
+        def mock_get_point_set(point_set_id : str) -> PointSet:
+            fetches.append(point_set_id)
+            release.wait()
+            if isinstance(points, Exception):
+                raise points
+            return points
+
+        def mock_triangulate(points : PointSet) -> Triangles:
+            triangulations.append(points)
+            return triangulate(points)
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", mock_get_point_set)
+        monkeypatch.setattr("triangulator.triangulator.triangulate", mock_triangulate)
+        shared = FETCHES.shared
+        outcomes = [None] * count
+
+        def worker(i : int) -> None:
+            try:
+                outcomes[i] = target(IDS[0])
+            except Exception as e:
+                outcomes[i] = e
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while FETCHES.shared < shared + count - 1:
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        return outcomes, fetches, triangulations
+
+    def test_get_and_compute_concurrent(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        outcomes, fetches, triangulations = self.run_herd(get_and_compute, 8, monkeypatch, points)
+        assert outcomes == [triangulate(points).to_bytes()] * 8
+        assert fetches == [IDS[0]]
+        assert len(triangulations) == 1
+
+    def test_get_and_stream_concurrent(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        outcomes, fetches, triangulations = self.run_herd(lambda point_set_id: b"".join(get_and_stream(point_set_id)[0]), 8, monkeypatch, points)
+        assert outcomes == [triangulate(points).to_bytes()] * 8
+        assert fetches == [IDS[0]]
+        assert len(triangulations) == 1
+
+    def test_get_and_compute_and_stream_concurrent(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        started, release = threading.Event(), threading.Event()
+        triangulations = []
+
+        def mock_triangulate(points : PointSet) -> Triangles:
+            triangulations.append(points)
+            started.set()
+            release.wait()
+            return triangulate(points)
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: points)
+        monkeypatch.setattr("triangulator.triangulator.triangulate", mock_triangulate)
+        shared = TRIANGULATIONS.shared
+        computed, streamed = [], []
+        computing = threading.Thread(target=lambda: computed.append(get_and_compute(IDS[0])))
+        computing.start()
+        started.wait()
+        # The same points, with no ID, join the triangulation of get_and_compute
+        chunks, _ = compute_and_stream(PointSet.from_bytes(POINTS[IDS[0]]))
+        streaming = threading.Thread(target=lambda: streamed.append(b"".join(chunks)))
+        streaming.start()
+        deadline = time.monotonic() + 5
+        while TRIANGULATIONS.shared == shared:
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.001)
+        release.set()
+        computing.join()
+        streaming.join()
+        assert computed == streamed == [triangulate(points).to_bytes()]
+        assert len(triangulations) == 1
+
+    @pytest.mark.parametrize("error", [KeyError("Point set ID not found"), ValueError("Malformed point set ID"), ConnectionError("Service not available"), RuntimeError("Database is currently unavailable")])
+    def test_get_and_compute_concurrent_error(self, monkeypatch : pytest.MonkeyPatch, error : Exception) -> None:
+        outcomes, fetches, _ = self.run_herd(get_and_compute, 4, monkeypatch, error)
+        assert all(type(outcome) is type(error) for outcome in outcomes)
+        assert fetches == [IDS[0]]
+        # Errors are not cached: the next request retrieves the point set again
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: points)
+        assert get_and_compute(IDS[0]) == triangulate(points).to_bytes()
+
+    def test_get_and_stream_async(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        calls = []
+
+        async def mock_get_point_set_async(point_set_id : str) -> PointSet:
+            calls.append(point_set_id)
+            await asyncio.sleep(0.01)
+            return points
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set_async", mock_get_point_set_async)
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", None) # not called
+
+        async def scenario():
+            return await asyncio.gather(*(get_and_stream_async(IDS[0]) for _ in range(4)))
+
+        expected = triangulate(points).to_bytes()
+        for chunks, size in asyncio.run(scenario()):
+            assert size is None
+            assert b"".join(chunks) == expected
+        assert calls == [IDS[0]]
+
+        chunks, size = asyncio.run(get_and_stream_async(IDS[0]))
+        assert size == len(expected)
+        assert b"".join(chunks) == expected
+        assert calls == [IDS[0]]
+        assert b"".join(get_and_stream(IDS[0])[0]) == expected
+
+    def test_get_and_compute_batch_async(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        point_sets = {point_set_id: PointSet.from_bytes(POINTS[point_set_id]) for point_set_id in IDS[:2]}
+        calls = []
+
+        async def mock_get_point_set_async(point_set_id : str) -> PointSet:
+            calls.append(point_set_id)
+            await asyncio.sleep(0.05 if point_set_id == IDS[0] else 0.01)
+            if point_set_id not in point_sets:
+                raise KeyError("Point set ID not found")
+            return point_sets[point_set_id]
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set_async", mock_get_point_set_async)
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", None) # not called
+
+        async def scenario():
+            # A single request for the same point set shares the retrieval of the batch
+            single = asyncio.ensure_future(get_and_compute_async(IDS[0]))
+            results = [result async for result in get_and_compute_batch_async([IDS[0], IDS[1], "unknown", IDS[0]])]
+            return results, await single
+
+        results, single = asyncio.run(scenario())
+        expected = {point_set_id: triangulate(points).to_bytes() for point_set_id, points in point_sets.items()}
+        assert single == expected[IDS[0]]
+        assert sorted(index for index, _ in results) == [0, 1, 2, 3]
+        assert results[-1][0] in (0, 3) # in completion order
+        outcomes = dict(results)
+        assert outcomes[0] == outcomes[3] == expected[IDS[0]]
+        assert outcomes[1] == expected[IDS[1]]
+        assert isinstance(outcomes[2], KeyError)
+        assert sorted(calls) == sorted([IDS[0], IDS[1], "unknown"])
+
+    def test_get_and_compute_batch_async_closed(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        calls = []
+
+        async def mock_get_point_set_async(point_set_id : str) -> PointSet:
+            calls.append(point_set_id)
+            await asyncio.sleep(0.05)
+            return points
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set_async", mock_get_point_set_async)
+
+        async def scenario():
+            results = get_and_compute_batch_async([f"{IDS[0]}-{i}" for i in range(10)], concurrency=1)
+            first = await anext(results)
+            await results.aclose()
+            await asyncio.sleep(0.1)
+            return first
+
+        assert asyncio.run(scenario())[0] == 0
+        assert len(calls) < 10
+
+    def test_compute_and_stream(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        expected = triangulate(points).to_bytes()
+        chunks, size = compute_and_stream(points)
+        assert size is None
+        assert b"".join(chunks) == expected
+        # The result is shared with the point sets retrieved by ID with the same points
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: PointSet.from_bytes(POINTS[IDS[0]]))
+        monkeypatch.setattr("triangulator.triangulator.triangulate", None) # not called
+        assert get_and_compute(IDS[0]) == expected
+        chunks, size = compute_and_stream(points)
+        assert size == len(expected)
+        assert b"".join(chunks) == expected
+
+    def test_compute_and_stream_invalid(self) -> None:
+        with pytest.raises(ValueError):
+            compute_and_stream(PointSet([(0.0, 0.0), (1.0, 1.0), (2.0, 2.0)]))
+
+    def test_get_and_compute_batch(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        point_sets = {point_set_id: PointSet.from_bytes(POINTS[point_set_id]) for point_set_id in IDS[:3]}
+
+        def mock_get_point_set(point_set_id : str) -> PointSet:
+            if point_set_id == IDS[0]:
+                time.sleep(0.2)
+            if point_set_id not in point_sets:
+                raise KeyError("Point set ID not found")
+            return point_sets[point_set_id]
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", mock_get_point_set)
+        point_set_ids = [IDS[0], IDS[1], "unknown", IDS[2], IDS[1]]
+        results = list(get_and_compute_batch(point_set_ids))
+        assert sorted(index for index, _ in results) == list(range(len(point_set_ids)))
+        assert results[-1][0] == 0 # in completion order
+        for index, result in results:
+            if point_set_ids[index] == "unknown":
+                assert isinstance(result, KeyError)
+            else:
+                assert result == triangulate(point_sets[point_set_ids[index]]).to_bytes()
+
+    def test_get_and_compute_batch_concurrent(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        barrier = threading.Barrier(4, timeout=5)
+
+        def mock_get_point_set(point_set_id : str) -> PointSet:
+            barrier.wait() # only passes when 4 point sets are retrieved at once
+            return points
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", mock_get_point_set)
+        results = dict(get_and_compute_batch([f"{IDS[0]}-{i}" for i in range(8)], concurrency=4))
+        assert results == dict.fromkeys(range(8), triangulate(points).to_bytes())
+
+    def test_get_and_compute_batch_workers(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        pool = WorkerPool(2, 4)
+        monkeypatch.setattr(triangulator, "WORKERS", pool)
+        point_sets = [PointSet([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0 + i)]) for i in range(12)]
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: point_sets[int(point_set_id)])
+        try:
+            # More point sets than the pool takes jobs: they wait for their turn instead of failing
+            results = dict(get_and_compute_batch([str(i) for i in range(12)], concurrency=12))
+        finally:
+            pool.shutdown()
+        assert results == {i: triangulate(points).to_bytes() for i, points in enumerate(point_sets)}
+        assert pool.rejected == 0
+
+    def test_get_and_compute_batch_closed(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        fetches = []
+
+        def mock_get_point_set(point_set_id : str) -> PointSet:
+            fetches.append(point_set_id)
+            time.sleep(0.05)
+            return points
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", mock_get_point_set)
+        results = get_and_compute_batch([f"{IDS[0]}-{i}" for i in range(10)], concurrency=1)
+        assert next(results)[0] == 0
+        results.close()
+        time.sleep(0.1)
+        assert len(fetches) < 10
+
+    def test_get_and_compute_batch_empty(self) -> None:
+        assert list(get_and_compute_batch([])) == []
+
+    def test_get_and_compute_workers(self, worker_pool : WorkerPool, monkeypatch : pytest.MonkeyPatch) -> None:
+        point_sets = {point_set_id: PointSet.from_bytes(POINTS[point_set_id]) for point_set_id in IDS[:3]}
+        expected = {point_set_id: triangulate(points).to_bytes() for point_set_id, points in point_sets.items()}
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", point_sets.__getitem__)
+        monkeypatch.setattr("triangulator.triangulator.triangulate", None) # not called in this process
+        for point_set_id in point_sets:
+            assert get_and_compute(point_set_id) == expected[point_set_id]
+
+    def test_get_and_stream_workers(self, worker_pool : WorkerPool, monkeypatch : pytest.MonkeyPatch) -> None:
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        expected = triangulate(points).to_bytes()
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: points)
+        monkeypatch.setattr("triangulator.triangulator.triangulate", None)
+        chunks, size = get_and_stream(IDS[0])
+        assert size is None
+        assert b"".join(chunks) == expected
+        chunks, size = get_and_stream(IDS[0])
+        assert size == len(expected)
+
+    def test_get_and_stream_workers_full(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        pool = WorkerPool(1, 0)
+        monkeypatch.setattr(triangulator, "WORKERS", pool)
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: PointSet.from_bytes(POINTS[point_set_id]))
+        try:
+            job = pool.submit(time.sleep, 0.5)
+            # The request is rejected before its response starts
+            with pytest.raises(PoolFullError):
+                get_and_stream(IDS[0])
+            job.result(timeout=30)
+            assert b"".join(get_and_stream(IDS[0])[0]) == triangulate(PointSet.from_bytes(POINTS[IDS[0]])).to_bytes()
+        finally:
+            pool.shutdown()
+
+    def test_get_and_compute_and_stream_workers(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        pool = WorkerPool(1, 0)
+        monkeypatch.setattr(triangulator, "WORKERS", pool)
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: PointSet.from_bytes(POINTS[point_set_id]))
+        try:
+            chunks, _ = get_and_stream(IDS[0])
+            # The job of the stream is joined instead of filling the pool again
+            assert get_and_compute(IDS[0]) == b"".join(chunks) == triangulate(PointSet.from_bytes(POINTS[IDS[0]])).to_bytes()
+            assert pool.rejected == 0
+        finally:
+            pool.shutdown()
+
+    def test_get_and_compute_workers_serialized_once(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        pool = WorkerPool(1, 0)
+        monkeypatch.setattr(triangulator, "WORKERS", pool)
+        points = PointSet.from_bytes(POINTS[IDS[0]])
+        expected = triangulate(points).to_bytes()
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set", lambda point_set_id: points)
+        serialized = []
+        to_bytes = PointSet.to_bytes
+
+        def mock_to_bytes(self : PointSet) -> bytes:
+            serialized.append(self)
+            return to_bytes(self)
+
+        monkeypatch.setattr(PointSet, "to_bytes", mock_to_bytes)
+        try:
+            assert get_and_compute(IDS[0]) == expected
+        finally:
+            pool.shutdown()
+        # The payload of the job is reused for the response and the cache
+        assert len(serialized) == 1
+
+    def test_get_and_stream_async_invalid(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        async def mock_get_point_set_async(point_set_id : str) -> PointSet:
+            return PointSet([(0.0, 0.0), (1.0, 1.0), (2.0, 2.0)])
+
+        monkeypatch.setattr("triangulator.triangulator.PointSetManager.get_point_set_async", mock_get_point_set_async)
+        with pytest.raises(ValueError):
+            asyncio.run(get_and_stream_async(IDS[0]))
@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+
+import pytest
+
+from triangulator import workers
+from triangulator.workers import PoolFullError, WorkerPool
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(1, 0, retry_after=3)
+    yield pool
+    pool.shutdown()
+
+
+class TestWorkerPool:
+    def test_submit(self, pool : WorkerPool) -> None:
+        assert pool.submit(pow, 2, 10).result(timeout=30) == 1024
+
+    def test_error(self, pool : WorkerPool) -> None:
+        with pytest.raises(ValueError):
+            pool.submit(int, "x").result(timeout=30)
+        assert pool.submit(int, "1").result(timeout=30) == 1
+
+    def test_full(self, pool : WorkerPool) -> None:
+        job = pool.submit(time.sleep, 0.5)
+        with pytest.raises(PoolFullError) as error:
+            pool.submit(pow, 2, 10)
+        assert error.value.retry_after == 3
+        assert "3 seconds" in str(error.value)
+        assert pool.rejected == 1
+        job.result(timeout=30)
+        assert pool.submit(pow, 2, 10).result(timeout=30) == 1024
+
+    def test_pending(self) -> None:
+        pool = WorkerPool(1, 1)
+        try:
+            jobs = [pool.submit(time.sleep, 0.2) for _ in range(2)]
+            with pytest.raises(PoolFullError):
+                pool.submit(time.sleep, 0.2)
+            for job in jobs:
+                job.result(timeout=30)
+        finally:
+            pool.shutdown()
+        assert pool.rejected == 1
+
+    def test_recycled(self) -> None:
+        pool = WorkerPool(1, 0, max_jobs_per_worker=1)
+        try:
+            first = pool.submit(os.getpid).result(timeout=30)
+            second = pool.submit(os.getpid).result(timeout=30)
+        finally:
+            pool.shutdown()
+        assert first != second != os.getpid()
+
+    @pytest.mark.parametrize("arguments", [(0, 1, 1, 1), (1, -1, 1, 1), (1, 1, 0, 1), (1, 1, 1, 0)])
+    def test_invalid(self, arguments : tuple[int, int, int, int]) -> None:
+        with pytest.raises(ValueError):
+            WorkerPool(*arguments)
+
+    def test_from_environment(self, monkeypatch : pytest.MonkeyPatch) -> None:
+        for name in ("TRIANGULATION_WORKERS", "TRIANGULATION_MAX_PENDING", "TRIANGULATION_JOBS_PER_WORKER", "TRIANGULATION_RETRY_AFTER"):
+            monkeypatch.delenv(name, raising=False)
+        assert WorkerPool.from_environment() is None
+        monkeypatch.setenv("TRIANGULATION_WORKERS", "0")
+        assert WorkerPool.from_environment() is None
+
+        monkeypatch.setenv("TRIANGULATION_WORKERS", "2")
+        pool = WorkerPool.from_environment()
+        assert (pool.workers, pool.max_pending, pool.max_jobs_per_worker, pool.retry_after) == \
+            (2, 2 * workers.DEFAULT_MAX_PENDING_PER_WORKER, workers.DEFAULT_JOBS_PER_WORKER, workers.DEFAULT_RETRY_AFTER)
+        pool.shutdown()
+
+        monkeypatch.setenv("TRIANGULATION_MAX_PENDING", "0")
+        monkeypatch.setenv("TRIANGULATION_RETRY_AFTER", "5")
+        pool = WorkerPool.from_environment()
+        assert (pool.max_pending, pool.retry_after) == (0, 5)
+        pool.shutdown()
+
+    def test_resubmit(self, pool : WorkerPool) -> None:
+        # The slot of a job is free as soon as its result is
+        for i in range(20):
+            assert pool.submit(pow, 2, i).result(timeout=30) == 2 ** i
+        assert pool.rejected == 0
+
+    def test_rejected_concurrent(self, pool : WorkerPool) -> None:
+        job = pool.submit(time.sleep, 0.5)
+
+        def submit() -> None:
+            for _ in range(200):
+                with pytest.raises(PoolFullError):
+                    pool.submit(pow, 2, 10)
+
+        threads = [threading.Thread(target=submit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert pool.rejected == 1600
+        job.result(timeout=30)
@@ -2,13 +2,18 @@
 
 import os
 import re
-import urllib.request as req
-from urllib.error import URLError
+from http.client import HTTPException
 
+from .connections import AsyncConnectionPool, ConnectionPool
 from .pointset import PointSet
 
 RE_UUID = re.compile(r"^[0-9a-fA-F-]{36}$")
 
+# Keep-alive connections to the PointSet API, shared by the threads of the server
+CONNECTIONS = ConnectionPool.from_environment()
+# The same for the tasks of the event loop of the asyncio server
+ASYNC_CONNECTIONS = AsyncConnectionPool.from_environment()
+
 class PointSetManager:
     """Manager for PointSet objects, allowing storage and retrieval by ID."""
 
@@ -16,6 +21,29 @@ class PointSetManager:
     def get_point_set(point_set_id: str) -> PointSet:
         """Retrieve a PointSet by its ID.
 
+        The PointSet is fetched on a pooled keep-alive connection, see CONNECTIONS.
+
+        Args:
+            point_set_id (str): The ID of the PointSet to retrieve.
+
+        Returns:
+            PointSet: The PointSet associated with the given ID.
+
+        """
+        url = _url(point_set_id)
+        try:
+            with CONNECTIONS.urlopen(url) as response:
+                status, body = response.status, response.read()
+        except (OSError, HTTPException) as e:
+            raise ConnectionError(f"Failed to connect to the PointSet API: {e}") from e
+        return _point_set(point_set_id, status, body)
+
+    @staticmethod
+    async def get_point_set_async(point_set_id: str) -> PointSet:
+        """Retrieve a PointSet by its ID without blocking the event loop.
+
+        The PointSet is fetched on a pooled keep-alive connection of ASYNC_CONNECTIONS, with the same errors as `get_point_set`.
+
         Args:
             point_set_id (str): The ID of the PointSet to retrieve.
 
@@ -23,26 +51,45 @@ class PointSetManager:
             PointSet: The PointSet associated with the given ID.
 
         """
-        if not RE_UUID.match(point_set_id):
-            raise ValueError(f"Malformed point set ID: {point_set_id}")
-        
-        api_base_url = os.getenv("POINTSET_API_URL")
-        if api_base_url is None:
-            raise RuntimeError("POINTSET_API_URL environment variable is not set.")
-        
-        url = f"{api_base_url.rstrip('/')}/pointset/{point_set_id}"
+        url = _url(point_set_id)
         try:
-            with req.urlopen(url) as response:
-                if response.status//100 == 5:
-                    message = response.read().decode('utf-8')
-                    raise RuntimeError(f"Database is currently unavailable: {message}")
-                if response.status//100 == 4:
-                    message = response.read().decode('utf-8')
-                    raise KeyError(f"The requested resource '{point_set_id}' could not be found")
-                if response.status != 200:
-                    message = response.read().decode('utf-8')
-                    raise RuntimeError(f"Failed to retrieve PointSet: {message}")
-                data = response.read()
-                return PointSet.from_bytes(data)
-        except URLError as e:
-            raise ConnectionError(f"Failed to connect to the PointSet API: {e.reason}") from e
\ No newline at end of file
+            status, body = await ASYNC_CONNECTIONS.get(url)
+        except (OSError, HTTPException) as e:
+            raise ConnectionError(f"Failed to connect to the PointSet API: {e}") from e
+        return _point_set(point_set_id, status, body)
+
+
+def _url(point_set_id: str) -> str:
+    """Build the URL of a PointSet in the PointSet API.
+
+    Raises:
+        ValueError: If the ID is malformed.
+        RuntimeError: If POINTSET_API_URL is not set.
+
+    """
+    if not RE_UUID.match(point_set_id):
+        raise ValueError(f"Malformed point set ID: {point_set_id}")
+
+    api_base_url = os.getenv("POINTSET_API_URL")
+    if api_base_url is None:
+        raise RuntimeError("POINTSET_API_URL environment variable is not set.")
+
+    return f"{api_base_url.rstrip('/')}/pointset/{point_set_id}"
+
+
+def _point_set(point_set_id: str, status: int, body: bytes) -> PointSet:
+    """Decode a response of the PointSet API.
+
+    Raises:
+        KeyError: If the point set was not found.
+        RuntimeError: If the PointSet API failed.
+        ValueError: If the body is not a valid PointSet.
+
+    """
+    if status//100 == 5:
+        raise RuntimeError(f"Database is currently unavailable: {body.decode('utf-8', 'replace')}")
+    if status//100 == 4:
+        raise KeyError(f"The requested resource '{point_set_id}' could not be found")
+    if status != 200:
+        raise RuntimeError(f"Failed to retrieve PointSet: {body.decode('utf-8', 'replace')}")
+    return PointSet.from_bytes(body)
@@ -0,0 +1,405 @@
+"""Asyncio HTTP server module for the triangulator application."""
+
+import asyncio
+import io
+import json
+import re
+from collections.abc import AsyncIterator, Iterator
+from contextlib import suppress
+from struct import calcsize
+from typing import BinaryIO
+from urllib.parse import unquote
+
+from .http_server import MAX_BODY_BYTES, BodyTooLargeError, _batch_ids, _batch_record, _error, _point_set_header
+from .pointset import PointSet
+from .triangulator import compute_and_stream, get_and_compute_batch_async, get_and_stream_async
+
+# Seconds an idle keep-alive connection is kept open, waiting for its next request
+KEEP_ALIVE_TIMEOUT = 5.0
+# Largest number of header fields, and of bytes in them, accepted in a request or in the trailer of a chunked body
+MAX_HEADER_FIELDS = 100
+MAX_HEADER_BYTES = 64 * 1024
+
+RE_ROUTE = re.compile(r"^/triangulation/([^/]+)$")
+BATCH_ROUTE = "/triangulation/batch"
+UPLOAD_ROUTE = "/triangulation"
+
+
+class HeadersTooLargeError(ValueError):
+    """Raised when the header fields of a request exceed MAX_HEADER_FIELDS or MAX_HEADER_BYTES."""
+
+
+class AsyncHTTPServer:
+    """HTTP server for the triangulator application, on asyncio streams.
+
+    It serves the same ``/triangulation/{pointSetId}``, ``/triangulation/batch`` and ``/triangulation`` routes as `HTTPServer`, with the same responses, on HTTP/1.1
+    keep-alive connections. Requests waiting for the PointSet API hold no thread, see `get_and_stream_async`,
+    and the triangulation runs in the default executor of the event loop. Responses whose size is not known
+    beforehand are sent with chunked transfer encoding, and stored results with ``sendfile`` where available.
+
+    Args:
+        keep_alive_timeout (float, optional): The number of seconds an idle connection is kept open. Defaults to KEEP_ALIVE_TIMEOUT.
+        max_body_bytes (int, optional): The largest body accepted, like a PointSet in a POST to /triangulation,
+            in bytes. Defaults to MAX_BODY_BYTES.
+
+    """
+
+    def __init__(self, keep_alive_timeout: float = KEEP_ALIVE_TIMEOUT, max_body_bytes: int = MAX_BODY_BYTES) -> None:
+        """Initialize the HTTP server."""
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_body_bytes = max_body_bytes
+
+    async def start(self, host: str = "127.0.0.1", port: int = 5000) -> asyncio.Server:
+        """Start serving in the running event loop.
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on, 0 for any free one. Defaults to 5000.
+
+        Returns:
+            asyncio.Server: The listening server.
+
+        """
+        return await asyncio.start_server(self.handle, host, port)
+
+    def run(self, host: str = "127.0.0.1", port: int = 5000) -> None:
+        """Serve in a new event loop until interrupted, like `flask.Flask.run`.
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on. Defaults to 5000.
+
+        """
+        async def serve() -> None:
+            async with await self.start(host, port) as server:
+                await server.serve_forever()
+
+        asyncio.run(serve())
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of a connection, until the client or the server closes it."""
+        try:
+            while await self.__respond(reader, writer):
+                pass
+        except (OSError, EOFError, TimeoutError, ValueError):
+            # The client went away, stayed idle, or sent a request that cannot be parsed
+            pass
+        finally:
+            writer.close()
+            with suppress(OSError):
+                await writer.wait_closed()
+
+    async def __respond(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Read a request and send its response.
+
+        Returns:
+            bool: True if the connection can be kept open for another request, False otherwise.
+
+        """
+        line = await asyncio.wait_for(reader.readline(), self.keep_alive_timeout)
+        if not line:
+            return False
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            await self.__send_json(writer, 400, {"code": "BAD REQUEST", "message": "Malformed request line."}, False)
+            return False
+        method, target, version = parts
+        try:
+            headers = await _read_headers(reader)
+        except HeadersTooLargeError as e:
+            # The rest of the header fields is left unread
+            await self.__send_json(writer, 431, {"code": "REQUEST HEADER FIELDS TOO LARGE", "message": str(e)}, False)
+            return False
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+        path = target.partition("?")[0]
+        if path == UPLOAD_ROUTE:
+            if method != "POST":
+                await self.__send_json(writer, 405, {"code": "METHOD NOT ALLOWED", "message": f"The method {method} is not allowed."}, keep_alive, {"Allow": "POST"})
+                return keep_alive
+            if "transfer-encoding" in headers:
+                # The size of the PointSet is only known once its chunks are all read
+                body = await self.__read_body(reader, writer, headers)
+                if body is None:
+                    return False
+                reader, headers = _body_reader(body), {**headers, "content-length": str(len(body))}
+            # The body is read by the route, once its header is checked
+            return await self.__upload(reader, writer, headers, version, keep_alive)
+        body = await self.__read_body(reader, writer, headers)
+        if body is None:
+            return False
+        if path == BATCH_ROUTE and method == "POST":
+            return await self.__batch(writer, body, version, keep_alive)
+        match = RE_ROUTE.match(path)
+        if match is None:
+            await self.__send_json(writer, 404, {"code": "NOT FOUND", "message": "The requested URL was not found on the server."}, keep_alive)
+            return keep_alive
+        if method != "GET":
+            await self.__send_json(writer, 405, {"code": "METHOD NOT ALLOWED", "message": f"The method {method} is not allowed."}, keep_alive, {"Allow": "GET"})
+            return keep_alive
+        return await self.__triangulation(writer, unquote(match[1]), version, keep_alive)
+
+    async def __read_body(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, headers: dict[str, str]) -> bytes | None:
+        """Read the body of a request, sent with a Content-Length or in chunks, up to max_body_bytes.
+
+        A body that is too large or malformed is answered with its error and left unread, so the connection
+        must be closed after it.
+
+        Returns:
+            bytes | None: The body, or None if it was rejected.
+
+        """
+        try:
+            if _chunked(headers):
+                return await _read_chunked(reader, self.max_body_bytes)
+            if "transfer-encoding" in headers:
+                raise ValueError("Invalid request: the only transfer coding accepted is chunked.")
+            content_length = int(headers.get("content-length", "0"))
+            if content_length < 0:
+                raise ValueError("Invalid request: negative Content-Length.")
+            if content_length > self.max_body_bytes:
+                raise BodyTooLargeError(self.max_body_bytes)
+            return await reader.readexactly(content_length)
+        except (BodyTooLargeError, ValueError) as e:
+            status, error, extra_headers = _error(e)
+            await self.__send_json(writer, status, error, False, extra_headers)
+            return None
+
+    async def __triangulation(self, writer: asyncio.StreamWriter, point_set_id: str, version: str, keep_alive: bool) -> bool:
+        """Send the triangulation of a point set, or the error preventing it.
+
+        Returns:
+            bool: True if the connection can be kept open for another request, False otherwise.
+
+        """
+        try:
+            # Errors of the PointSet retrieval are raised here, before the response starts
+            body, size = await get_and_stream_async(point_set_id)
+        except Exception as e:
+            status, error, headers = _error(e)
+            await self.__send_json(writer, status, error, keep_alive, headers)
+            return keep_alive
+        return await self.__send_result(writer, body, size, version, keep_alive)
+
+    async def __upload(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, headers: dict[str, str], version: str, keep_alive: bool) -> bool:
+        """Send the triangulation of a PointSet sent in the body of the request, or the error preventing it.
+
+        The size announced by the header of the PointSet is checked before its points are read. The body is
+        left unread when it is rejected, so the connection is closed after the error.
+
+        Returns:
+            bool: True if the connection can be kept open for another request, False otherwise.
+
+        """
+        try:
+            content_length = int(headers["content-length"]) if "content-length" in headers else None
+            if content_length is not None and content_length > self.max_body_bytes:
+                # Before reading anything, as the client may wait for the response before sending the body
+                raise BodyTooLargeError(self.max_body_bytes)
+            header_size = calcsize('!L') if content_length is None else min(calcsize('!L'), content_length)
+            nb_points = _point_set_header(await reader.readexactly(header_size), content_length, self.max_body_bytes)
+            data = await reader.readexactly(nb_points * calcsize('!ff'))
+            loop = asyncio.get_running_loop()
+            point_set = await loop.run_in_executor(None, PointSet.from_bytes_with_size, data, nb_points)
+            body, size = await loop.run_in_executor(None, compute_and_stream, point_set)
+        except (OSError, EOFError):
+            raise
+        except Exception as e:
+            status, error, headers = _error(e)
+            await self.__send_json(writer, status, error, False, headers)
+            return False
+        return await self.__send_result(writer, body, size, version, keep_alive)
+
+    async def __send_result(self, writer: asyncio.StreamWriter, body: Iterator[bytes] | BinaryIO, size: int | None, version: str, keep_alive: bool) -> bool:
+        """Send a triangulation, from what `get_and_stream` returns.
+
+        Returns:
+            bool: True if the connection can be kept open for another request, False otherwise.
+
+        """
+        if isinstance(body, io.IOBase):
+            with body:
+                _write_head(writer, 200, {"Content-Type": "application/octet-stream", "Content-Length": str(size)}, keep_alive)
+                await writer.drain()
+                await asyncio.get_running_loop().sendfile(writer.transport, body)
+            return keep_alive
+        return await self.__stream(writer, body, size, version, keep_alive)
+
+    async def __batch(self, writer: asyncio.StreamWriter, body: bytes, version: str, keep_alive: bool) -> bool:
+        """Send the records of the triangulations of a batch request, as they complete, or the error of its body.
+
+        The point sets are retrieved and triangulated by the tasks of `get_and_compute_batch_async`.
+
+        Returns:
+            bool: True if the connection can be kept open for another request, False otherwise.
+
+        """
+        try:
+            point_set_ids = _batch_ids(body)
+        except ValueError as e:
+            status, error, headers = _error(e)
+            await self.__send_json(writer, status, error, keep_alive, headers)
+            return keep_alive
+        return await self.__stream(writer, _batch_records(get_and_compute_batch_async(point_set_ids)), None, version, keep_alive)
+
+    async def __stream(self, writer: asyncio.StreamWriter, body: Iterator[bytes] | AsyncIterator[bytes], size: int | None, version: str, keep_alive: bool) -> bool:
+        """Send a successful response whose body is produced in chunks.
+
+        Returns:
+            bool: True if the connection can be kept open for another request, False otherwise.
+
+        """
+        headers = {"Content-Type": "application/octet-stream"}
+        chunked = size is None and version != "HTTP/1.0"
+        if size is not None:
+            headers["Content-Length"] = str(size)
+        elif chunked:
+            headers["Transfer-Encoding"] = "chunked"
+        else:
+            # An HTTP/1.0 body of unknown size ends with the connection
+            keep_alive = False
+        _write_head(writer, 200, headers, keep_alive)
+        try:
+            await _write_chunks(writer, body, chunked)
+        except OSError:
+            # The client went away, which ends the connection in `handle`
+            raise
+        except Exception:
+            # The triangulation failed after the response started: cut it short, so the client sees it incomplete
+            return False
+        return keep_alive
+
+    async def __send_json(self, writer: asyncio.StreamWriter, status: int, error: dict[str, str], keep_alive: bool,
+                          headers: dict[str, str] | None = None) -> None:
+        """Send an Error object of the API."""
+        body = json.dumps(error).encode()
+        _write_head(writer, status, {"Content-Type": "application/json", "Content-Length": str(len(body)), **(headers or {})}, keep_alive)
+        writer.write(body)
+        await writer.drain()
+
+
+def _chunked(headers: dict[str, str]) -> bool:
+    """Tell whether the body of a request is sent with chunked transfer encoding, which takes precedence over its Content-Length."""
+    return headers.get("transfer-encoding", "").lower().rpartition(",")[2].strip() == "chunked"
+
+
+async def _read_chunked(reader: asyncio.StreamReader, max_body_bytes: int) -> bytes:
+    """Read a body sent with chunked transfer encoding, and the trailer fields following it.
+
+    Args:
+        reader (asyncio.StreamReader): The stream of the request, after its header fields.
+        max_body_bytes (int): The largest body accepted, in bytes.
+
+    Raises:
+        BodyTooLargeError: If the chunks add up to more than max_body_bytes, checked before each chunk is read.
+        ValueError: If the size of a chunk is malformed, or a chunk does not end its line.
+
+    Returns:
+        bytes: The body.
+
+    """
+    body = bytearray()
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise EOFError("The connection was closed in the middle of a request.")
+        # Chunk extensions, after a semicolon, are ignored
+        size = int(line.partition(b";")[0].strip(), 16)
+        if size < 0:
+            raise ValueError("Invalid request: negative chunk size.")
+        if size == 0:
+            break
+        if len(body) + size > max_body_bytes:
+            raise BodyTooLargeError(max_body_bytes)
+        body += await reader.readexactly(size)
+        if await reader.readline() not in (b"\r\n", b"\n"):
+            raise ValueError("Invalid request: a chunk is longer than its size.")
+    await _read_headers(reader)
+    return bytes(body)
+
+
+def _body_reader(body: bytes) -> asyncio.StreamReader:
+    """Return a stream holding a body already read, to be read like the stream of the request."""
+    reader = asyncio.StreamReader()
+    reader.feed_data(body)
+    reader.feed_eof()
+    return reader
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+    """Read the header fields of a request, up to the empty line ending them.
+
+    Raises:
+        HeadersTooLargeError: If there are more than MAX_HEADER_FIELDS fields, or more than MAX_HEADER_BYTES bytes in them.
+
+    Returns:
+        dict[str, str]: The values of the fields, by lowercase name.
+
+    """
+    headers = {}
+    fields = size = 0
+    while (line := await reader.readline()) not in (b"\r\n", b"\n"):
+        if not line:
+            raise EOFError("The connection was closed in the middle of a request.")
+        fields += 1
+        size += len(line)
+        if fields > MAX_HEADER_FIELDS or size > MAX_HEADER_BYTES:
+            raise HeadersTooLargeError(f"The header fields of the request must not exceed {MAX_HEADER_FIELDS} fields and {MAX_HEADER_BYTES} bytes.")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def _write_head(writer: asyncio.StreamWriter, status: int, headers: dict[str, str], keep_alive: bool) -> None:
+    """Write the status line and the header fields of a response."""
+    lines = [f"HTTP/1.1 {status} {_REASONS[status]}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+
+async def _write_chunks(writer: asyncio.StreamWriter, chunks: Iterator[bytes] | AsyncIterator[bytes], chunked: bool) -> None:
+    """Write a body while it is produced, getting each chunk of a synchronous iterator in the default executor, as it may block."""
+    if not isinstance(chunks, AsyncIterator):
+        chunks = _in_executor(chunks)
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            if chunked:
+                writer.write(b"%x\r\n" % len(chunk))
+            writer.write(chunk)
+            if chunked:
+                writer.write(b"\r\n")
+            await writer.drain()
+        if chunked:
+            writer.write(b"0\r\n\r\n")
+        await writer.drain()
+    finally:
+        await chunks.aclose()
+
+
+async def _in_executor(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Get the chunks of a synchronous iterator in the default executor, closing it at the end."""
+    loop = asyncio.get_running_loop()
+    try:
+        while (chunk := await loop.run_in_executor(None, next, chunks, None)) is not None:
+            yield chunk
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+async def _batch_records(results: AsyncIterator[tuple[int, bytes | Exception]]) -> AsyncIterator[bytes]:
+    """Serialize the results of `get_and_compute_batch_async` as the records of a batch response, see `http_server._batch_records`."""
+    try:
+        async for index, result in results:
+            for chunk in _batch_record(index, result):
+                yield chunk
+    finally:
+        await results.aclose()
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 431: "Request Header Fields Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
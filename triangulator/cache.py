@@ -0,0 +1,146 @@
+"""In-process cache of serialized triangulation results."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Defaults of the cache used by get_and_compute, overridden by the environment variables
+# TRIANGULATION_CACHE_BYTES (0 disables the cache) and TRIANGULATION_CACHE_TTL (in seconds, unset for no expiry)
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_CACHE_TTL = None
+
+
+class ResultCache:
+    """A thread-safe LRU cache of bytes, bounded by the total size of the values rather than their number.
+
+    Args:
+        max_bytes (int): The maximum total size of the cached values, in bytes.
+        ttl (float | None, optional): The number of seconds a value stays valid after it is stored.
+            Defaults to None, for no expiry.
+
+    Raises:
+        ValueError: If max_bytes is negative, or ttl is not positive.
+
+    """
+
+    def __init__(self, max_bytes: int, ttl: float | None = None) -> None:
+        """Initialize an empty cache."""
+        if max_bytes < 0:
+            raise ValueError("The cache size must not be negative.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("The cache time-to-live must be positive.")
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.__entries : OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_environment(cls) -> 'ResultCache':
+        """Build a cache configured by the TRIANGULATION_CACHE_BYTES and TRIANGULATION_CACHE_TTL environment variables.
+
+        Raises:
+            ValueError: If a variable is not a valid number.
+
+        Returns:
+            ResultCache: The cache, with DEFAULT_CACHE_BYTES and DEFAULT_CACHE_TTL for unset variables.
+
+        """
+        max_bytes = os.getenv("TRIANGULATION_CACHE_BYTES")
+        ttl = os.getenv("TRIANGULATION_CACHE_TTL")
+        return cls(int(max_bytes) if max_bytes else DEFAULT_CACHE_BYTES,
+                   float(ttl) if ttl else DEFAULT_CACHE_TTL)
+
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored for a key, and mark it as the most recently used.
+
+        Args:
+            key (str): The key to look up.
+
+        Returns:
+            bytes | None: The value, or None if the key is not cached or has expired.
+
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] >= self.ttl:
+                self.__discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: bytes) -> bool:
+        """Store a value, evicting the least recently used ones to stay within the byte budget.
+
+        Args:
+            key (str): The key of the value.
+            value (bytes): The value to store, replacing any previous value of the key.
+
+        Returns:
+            bool: True if the value was stored, False if it is larger than the whole budget.
+
+        """
+        with self.__lock:
+            self.__discard(key)
+            if len(value) > self.max_bytes:
+                return False
+            while self.__size + len(value) > self.max_bytes:
+                oldest = next(iter(self.__entries))
+                self.__discard(oldest)
+                self.evictions += 1
+            self.__entries[key] = (value, time.monotonic())
+            self.__size += len(value)
+            return True
+
+    def __discard(self, key: str) -> None:
+        """Remove a key if it is cached. The lock must be held."""
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            self.__size -= len(entry[0])
+
+    def clear(self) -> None:
+        """Remove all the values and reset the counters."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    @property
+    def size(self) -> int:
+        """Return the total size of the cached values.
+
+        Returns:
+            int: The total size of the cached values, in bytes.
+
+        """
+        return self.__size
+
+    def __len__(self) -> int:
+        """Return the number of cached values.
+
+        Returns:
+            int: The number of cached values, expired ones included until they are looked up or evicted.
+
+        """
+        return len(self.__entries)
+
+    def __contains__(self, key: object) -> bool:
+        """Check if a key is cached, without counting a hit or a miss nor changing its recency.
+
+        Returns:
+            bool: True if the key is cached and has not expired, False otherwise.
+
+        """
+        if not isinstance(key, str):
+            return False
+        with self.__lock:
+            entry = self.__entries.get(key)
+            return entry is not None and (self.ttl is None or time.monotonic() - entry[1] < self.ttl)
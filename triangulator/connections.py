@@ -0,0 +1,321 @@
+"""Pools of persistent HTTP/1.1 connections, shared by threads or by the tasks of an event loop."""
+
+import asyncio
+import http.client
+import os
+import threading
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from typing import Self, TypeVar
+from urllib.parse import SplitResult, urlsplit
+
+# Defaults of the pool used to reach the PointSet API, overridden by the environment variables
+# POINTSET_API_MAX_CONNECTIONS, POINTSET_API_CONNECT_TIMEOUT and POINTSET_API_READ_TIMEOUT (in seconds)
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+
+T = TypeVar("T")
+
+# A kept-alive connection may have been closed by the server while idle, which only shows on the next request
+_STALE_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+
+class _Pool:
+    """Settings and bookkeeping shared by the pools.
+
+    Args:
+        max_connections (int, optional): The maximum number of connections per host. Defaults to DEFAULT_MAX_CONNECTIONS.
+        connect_timeout (float, optional): The number of seconds to wait for a connection. Defaults to DEFAULT_CONNECT_TIMEOUT.
+        read_timeout (float, optional): The number of seconds to wait for each read of a response. Defaults to DEFAULT_READ_TIMEOUT.
+
+    Raises:
+        ValueError: If max_connections or a timeout is not positive.
+
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT) -> None:
+        """Initialize an empty pool."""
+        if max_connections < 1:
+            raise ValueError("The number of connections must be positive.")
+        if connect_timeout <= 0 or read_timeout <= 0:
+            raise ValueError("The timeouts must be positive.")
+        self.max_connections = max_connections
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._hosts: dict[tuple[str, str, int | None], tuple] = {}
+        self._lock = threading.Lock()
+        self.connections = 0
+
+    @classmethod
+    def from_environment(cls) -> Self:
+        """Build a pool configured by the POINTSET_API_MAX_CONNECTIONS, POINTSET_API_CONNECT_TIMEOUT and POINTSET_API_READ_TIMEOUT environment variables.
+
+        Raises:
+            ValueError: If a variable is not a valid number.
+
+        Returns:
+            Self: The pool, with the defaults for unset variables.
+
+        """
+        max_connections = os.getenv("POINTSET_API_MAX_CONNECTIONS")
+        connect_timeout = os.getenv("POINTSET_API_CONNECT_TIMEOUT")
+        read_timeout = os.getenv("POINTSET_API_READ_TIMEOUT")
+        return cls(int(max_connections) if max_connections else DEFAULT_MAX_CONNECTIONS,
+                   float(connect_timeout) if connect_timeout else DEFAULT_CONNECT_TIMEOUT,
+                   float(read_timeout) if read_timeout else DEFAULT_READ_TIMEOUT)
+
+
+class ConnectionPool(_Pool):
+    """A thread-safe pool of keep-alive HTTP connections, with at most max_connections open per host.
+
+    A connection is taken from the idle ones of its host, or opened when there is none, and given back once
+    its response is fully read, unless the server asked to close it. When all the connections of a host are
+    in use, requests wait for one to be given back, for at most the connect timeout.
+
+    Args:
+        max_connections (int, optional): The maximum number of connections per host. Defaults to DEFAULT_MAX_CONNECTIONS.
+        connect_timeout (float, optional): The number of seconds to wait for a connection. Defaults to DEFAULT_CONNECT_TIMEOUT.
+        read_timeout (float, optional): The number of seconds to wait for each read of a response. Defaults to DEFAULT_READ_TIMEOUT.
+
+    Raises:
+        ValueError: If max_connections or a timeout is not positive.
+
+    """
+
+    @contextmanager
+    def urlopen(self, url: str) -> Iterator[http.client.HTTPResponse]:
+        """Send a GET request on a pooled connection.
+
+        The connection goes back to the pool when the block exits, if the response was read to the end.
+        A request failing on a connection closed by the server while idle is sent again on a new one.
+
+        Args:
+            url (str): The absolute http or https URL to get.
+
+        Raises:
+            ValueError: If the URL is not an absolute http or https URL.
+            TimeoutError: If no connection to the host became available within the connect timeout.
+            OSError: If the server cannot be reached, or a read times out.
+            http.client.HTTPException: If the response is not valid HTTP.
+
+        Returns:
+            Iterator[http.client.HTTPResponse]: A context manager giving the response, whatever its status.
+
+        """
+        parts, target = _split(url)
+        slots, idle = self.__host((parts.scheme, parts.hostname, parts.port))
+        if not slots.acquire(timeout=self.connect_timeout):
+            raise TimeoutError(f"No connection to {parts.hostname} available after {self.connect_timeout} seconds")
+        connection = None
+        try:
+            connection, response = self.__send(parts.scheme, parts.hostname, parts.port, target, idle)
+            yield response
+            if response.isclosed() and not response.will_close:
+                idle.append(connection)
+                connection = None
+        finally:
+            if connection is not None:
+                connection.close()
+            slots.release()
+
+    def close(self) -> None:
+        """Close the idle connections. Connections in use are closed when given back."""
+        with self._lock:
+            hosts = list(self._hosts.values())
+        for _, idle in hosts:
+            while idle:
+                idle.pop().close()
+
+    def __host(self, host: tuple[str, str, int | None]) -> tuple[threading.BoundedSemaphore, list[http.client.HTTPConnection]]:
+        """Return the slots and the idle connections of a host, created on first use."""
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = (threading.BoundedSemaphore(self.max_connections), [])
+            return self._hosts[host]
+
+    def __send(self, scheme: str, hostname: str, port: int | None, target: str,
+               idle: list[http.client.HTTPConnection]) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a request on the most recently used idle connection, or on a new one.
+
+        Returns:
+            tuple[http.client.HTTPConnection, http.client.HTTPResponse]: The connection, and the response, whose body is not read yet.
+
+        """
+        while True:
+            try:
+                connection = idle.pop()
+                reused = True
+            except IndexError:
+                connection = self.__connect(scheme, hostname, port)
+                reused = False
+            try:
+                connection.request("GET", target)
+                return connection, connection.getresponse()
+            except _STALE_ERRORS:
+                connection.close()
+                if not reused:
+                    raise
+            except BaseException:
+                connection.close()
+                raise
+
+    def __connect(self, scheme: str, hostname: str, port: int | None) -> http.client.HTTPConnection:
+        """Open a connection within the connect timeout, then switch it to the read timeout."""
+        factory = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        connection = factory(hostname, port, timeout=self.connect_timeout)
+        connection.connect()
+        connection.sock.settimeout(self.read_timeout)
+        with self._lock:
+            self.connections += 1
+        return connection
+
+
+class AsyncConnectionPool(_Pool):
+    """A pool of keep-alive HTTP connections for the tasks of one event loop, with at most max_connections open per host.
+
+    It behaves like `ConnectionPool`, on asyncio streams, so waiting for a response holds no thread.
+    Responses are read whole, with a Content-Length, chunked, or up to the end of the connection.
+
+    Args:
+        max_connections (int, optional): The maximum number of connections per host. Defaults to DEFAULT_MAX_CONNECTIONS.
+        connect_timeout (float, optional): The number of seconds to wait for a connection. Defaults to DEFAULT_CONNECT_TIMEOUT.
+        read_timeout (float, optional): The number of seconds to wait for each read of a response. Defaults to DEFAULT_READ_TIMEOUT.
+
+    Raises:
+        ValueError: If max_connections or a timeout is not positive.
+
+    """
+
+    async def get(self, url: str) -> tuple[int, bytes]:
+        """Send a GET request on a pooled connection, and read the response.
+
+        A request failing on a connection closed by the server while idle is sent again on a new one.
+
+        Args:
+            url (str): The absolute http or https URL to get.
+
+        Raises:
+            ValueError: If the URL is not an absolute http or https URL.
+            TimeoutError: If no connection to the host became available within the connect timeout, or a read timed out.
+            OSError: If the server cannot be reached.
+            http.client.HTTPException: If the response is not valid HTTP.
+
+        Returns:
+            tuple[int, bytes]: The status and the body of the response, whatever the status.
+
+        """
+        parts, target = _split(url)
+        slots, idle = self.__host((parts.scheme, parts.hostname, parts.port))
+        try:
+            await asyncio.wait_for(slots.acquire(), self.connect_timeout)
+        except TimeoutError:
+            raise TimeoutError(f"No connection to {parts.hostname} available after {self.connect_timeout} seconds") from None
+        try:
+            while True:
+                reused = bool(idle)
+                reader, writer = idle.pop() if reused else await self.__connect(parts.scheme, parts.hostname, parts.port)
+                try:
+                    status, body, keep_alive = await self.__exchange(reader, writer, parts.netloc, target)
+                except _STALE_ERRORS:
+                    writer.close()
+                    if not reused:
+                        raise
+                    continue
+                except BaseException:
+                    writer.close()
+                    raise
+                if keep_alive:
+                    idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status, body
+        finally:
+            slots.release()
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        for _, idle in self._hosts.values():
+            while idle:
+                idle.pop()[1].close()
+
+    def __host(self, host: tuple[str, str, int | None]) -> tuple[asyncio.Semaphore, list[tuple[asyncio.StreamReader, asyncio.StreamWriter]]]:
+        """Return the slots and the idle connections of a host, created on first use."""
+        if host not in self._hosts:
+            self._hosts[host] = (asyncio.Semaphore(self.max_connections), [])
+        return self._hosts[host]
+
+    async def __connect(self, scheme: str, hostname: str, port: int | None) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Open a connection within the connect timeout."""
+        if port is None:
+            port = 443 if scheme == "https" else 80
+        connection = await asyncio.wait_for(asyncio.open_connection(hostname, port, ssl=scheme == "https"), self.connect_timeout)
+        self.connections += 1
+        return connection
+
+    async def __exchange(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str, target: str) -> tuple[int, bytes, bool]:
+        """Send a request and read its response.
+
+        Returns:
+            tuple[int, bytes, bool]: The status and the body of the response, and whether the connection can be reused.
+
+        """
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\nAccept: */*\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        line = await self.__read(reader.readline())
+        if not line:
+            raise http.client.RemoteDisconnected("Remote end closed connection without response")
+        version, _, rest = line.decode("latin-1").rstrip("\r\n").partition(" ")
+        status = rest[:3]
+        if not version.startswith("HTTP/1.") or not status.isdigit():
+            raise http.client.BadStatusLine(line.decode("latin-1"))
+        headers = {}
+        while (line := await self.__read(reader.readline())) not in (b"\r\n", b"\n"):
+            if not line:
+                raise http.client.IncompleteRead(b"")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+        try:
+            if headers.get("transfer-encoding", "").lower() == "chunked":
+                body = await self.__read_chunked(reader)
+            elif "content-length" in headers:
+                body = await self.__read(reader.readexactly(int(headers["content-length"])))
+            else:
+                body = await self.__read(reader.read())
+                keep_alive = False
+        except asyncio.IncompleteReadError as e:
+            raise http.client.IncompleteRead(e.partial, e.expected) from None
+        return int(status), body, keep_alive
+
+    async def __read_chunked(self, reader: asyncio.StreamReader) -> bytes:
+        """Read a chunked body, and its trailer."""
+        body = bytearray()
+        while size := int((await self.__read(reader.readline())).split(b";")[0], 16):
+            body += await self.__read(reader.readexactly(size + 2))
+            del body[-2:]
+        while await self.__read(reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        return bytes(body)
+
+    async def __read(self, read: Awaitable[T]) -> T:
+        """Wait for a read, for at most the read timeout."""
+        return await asyncio.wait_for(read, self.read_timeout)
+
+
+def _split(url: str) -> tuple[SplitResult, str]:
+    """Split an absolute http or https URL, and build the target of its request.
+
+    Raises:
+        ValueError: If the URL is not an absolute http or https URL.
+
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Unsupported URL: {url}")
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    return parts, target
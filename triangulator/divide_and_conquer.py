@@ -0,0 +1,256 @@
+"""Guibas-Stolfi divide-and-conquer Delaunay triangulation."""
+
+from array import array
+
+from .mesh import HalfEdgeMesh
+from .predicates import in_circle_det, orientation
+
+
+class _QuadEdges:
+    """Quad-edge structure stored in flat lists.
+
+    Edge ``e`` belongs to the quad-edge ``e // 4``, and ``e ^ 2`` is the same edge in the opposite direction.
+    Odd edges are the dual edges, joining faces, and have no origin.
+
+    Args:
+        xs (list[float]): x coordinates of the vertices.
+        ys (list[float]): y coordinates of the vertices.
+
+    """
+
+    def __init__(self, xs: list[float], ys: list[float]) -> None:
+        """Initialize an empty structure over the given vertices."""
+        self.xs = xs
+        self.ys = ys
+        self.onext: list[int] = []
+        self.origin: list[int] = []
+        self.alive: list[bool] = []
+
+    @staticmethod
+    def rot(e: int) -> int:
+        """Return the dual of e, directed from its right face to its left face."""
+        return (e & ~3) | ((e + 1) & 3)
+
+    @staticmethod
+    def sym(e: int) -> int:
+        """Return e in the opposite direction."""
+        return e ^ 2
+
+    @staticmethod
+    def rot_inv(e: int) -> int:
+        """Return the dual of e, directed from its left face to its right face."""
+        return (e & ~3) | ((e + 3) & 3)
+
+    def dest(self, e: int) -> int:
+        """Return the destination vertex of e."""
+        return self.origin[e ^ 2]
+
+    def oprev(self, e: int) -> int:
+        """Return the next edge clockwise around the origin of e."""
+        return self.rot(self.onext[self.rot(e)])
+
+    def lnext(self, e: int) -> int:
+        """Return the next edge counter-clockwise around the left face of e."""
+        return self.rot(self.onext[self.rot_inv(e)])
+
+    def rprev(self, e: int) -> int:
+        """Return the previous edge around the right face of e."""
+        return self.onext[e ^ 2]
+
+    def make_edge(self, a: int, b: int) -> int:
+        """Create an isolated edge from a to b.
+
+        Returns:
+            int: The new edge.
+
+        """
+        e = len(self.onext)
+        self.onext += (e, e + 3, e + 2, e + 1)
+        self.origin += (a, -1, b, -1)
+        self.alive.append(True)
+        return e
+
+    def splice(self, a: int, b: int) -> None:
+        """Join or split the edge rings around the origins of a and b."""
+        onext = self.onext
+        alpha = self.rot(onext[a])
+        beta = self.rot(onext[b])
+        onext[a], onext[b] = onext[b], onext[a]
+        onext[alpha], onext[beta] = onext[beta], onext[alpha]
+
+    def connect(self, a: int, b: int) -> int:
+        """Create an edge from the destination of a to the origin of b, on the left face of both.
+
+        Returns:
+            int: The new edge.
+
+        """
+        e = self.make_edge(self.dest(a), self.origin[b])
+        self.splice(e, self.lnext(a))
+        self.splice(e ^ 2, b)
+        return e
+
+    def delete(self, e: int) -> None:
+        """Remove e from the structure."""
+        self.splice(e, self.oprev(e))
+        self.splice(e ^ 2, self.oprev(e ^ 2))
+        self.alive[e >> 2] = False
+
+    def ccw(self, a: int, b: int, c: int) -> bool:
+        """Check if vertices a, b, c are in counter-clockwise order."""
+        xs, ys = self.xs, self.ys
+        return orientation(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]) > 0
+
+    def right_of(self, v: int, e: int) -> bool:
+        """Check if vertex v is strictly on the right of e."""
+        xs, ys = self.xs, self.ys
+        a, b = self.origin[e], self.origin[e ^ 2]
+        return orientation(xs[v], ys[v], xs[b], ys[b], xs[a], ys[a]) > 0
+
+    def left_of(self, v: int, e: int) -> bool:
+        """Check if vertex v is strictly on the left of e."""
+        xs, ys = self.xs, self.ys
+        a, b = self.origin[e], self.origin[e ^ 2]
+        return orientation(xs[v], ys[v], xs[a], ys[a], xs[b], ys[b]) > 0
+
+    def in_circle(self, a: int, b: int, c: int, d: int) -> bool:
+        """Check if vertex d is inside the circumcircle of the counter-clockwise triangle a, b, c."""
+        xs, ys = self.xs, self.ys
+        return in_circle_det(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], xs[d], ys[d]) > 0
+
+
+def divide_and_conquer(xs: list[float], ys: list[float]) -> HalfEdgeMesh:
+    """Compute the Delaunay triangulation of distinct points with the Guibas-Stolfi algorithm.
+
+    Points are sorted by x, then y, and split recursively into halves whose triangulations are merged
+    along a rising chain of cross edges.
+
+    Args:
+        xs (list[float]): x coordinates of the points.
+        ys (list[float]): y coordinates of the points.
+
+    Returns:
+        HalfEdgeMesh: The clockwise triangles, covering the convex hull of the points.
+
+    """
+    n = len(xs)
+    if n < 3:
+        return HalfEdgeMesh([])
+    edges = _QuadEdges(xs, ys)
+    vertices = sorted(range(n), key=lambda i: (xs[i], ys[i]))
+    _delaunay(edges, vertices, 0, n)
+    return _faces(edges)
+
+
+def _delaunay(edges: _QuadEdges, vertices: list[int], lo: int, hi: int) -> tuple[int, int]:
+    """Triangulate vertices[lo:hi], sorted by x then y.
+
+    Returns:
+        tuple[int, int]: The counter-clockwise convex hull edge out of the leftmost vertex,
+            and the clockwise convex hull edge out of the rightmost vertex.
+
+    """
+    count = hi - lo
+    if count == 2:
+        a = edges.make_edge(vertices[lo], vertices[lo + 1])
+        return a, a ^ 2
+    if count == 3:
+        s1, s2, s3 = vertices[lo:hi]
+        a = edges.make_edge(s1, s2)
+        b = edges.make_edge(s2, s3)
+        edges.splice(a ^ 2, b)
+        if edges.ccw(s1, s2, s3):
+            edges.connect(b, a)
+            return a, b ^ 2
+        if edges.ccw(s1, s3, s2):
+            c = edges.connect(b, a)
+            return c ^ 2, c
+        # The three points are collinear
+        return a, b ^ 2
+
+    mid = lo + count // 2
+    return _merge(edges, _delaunay(edges, vertices, lo, mid), _delaunay(edges, vertices, mid, hi))
+
+
+def _merge(edges: _QuadEdges, left: tuple[int, int], right: tuple[int, int]) -> tuple[int, int]:
+    """Merge the triangulations of two halves, the left one entirely before the right one in x then y order.
+
+    Args:
+        edges (_QuadEdges): The structure holding both triangulations.
+        left (tuple[int, int]): The hull edges of the left half, as returned by `_delaunay`.
+        right (tuple[int, int]): The hull edges of the right half, as returned by `_delaunay`.
+
+    Returns:
+        tuple[int, int]: The hull edges of the merged triangulation, as returned by `_delaunay`.
+
+    """
+    ldo, ldi = left
+    rdi, rdo = right
+    origin, onext = edges.origin, edges.onext
+
+    # Find the lower common tangent of the two halves
+    while True:
+        if edges.left_of(origin[rdi], ldi):
+            ldi = edges.lnext(ldi)
+        elif edges.right_of(origin[ldi], rdi):
+            rdi = edges.rprev(rdi)
+        else:
+            break
+    base = edges.connect(rdi ^ 2, ldi)
+    if origin[ldi] == origin[ldo]:
+        ldo = base ^ 2
+    if origin[rdi] == origin[rdo]:
+        rdo = base
+
+    # Zip the halves together, from the lower tangent to the upper one
+    while True:
+        left = onext[base ^ 2]
+        left_valid = edges.right_of(edges.dest(left), base)
+        if left_valid:
+            while edges.in_circle(edges.dest(base), origin[base], edges.dest(left), edges.dest(onext[left])):
+                nxt = onext[left]
+                edges.delete(left)
+                left = nxt
+        right = edges.oprev(base)
+        right_valid = edges.right_of(edges.dest(right), base)
+        if right_valid:
+            while edges.in_circle(edges.dest(base), origin[base], edges.dest(right), edges.dest(edges.oprev(right))):
+                nxt = edges.oprev(right)
+                edges.delete(right)
+                right = nxt
+        if not left_valid and not right_valid:
+            break
+        use_right = not left_valid or (right_valid and edges.in_circle(edges.dest(left), origin[left], origin[right], edges.dest(right)))
+        base = edges.connect(right, base ^ 2) if use_right else edges.connect(base ^ 2, left ^ 2)
+    return ldo, rdo
+
+
+def _faces(edges: _QuadEdges) -> HalfEdgeMesh:
+    """Collect the triangular faces of a quad-edge structure.
+
+    Returns:
+        HalfEdgeMesh: The clockwise triangles, whose half-edges are the reversed edges of the counter-clockwise faces.
+
+    """
+    origin = edges.origin
+    seen = set()
+    vertices = array('I')
+    labels = []
+    half_edge = [-1] * len(origin)
+    for q, alive in enumerate(edges.alive):
+        if not alive:
+            continue
+        for e in (4 * q, 4 * q + 2):
+            if e in seen:
+                continue
+            e2 = edges.lnext(e)
+            e3 = edges.lnext(e2)
+            seen.update((e, e2, e3))
+            if edges.lnext(e3) == e:
+                a, b, c = origin[e], origin[e2], origin[e3]
+                if edges.ccw(a, b, c):
+                    h = len(vertices)
+                    vertices.extend((a, c, b))
+                    labels += (e3 ^ 2, e2 ^ 2, e ^ 2)
+                    half_edge[e3 ^ 2], half_edge[e2 ^ 2], half_edge[e ^ 2] = h, h + 1, h + 2
+    return HalfEdgeMesh(vertices, array('i', [half_edge[label ^ 2] for label in labels]))
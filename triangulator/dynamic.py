@@ -0,0 +1,362 @@
+"""Delaunay triangulation updated in place, one point at a time."""
+
+from .data_types import Point as _Point
+from .mesh import _canonical
+from .pointset import PointSet
+from .predicates import in_circle_det, orientation
+from .sweep_hull import sweep_hull
+from .triangles import Triangles
+from .triangulator import _AdjacencyMesh, _are_collinear
+
+type Point = tuple[float, float] | _Point
+
+# Vertex of the ghost triangles, standing for the point at infinity
+_GHOST = -2
+
+
+class DynamicTriangulation:
+    """A Delaunay triangulation that can be updated by inserting and removing points.
+
+    Inserting a point only re-triangulates the cavity of triangles whose circumcircle contains it,
+    and removing a point only re-triangulates the hole it leaves, by cutting Delaunay ears from its boundary.
+    The cost of an update depends on the degree of the point, not on the size of the set,
+    plus a walk from the previous update to locate an inserted point.
+
+    Points are indexed in insertion order. When a point is removed, the last point takes its index.
+
+    Args:
+        points (PointSet): The initial points.
+
+    Raises:
+        ValueError: If the point set has fewer than 3 points or all points are collinear.
+
+    """
+
+    def __init__(self, points: PointSet) -> None:
+        """Triangulate the initial points."""
+        if len(points) < 3:
+            raise ValueError("At least 3 points are required for triangulation.")
+        if _are_collinear(points):
+            raise ValueError("All points are collinear, cannot triangulate.")
+        xs = points.xs.tolist()
+        ys = points.ys.tolist()
+        self._mesh = _GhostMesh(xs, ys, sweep_hull(xs, ys))
+        self._indices = {(x, y): i for i, (x, y) in enumerate(zip(xs, ys, strict=True))}
+
+    def nb_points(self) -> int:
+        """Return the number of points in the triangulation.
+
+        Returns:
+            int: The number of points in the triangulation.
+
+        """
+        return len(self._mesh.xs)
+
+    def __len__(self) -> int:
+        """Return the number of points in the triangulation.
+
+        Returns:
+            int: The number of points in the triangulation.
+
+        """
+        return self.nb_points()
+
+    def insert_point(self, point: Point) -> int:
+        """Insert a point, and restore the Delaunay property around it.
+
+        Args:
+            point (Point): The point to insert.
+
+        Raises:
+            ValueError: If the point already exists in the triangulation.
+
+        Returns:
+            int: The index of the inserted point.
+
+        """
+        key = (point.x, point.y) if isinstance(point, _Point) else (point[0], point[1])
+        if key in self._indices:
+            raise ValueError("Point already exists in the set.")
+        mesh = self._mesh
+        i = len(mesh.xs)
+        mesh.xs.append(key[0])
+        mesh.ys.append(key[1])
+        mesh.vertex_triangle.append(-1)
+        mesh.insert(i)
+        self._indices[key] = i
+        return i
+
+    def remove_point(self, point: Point) -> None:
+        """Remove a point, and fill the hole it leaves with Delaunay triangles.
+
+        Args:
+            point (Point): The point to remove.
+
+        Raises:
+            ValueError: If the point does not exist in the triangulation.
+            ValueError: If fewer than 3 points, or only collinear points, would remain.
+
+        """
+        key = (point.x, point.y) if isinstance(point, _Point) else (point[0], point[1])
+        i = self._indices.get(key)
+        if i is None:
+            raise ValueError("Point does not exist in the set.")
+        if len(self) <= 3:
+            raise ValueError("At least 3 points are required for triangulation.")
+        mesh = self._mesh
+        mesh.remove(i)
+        del self._indices[key]
+        last = len(mesh.xs) - 1
+        if i != last:
+            mesh.relabel(last, i)
+            self._indices[(mesh.xs[i], mesh.ys[i])] = i
+        else:
+            mesh.xs.pop()
+            mesh.ys.pop()
+            mesh.vertex_triangle.pop()
+
+    def to_triangles(self) -> Triangles:
+        """Return the current triangulation.
+
+        Returns:
+            Triangles: The points, by index, and the triangles in the same canonical order as `triangulate`.
+
+        """
+        mesh = self._mesh
+        return Triangles(points=list(zip(mesh.xs, mesh.ys, strict=True)), triangles=_canonical(mesh.triangles()))
+
+
+class _GhostMesh(_AdjacencyMesh):
+    """Adjacency mesh covering the whole plane, so updates can move the convex hull.
+
+    Each convex hull edge from a to b is also the edge from b to a of a ghost triangle (b, a, _GHOST),
+    so every triangle has three neighbours and no super-triangle is needed.
+    A point conflicts with a ghost triangle when it lies strictly outside of its hull edge, or on the edge itself.
+
+    Args:
+        xs (list[float]): x coordinates of the vertices.
+        ys (list[float]): y coordinates of the vertices.
+        triangles (list[tuple[int, int, int]]): The clockwise triangles of a Delaunay triangulation of the vertices.
+
+    """
+
+    def __init__(self, xs: list[float], ys: list[float], triangles: list[tuple[int, int, int]]) -> None:
+        """Build the mesh and its ghost triangles."""
+        self.xs = xs
+        self.ys = ys
+        self.vertices: list[int] = []
+        self.neighbours: list[int] = []
+        self.free: list[int] = []
+        self.last = 0
+        self._arrays = None
+        self.vertex_triangle = [-1] * len(xs)
+
+        edges: dict[tuple[int, int], int] = {}
+        for a, b, c in triangles:
+            t = self._new_triangle(a, b, c)
+            edges[a, b], edges[b, c], edges[c, a] = 3 * t, 3 * t + 1, 3 * t + 2
+        for a, b in [edge for edge in edges if edge[::-1] not in edges]:
+            t = self._new_triangle(b, a, _GHOST)
+            edges[b, a], edges[a, _GHOST], edges[_GHOST, b] = 3 * t, 3 * t + 1, 3 * t + 2
+        for (a, b), e in edges.items():
+            self.neighbours[e] = edges[b, a] // 3
+
+    def _new_triangle(self, a: int, b: int, c: int) -> int:
+        """Store triangle (a, b, c), and make it the reference triangle of its vertices.
+
+        Returns:
+            int: The slot of the triangle.
+
+        """
+        t = super()._new_triangle(a, b, c)
+        for v in (a, b, c):
+            if v != _GHOST:
+                self.vertex_triangle[v] = t
+        return t
+
+    def _hull_edge(self, t: int) -> tuple[int, int] | None:
+        """Return the hull edge of ghost triangle t, or None if t is a real triangle."""
+        vertices = self.vertices
+        base = 3 * t
+        for k in range(3):
+            if vertices[base + k] == _GHOST:
+                return vertices[base + (k + 1) % 3], vertices[base + (k + 2) % 3]
+        return None
+
+    def _in_circle(self, t: int, px: float, py: float) -> bool:
+        """Check if (px, py) is inside the circumcircle of triangle t, or beyond the hull edge of a ghost triangle."""
+        edge = self._hull_edge(t)
+        if edge is None:
+            return super()._in_circle(t, px, py)
+        xs, ys = self.xs, self.ys
+        a, b = edge
+        side = orientation(xs[a], ys[a], xs[b], ys[b], px, py)
+        if side != 0:
+            return side < 0
+        # On the line of the edge: in conflict only when strictly between its ends
+        if xs[a] != xs[b]:
+            return min(xs[a], xs[b]) < px < max(xs[a], xs[b])
+        return min(ys[a], ys[b]) < py < max(ys[a], ys[b])
+
+    def _in_circle_many(self, candidates: list[int], px: float, py: float) -> list[int]:
+        """Return the triangles among candidates in conflict with (px, py)."""
+        return [t for t in candidates if self._in_circle(t, px, py)]
+
+    def locate(self, px: float, py: float) -> int:
+        """Find the triangle containing (px, py), or a ghost triangle it conflicts with if it is outside the hull.
+
+        Returns:
+            int: The slot of the triangle.
+
+        """
+        xs, ys, vertices, neighbours = self.xs, self.ys, self.vertices, self.neighbours
+        t = self.last
+        edge = self._hull_edge(t)
+        if edge is not None:
+            # Step into the real triangle on the other side of the hull edge
+            t = neighbours[3 * t + vertices[3 * t:3 * t + 3].index(edge[0])]
+        for _ in range(len(neighbours) // 3):
+            base = 3 * t
+            for k in range(3):
+                a = vertices[base + k]
+                b = vertices[base + (k + 1) % 3]
+                if orientation(xs[a], ys[a], xs[b], ys[b], px, py) > 0:
+                    t = neighbours[base + k]
+                    if self._hull_edge(t) is not None:
+                        return t
+                    break
+            else:
+                return t
+        # The walk can only cycle on numerically degenerate meshes: fall back to a full scan.
+        for t in range(len(neighbours) // 3):
+            if vertices[3 * t] == -1:
+                continue
+            inside = self._contains(t, px, py) if self._hull_edge(t) is None else self._in_circle(t, px, py)
+            if inside:
+                return t
+        return self.last
+
+    def _star(self, v: int) -> list[tuple[int, int, int, int]]:
+        """Return the triangles around vertex v, in clockwise order.
+
+        Returns:
+            list[tuple[int, int, int, int]]: For each triangle, the edge (a, b) opposite to v,
+                the triangle on the other side of that edge, and the triangle itself.
+
+        """
+        vertices, neighbours = self.vertices, self.neighbours
+        first = t = self.vertex_triangle[v]
+        star = []
+        while True:
+            base = 3 * t
+            k = vertices[base:base + 3].index(v)
+            star.append((vertices[base + (k + 1) % 3], vertices[base + (k + 2) % 3], neighbours[base + (k + 1) % 3], t))
+            t = neighbours[base + (k + 2) % 3]
+            if t == first:
+                return star
+
+    def remove(self, v: int) -> None:
+        """Remove vertex v, and fill the hole with Delaunay ears.
+
+        Raises:
+            ValueError: If only collinear vertices would remain.
+
+        """
+        xs, ys, vertices, neighbours = self.xs, self.ys, self.vertices, self.neighbours
+        star = self._star(v)
+        cycle = [a for a, _, _, _ in star]
+        if _GHOST in cycle:
+            chain = [a for a in cycle if a != _GHOST]
+            p, q = chain[0], chain[-1]
+            if all(orientation(xs[p], ys[p], xs[q], ys[q], xs[c], ys[c]) == 0 for c in chain) and \
+               all(self._hull_edge(outer) is not None for a, b, outer, _ in star if _GHOST not in (a, b)):
+                raise ValueError("All points would be collinear, cannot triangulate.")
+
+        for _, _, _, t in star:
+            vertices[3 * t] = vertices[3 * t + 1] = vertices[3 * t + 2] = -1
+            self.free.append(t)
+        self.vertex_triangle[v] = -1
+
+        # Link the new triangles to each other, and to the triangles around the hole
+        outside = {(a, b): outer for a, b, outer, _ in star}
+        edges: dict[tuple[int, int], int] = {}
+        for a, b, c in self._fill(cycle):
+            t = self._new_triangle(a, b, c)
+            edges[a, b], edges[b, c], edges[c, a] = 3 * t, 3 * t + 1, 3 * t + 2
+            self.last = t
+        for (a, b), e in edges.items():
+            twin = edges.get((b, a))
+            if twin is not None:
+                neighbours[e] = twin // 3
+                continue
+            other = outside[a, b]
+            neighbours[e] = other
+            base = 3 * other
+            neighbours[base + vertices[base:base + 3].index(b)] = e // 3
+
+    def _fill(self, cycle: list[int]) -> list[tuple[int, int, int]]:
+        """Triangulate the hole left by a vertex, by repeatedly cutting a Delaunay ear from its boundary.
+
+        Args:
+            cycle (list[int]): The boundary of the hole, in clockwise order. It contains _GHOST if the
+                removed vertex was on the convex hull: the real vertices then form an open chain,
+                and the part of it left when there are no more ears becomes the new hull.
+
+        Returns:
+            list[tuple[int, int, int]]: The clockwise triangles filling the hole, ghost triangles included.
+
+        """
+        closed = _GHOST not in cycle
+        if closed:
+            polygon = list(cycle)
+        else:
+            k = cycle.index(_GHOST)
+            polygon = cycle[k + 1:] + cycle[:k]
+        triangles = []
+        while len(polygon) > 3 or not closed and len(polygon) > 2:
+            i = self._find_ear(polygon, closed)
+            if i is None:
+                break
+            triangles.append((polygon[i - 1], polygon[i], polygon[(i + 1) % len(polygon)]))
+            del polygon[i]
+        if closed:
+            triangles.append((polygon[0], polygon[1], polygon[2]))
+        else:
+            triangles += [(polygon[i], polygon[i + 1], _GHOST) for i in range(len(polygon) - 1)]
+        return triangles
+
+    def _find_ear(self, polygon: list[int], closed: bool) -> int | None:
+        """Find a convex vertex of polygon whose triangle with its neighbours has no other vertex in its circumcircle.
+
+        Returns:
+            int | None: The position of the vertex in polygon, or None if there is none.
+
+        """
+        xs, ys = self.xs, self.ys
+        n = len(polygon)
+        for i in range(n) if closed else range(1, n - 1):
+            a, b, c = polygon[i - 1], polygon[i], polygon[(i + 1) % n]
+            if orientation(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]) >= 0:
+                continue
+            if all(in_circle_det(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], xs[d], ys[d]) >= 0 for d in polygon if d not in (a, b, c)):
+                return i
+        return None
+
+    def relabel(self, old: int, new: int) -> None:
+        """Move the last vertex, old, to the free index new."""
+        vertices = self.vertices
+        for _, _, _, t in self._star(old):
+            base = 3 * t
+            vertices[base + vertices[base:base + 3].index(old)] = new
+        self.xs[new] = self.xs.pop()
+        self.ys[new] = self.ys.pop()
+        self.vertex_triangle[new] = self.vertex_triangle.pop()
+
+    def triangles(self) -> list[tuple[int, int, int]]:
+        """Return the live triangles, without the ghost triangles.
+
+        Returns:
+            list[tuple[int, int, int]]: The vertex indices of each triangle.
+
+        """
+        return [triangle for triangle in super().triangles() if _GHOST not in triangle]
@@ -1,8 +1,35 @@
 """HTTP server module for the triangulator application."""
 
+import io
+import json
+from collections.abc import Iterator
+from struct import calcsize, pack, unpack
+from typing import BinaryIO
+
 import flask as fk
 
-from .triangulator import get_and_compute
+from .pointset import PointSet
+from .triangulator import compute_and_stream, get_and_compute_batch, get_and_stream
+from .workers import PoolFullError
+
+# Largest number of point set IDs in a request to /triangulation/batch
+MAX_BATCH_SIZE = 1000
+# Default largest PointSet accepted in the body of a POST to /triangulation, in bytes: 8 million points
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+class BodyTooLargeError(Exception):
+    """Raised when the body of a request is larger than the server accepts.
+
+    Args:
+        max_body_bytes (int): The largest body accepted, in bytes.
+
+    """
+
+    def __init__(self, max_body_bytes: int) -> None:
+        """Initialize the error."""
+        super().__init__(f"The body of the request must not exceed {max_body_bytes} bytes.")
+        self.max_body_bytes = max_body_bytes
 
 
 class HTTPServer(fk.Flask):
@@ -10,12 +37,15 @@ class HTTPServer(fk.Flask):
 
     Args:
         name (str): The name of the Flask application.
+        max_body_bytes (int, optional): The largest PointSet accepted in the body of a POST to /triangulation,
+            in bytes. Defaults to MAX_BODY_BYTES.
 
     """
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, max_body_bytes: int = MAX_BODY_BYTES):
         """Initialize the HTTP server."""
         super().__init__(name)
+        self.max_body_bytes = max_body_bytes
         self.configure_routes()
 
     def configure_routes(self):
@@ -23,13 +53,146 @@ class HTTPServer(fk.Flask):
         @self.route("/triangulation/<point_set_id>", methods=["GET"])
         def triangulation(point_set_id: str):
             try:
-                triangles = get_and_compute(point_set_id)
-                return fk.Response(triangles, status=200, mimetype="application/octet-stream")
-            except KeyError as e:
-                return fk.jsonify({"code": "NOT FOUND", "message": str(e)}), 404
-            except ValueError as e:
-                return fk.jsonify({"code": "BAD REQUEST", "message": str(e)}), 400
-            except ConnectionError as e:
-                return fk.jsonify({"code": "SERVICE UNAVAILABLE", "message": str(e)}), 503
+                # Errors of the PointSet retrieval are raised here, before the response starts
+                return _response(*get_and_stream(point_set_id))
+            except Exception as e:
+                status, error, headers = _error(e)
+                return fk.jsonify(error), status, headers
+
+        @self.route("/triangulation", methods=["POST"])
+        def triangulation_upload():
+            try:
+                # The size announced by the header is checked before the points are read
+                stream = fk.request.stream
+                nb_points = _point_set_header(stream.read(calcsize('!L')), fk.request.content_length, self.max_body_bytes)
+                point_set = PointSet.from_bytes_with_size(stream.read(nb_points * calcsize('!ff')), nb_points)
+                return _response(*compute_and_stream(point_set))
             except Exception as e:
-                return fk.jsonify({"code": "INTERNAL SERVER ERROR", "message": str(e)}), 500
+                status, error, headers = _error(e)
+                return fk.jsonify(error), status, headers
+
+        @self.route("/triangulation/batch", methods=["POST"])
+        def triangulation_batch():
+            try:
+                point_set_ids = _batch_ids(fk.request.get_data())
+            except ValueError as e:
+                status, error, headers = _error(e)
+                return fk.jsonify(error), status, headers
+            return fk.Response(_batch_records(get_and_compute_batch(point_set_ids)), status=200, mimetype="application/octet-stream")
+
+
+def _response(body: Iterator[bytes] | BinaryIO, size: int | None) -> fk.Response:
+    """Build the response of a triangulation, from what `get_and_stream` returns."""
+    # Stored results are sent from the disk, with sendfile where the server supports it
+    response = fk.send_file(body, mimetype="application/octet-stream") if isinstance(body, io.IOBase) \
+        else fk.Response(body, status=200, mimetype="application/octet-stream")
+    if size is not None:
+        response.content_length = size
+    return response
+
+
+def _point_set_header(header: bytes, content_length: int | None, max_body_bytes: int) -> int:
+    """Check the header of a PointSet sent in the body of a request, before its points are read.
+
+    Args:
+        header (bytes): The first 4 bytes of the body, or all of it if it is shorter.
+        content_length (int | None): The size of the body, if the request announces it.
+        max_body_bytes (int): The largest body accepted, in bytes.
+
+    Raises:
+        BodyTooLargeError: If the body, or the PointSet the header announces, is larger than max_body_bytes.
+        ValueError: If the header is incomplete, or the body does not have the size the header announces.
+
+    Returns:
+        int: The number of points announced by the header.
+
+    """
+    if content_length is not None and content_length > max_body_bytes:
+        raise BodyTooLargeError(max_body_bytes)
+    if len(header) < calcsize('!L'):
+        raise ValueError("Invalid data: too short to contain number of points.")
+    nb_points = unpack('!L', header)[0]
+    size = calcsize('!L') + nb_points * calcsize('!ff')
+    if size > max_body_bytes:
+        raise BodyTooLargeError(max_body_bytes)
+    if content_length is not None and content_length != size:
+        raise ValueError(f"Invalid data: size does not match number of points. (expected {size}, got {content_length})")
+    return nb_points
+
+
+def _batch_ids(body: bytes) -> list[str]:
+    """Parse the body of a batch request, a JSON object listing the IDs of the point sets in "pointSetIds".
+
+    Args:
+        body (bytes): The body of the request.
+
+    Raises:
+        ValueError: If the body is not such an object, or it lists no ID or more than MAX_BATCH_SIZE.
+
+    Returns:
+        list[str]: The IDs of the point sets.
+
+    """
+    try:
+        request = json.loads(body)
+    except ValueError as e:
+        raise ValueError("The body must be a JSON object.") from e
+    point_set_ids = request.get("pointSetIds") if isinstance(request, dict) else None
+    if not isinstance(point_set_ids, list) or not all(isinstance(point_set_id, str) for point_set_id in point_set_ids):
+        raise ValueError("The body must be a JSON object listing point set IDs in 'pointSetIds'.")
+    if not 0 < len(point_set_ids) <= MAX_BATCH_SIZE:
+        raise ValueError(f"A batch must list between 1 and {MAX_BATCH_SIZE} point set IDs.")
+    return point_set_ids
+
+
+def _batch_records(results: Iterator[tuple[int, bytes | Exception]]) -> Iterator[bytes]:
+    """Serialize the results of `get_and_compute_batch` as the records of a batch response.
+
+    Each record starts with the index of its point set in the request, the HTTP status of its result and the size
+    of its payload, as unsigned longs like the counts of the binary formats. The payload follows: the Triangles
+    for status 200, or the Error object of the API in JSON otherwise.
+
+    Args:
+        results (Iterator[tuple[int, bytes | Exception]]): The results of the point sets, in completion order.
+
+    Returns:
+        Iterator[bytes]: The chunks of the records, in the same order.
+
+    """
+    for index, result in results:
+        yield from _batch_record(index, result)
+
+
+def _batch_record(index: int, result: bytes | Exception) -> tuple[bytes, bytes]:
+    """Serialize the result of one point set as a record of a batch response, see `_batch_records`.
+
+    Returns:
+        tuple[bytes, bytes]: The header of the record, and its payload.
+
+    """
+    if isinstance(result, Exception):
+        status, error, _ = _error(result)
+        payload = json.dumps(error).encode()
+    else:
+        status, payload = 200, result
+    return pack('!LLL', index, status, len(payload)), payload
+
+
+def _error(error: Exception) -> tuple[int, dict[str, str], dict[str, str]]:
+    """Map an error of the triangulation to the status, the body and the extra headers of its response.
+
+    Returns:
+        tuple[int, dict[str, str], dict[str, str]]: The HTTP status, the Error object of the API, and the headers.
+
+    """
+    if isinstance(error, BodyTooLargeError):
+        return 413, {"code": "PAYLOAD TOO LARGE", "message": str(error)}, {}
+    if isinstance(error, PoolFullError):
+        return 503, {"code": "SERVICE UNAVAILABLE", "message": str(error)}, {"Retry-After": str(error.retry_after)}
+    if isinstance(error, KeyError):
+        return 404, {"code": "NOT FOUND", "message": str(error)}, {}
+    if isinstance(error, ValueError):
+        return 400, {"code": "BAD REQUEST", "message": str(error)}, {}
+    if isinstance(error, ConnectionError):
+        return 503, {"code": "SERVICE UNAVAILABLE", "message": str(error)}, {}
+    return 500, {"code": "INTERNAL SERVER ERROR", "message": str(error)}, {}
@@ -0,0 +1,246 @@
+"""Compact half-edge mesh, produced by the triangulation engines."""
+
+from array import array
+from collections.abc import Iterable, Iterator
+
+from .pointset import PointSet
+from .triangles import Triangles
+
+
+class HalfEdgeMesh:
+    """A triangle mesh stored as half-edges in typed arrays.
+
+    Triangle ``t`` is made of the half-edges ``3 * t``, ``3 * t + 1`` and ``3 * t + 2``, so the next and previous
+    half-edges around a triangle are computed rather than stored. Half-edge ``e`` starts at vertex ``vertices[e]``
+    and ends at the start of the next one, and ``twins[e]`` is the half-edge going the other way in the adjacent
+    triangle, or -1 on the boundary. Triangles are clockwise. This takes 24 bytes per triangle.
+
+    Args:
+        vertices (Iterable[int]): The start vertex of each half-edge, three per triangle.
+        twins (Iterable[int] | None, optional): The twin of each half-edge. Defaults to None, to find them from
+            the vertices on first access, so a mesh only exported with `to_triangles` never pays for it.
+
+    Raises:
+        ValueError: If the number of half-edges is not a multiple of 3, or does not match the number of twins.
+
+    """
+
+    def __init__(self, vertices: Iterable[int], twins: Iterable[int] | None = None) -> None:
+        """Initialize the mesh."""
+        self.vertices = vertices if isinstance(vertices, array) and vertices.typecode == 'I' else array('I', vertices)
+        if len(self.vertices) % 3:
+            raise ValueError("The number of half-edges must be a multiple of 3.")
+        self._twins: array | None = None
+        if twins is not None:
+            self._twins = twins if isinstance(twins, array) and twins.typecode == 'i' else array('i', twins)
+            if len(self._twins) != len(self.vertices):
+                raise ValueError("There must be one twin per half-edge.")
+        self._outgoing: array | None = None
+
+    @property
+    def twins(self) -> array:
+        """The twin of each half-edge, -1 on the boundary, found from the vertices on first access if they were not given."""
+        if self._twins is None:
+            self._twins = array('i', self._find_twins())
+        return self._twins
+
+    @classmethod
+    def from_triangles(cls, triangles: Iterable[tuple[int, int, int]]) -> 'HalfEdgeMesh':
+        """Build a mesh from clockwise triangles.
+
+        Args:
+            triangles (Iterable[tuple[int, int, int]]): The vertex indices of each triangle.
+
+        Returns:
+            HalfEdgeMesh: The mesh, with its triangles in the same order.
+
+        """
+        vertices = array('I')
+        for triangle in triangles:
+            vertices.extend(triangle)
+        return cls(vertices)
+
+    def _find_twins(self) -> list[int]:
+        """Match the half-edges going in opposite directions between the same vertices.
+
+        Returns:
+            list[int]: The twin of each half-edge, -1 on the boundary.
+
+        """
+        vertices = self.vertices
+        starts = {(vertices[e], vertices[self.next(e)]): e for e in range(len(vertices))}
+        return [starts.get((vertices[self.next(e)], vertices[e]), -1) for e in range(len(vertices))]
+
+    @staticmethod
+    def next(e: int) -> int:
+        """Return the half-edge following e around its triangle."""
+        return e - 2 if e % 3 == 2 else e + 1
+
+    @staticmethod
+    def prev(e: int) -> int:
+        """Return the half-edge preceding e around its triangle."""
+        return e + 2 if e % 3 == 0 else e - 1
+
+    def origin(self, e: int) -> int:
+        """Return the vertex half-edge e starts from."""
+        return self.vertices[e]
+
+    def destination(self, e: int) -> int:
+        """Return the vertex half-edge e ends at."""
+        return self.vertices[self.next(e)]
+
+    def nb_triangles(self) -> int:
+        """Return the number of triangles in the mesh.
+
+        Returns:
+            int: The number of triangles in the mesh.
+
+        """
+        return len(self.vertices) // 3
+
+    def __len__(self) -> int:
+        """Return the number of triangles in the mesh.
+
+        Returns:
+            int: The number of triangles in the mesh.
+
+        """
+        return self.nb_triangles()
+
+    def triangle(self, t: int) -> tuple[int, int, int]:
+        """Return the vertices of triangle t.
+
+        Raises:
+            IndexError: If the index is out of bounds.
+
+        Returns:
+            tuple[int, int, int]: The vertex indices, clockwise.
+
+        """
+        vertices = self.vertices
+        return vertices[3 * t], vertices[3 * t + 1], vertices[3 * t + 2]
+
+    def __iter__(self) -> Iterator[tuple[int, int, int]]:
+        """Return an iterator over the triangles.
+
+        Returns:
+            Iterator[tuple[int, int, int]]: The vertex indices of each triangle, clockwise.
+
+        """
+        vertices = self.vertices
+        for e in range(0, len(vertices), 3):
+            yield vertices[e], vertices[e + 1], vertices[e + 2]
+
+    def neighbours(self, t: int) -> tuple[int, int, int]:
+        """Return the triangles adjacent to triangle t.
+
+        Returns:
+            tuple[int, int, int]: The triangle across each edge of t, in the order of its half-edges, -1 on the boundary.
+
+        """
+        a, b, c = self.twins[3 * t:3 * t + 3]
+        return a // 3 if a != -1 else -1, b // 3 if b != -1 else -1, c // 3 if c != -1 else -1
+
+    def _outgoing_edges(self) -> array:
+        """Return a half-edge starting from each vertex, on the boundary when the vertex is on it (-1 for unused vertices)."""
+        if self._outgoing is None:
+            vertices, twins = self.vertices, self.twins
+            outgoing = array('i', [-1]) * (max(vertices, default=-1) + 1)
+            for e in range(len(vertices)):
+                v = vertices[e]
+                if outgoing[v] == -1 or twins[e] == -1:
+                    outgoing[v] = e
+            self._outgoing = outgoing
+        return self._outgoing
+
+    def one_ring(self, v: int) -> list[int]:
+        """Return the vertices adjacent to vertex v, in order around it.
+
+        For a vertex on the boundary, the ring starts and ends with its two boundary neighbours.
+
+        Returns:
+            list[int]: The adjacent vertices, empty if v is not in any triangle.
+
+        """
+        outgoing = self._outgoing_edges()
+        if v >= len(outgoing) or outgoing[v] == -1:
+            return []
+        vertices, twins = self.vertices, self.twins
+        start = e = outgoing[v]
+        ring = []
+        while True:
+            ring.append(vertices[self.next(e)])
+            incoming = self.prev(e)
+            e = twins[incoming]
+            if e == -1:
+                ring.append(vertices[incoming])
+                return ring
+            if e == start:
+                return ring
+
+    def boundary(self) -> list[int]:
+        """Return the boundary half-edges, in order along each boundary loop, one loop after the other.
+
+        The next boundary half-edge is found by turning around the vertex the current one ends at, so the walk
+        stays in the same fan of triangles at a vertex where several boundary loops touch.
+
+        Returns:
+            list[int]: The half-edges without a twin. Within a loop, each one starts where the previous one ends.
+                Empty if the mesh has no triangles.
+
+        """
+        twins = self.twins
+        edges = []
+        visited = bytearray(len(twins))
+        for start in range(len(twins)):
+            if twins[start] != -1 or visited[start]:
+                continue
+            e = start
+            while not visited[e]:
+                visited[e] = 1
+                edges.append(e)
+                e = self.next(e)
+                while twins[e] != -1:
+                    e = self.next(twins[e])
+        return edges
+
+    def to_triangles(self, points: PointSet) -> Triangles:
+        """Export the mesh to a Triangles object.
+
+        Args:
+            points (PointSet): The points the vertices of the mesh refer to.
+
+        Returns:
+            Triangles: The points, shared with the caller, and the triangles in canonical order (see `_canonical`).
+
+        """
+        indices = array('I')
+        for triangle in _canonical(self):
+            indices.extend(triangle)
+        # The engines only produce valid triangles, over the points they were given
+        return Triangles._from_trusted(points, indices)
+
+
+def _canonical(triangles: Iterable[tuple[int, int, int]]) -> list[tuple[int, int, int]]:
+    """Put triangles in canonical form, independent of how they were produced.
+
+    Each triangle is rotated to start at its smallest index, keeping its orientation,
+    and the triangles are sorted by their indices.
+
+    Args:
+        triangles (Iterable[tuple[int, int, int]]): The triangles to normalize.
+
+    Returns:
+        list[tuple[int, int, int]]: The normalized triangles.
+
+    """
+    result = []
+    for a, b, c in triangles:
+        if a < b and a < c:
+            result.append((a, b, c))
+        elif b < c:
+            result.append((b, c, a))
+        else:
+            result.append((c, a, b))
+    result.sort()
+    return result
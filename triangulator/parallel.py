@@ -0,0 +1,93 @@
+"""Multi-core divide-and-conquer Delaunay triangulation."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .divide_and_conquer import _delaunay, _faces, _merge, _QuadEdges, divide_and_conquer
+from .mesh import HalfEdgeMesh
+
+# Smaller strips cost more in process start-up and transfers than they save
+MIN_PARTITION_SIZE = 5000
+
+
+def parallel_divide_and_conquer(xs: list[float], ys: list[float], workers: int | None = None, min_partition_size: int = MIN_PARTITION_SIZE) -> HalfEdgeMesh:
+    """Compute the Delaunay triangulation of distinct points with the Guibas-Stolfi algorithm, on several cores.
+
+    Points are sorted by x, then y, and split into vertical strips exactly where the recursion of
+    `divide_and_conquer` splits them. Each strip is triangulated in a worker process, then the strips are
+    stitched along their seams by the same merge steps as the recursion, so the triangles are the same
+    as with `divide_and_conquer`.
+
+    Args:
+        xs (list[float]): x coordinates of the points.
+        ys (list[float]): y coordinates of the points.
+        workers (int | None, optional): Number of worker processes. Defaults to None, for one per CPU.
+        min_partition_size (int, optional): Minimum number of points in a strip. Fewer strips than workers are used
+            when needed, down to a single one, triangulated in this process. Defaults to MIN_PARTITION_SIZE.
+
+    Raises:
+        ValueError: If workers or min_partition_size is not positive.
+
+    Returns:
+        HalfEdgeMesh: The clockwise triangles, covering the convex hull of the points.
+
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("The number of workers must be positive.")
+    if min_partition_size < 1:
+        raise ValueError("The minimum partition size must be positive.")
+    n = len(xs)
+
+    # Each level of the recursion halves the strips
+    depth = 0
+    while 1 << depth < workers and n >> (depth + 1) >= max(min_partition_size, 2):
+        depth += 1
+    if depth == 0:
+        return divide_and_conquer(xs, ys)
+
+    vertices = sorted(range(n), key=lambda i: (xs[i], ys[i]))
+    strips = _strips(0, n, depth)
+    with ProcessPoolExecutor(max_workers=min(workers, len(strips))) as pool:
+        futures = [pool.submit(_triangulate_strip, [xs[i] for i in vertices[lo:hi]], [ys[i] for i in vertices[lo:hi]]) for lo, hi in strips]
+        results = [future.result() for future in futures]
+
+    # Gather the strips in one structure, with global edge and vertex numbers
+    edges = _QuadEdges(xs, ys)
+    hulls = []
+    for (lo, _), (onext, origin, alive, (ldo, rdo)) in zip(strips, results, strict=True):
+        offset = len(edges.onext)
+        edges.onext += [e + offset for e in onext]
+        edges.origin += [vertices[lo + v] if v != -1 else -1 for v in origin]
+        edges.alive += alive
+        hulls.append((ldo + offset, rdo + offset))
+    while len(hulls) > 1:
+        hulls = [_merge(edges, hulls[i], hulls[i + 1]) for i in range(0, len(hulls), 2)]
+    return _faces(edges)
+
+
+def _strips(lo: int, hi: int, depth: int) -> list[tuple[int, int]]:
+    """Split the range lo:hi like `_delaunay` does, depth levels deep.
+
+    Returns:
+        list[tuple[int, int]]: The ranges of the strips, from left to right.
+
+    """
+    if depth == 0:
+        return [(lo, hi)]
+    mid = lo + (hi - lo) // 2
+    return _strips(lo, mid, depth - 1) + _strips(mid, hi, depth - 1)
+
+
+def _triangulate_strip(xs: list[float], ys: list[float]) -> tuple[list[int], list[int], list[bool], tuple[int, int]]:
+    """Triangulate a strip of points, already sorted by x then y, in a worker process.
+
+    Returns:
+        tuple[list[int], list[int], list[bool], tuple[int, int]]: The lists of the quad-edge structure,
+            with vertices numbered in the strip, and the hull edges returned by `_delaunay`.
+
+    """
+    edges = _QuadEdges(xs, ys)
+    hull = _delaunay(edges, list(range(len(xs))), 0, len(xs))
+    return edges.onext, edges.origin, edges.alive, hull
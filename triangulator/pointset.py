@@ -1,20 +1,55 @@
 """"Module for managing a set of 2D points."""
 
-from collections.abc import Iterable, Iterator
-from struct import calcsize, pack, unpack
+import hashlib
+import mmap
+import os
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from math import inf, isinf
+from struct import calcsize, pack, unpack_from
+from typing import BinaryIO
 
 from .data_types import Point as _Point
 
 type Point = tuple[float, float] | _Point
+
+# Number of items (points, or triangles) serialized per chunk by iter_bytes and write_to
+CHUNK_SIZE = 65536
+
+
 class PointSet:
-    """A set of 2D points."""
+    """A set of 2D points.
+
+    Coordinates are stored in two contiguous arrays of floats, 16 bytes per point,
+    and Point objects are only created when points are read.
+    A hash index from coordinates to index is built when first needed, so duplicates are detected in constant time.
+    A PointSet can also be read from a memory-mapped file (see `open_mmap`), in which case it is read-only.
+
+    Raises:
+        ValueError: If the same point is given twice.
+
+    """
     
     def __init__(self, points : Iterable[Point] | None = None) -> None:
         """Initialize the PointSet."""
-        self.__points : list[_Point] = []
+        self.__xs = array('d')
+        self.__ys = array('d')
+        self.__index : dict[tuple[float, float], int] | None = {}
         if points is not None:
             for point in points:
                 self.add_point(point)
+
+    def __get_index(self) -> dict[tuple[float, float], int]:
+        """Return the index from coordinates to point index, building it if needed."""
+        if self.__index is None:
+            self.__index = {key: i for i, key in enumerate(zip(self.__xs, self.__ys, strict=True))}
+        return self.__index
+
+    def __check_writable(self) -> None:
+        """Raise TypeError if the PointSet is memory-mapped."""
+        if not isinstance(self.__xs, array):
+            raise TypeError("A memory-mapped PointSet is read-only.")
     
     def add_point(self, point : Point) -> int:
         """Add a point to the set.
@@ -24,31 +59,58 @@ class PointSet:
 
         Raises:
             ValueError: If the point already exists in the set.
+            TypeError: If the PointSet is memory-mapped.
 
         Returns:
             int: The index of the added point.
 
         """
-        if isinstance(point, tuple):
-            point = _Point(*point)
-        if point in self.__points:
+        self.__check_writable()
+        key = _coordinates(point)
+        index = self.__get_index()
+        if key in index:
             raise ValueError("Point already exists in the set.")
-        self.__points.append(point)
-        return len(self.__points) - 1
+        index[key] = len(self.__xs)
+        self.__xs.append(key[0])
+        self.__ys.append(key[1])
+        return len(self.__xs) - 1
     
     def remove_point(self, point : Point) -> None:
         """Remove a point from the set.
 
+        The points after it move down by one index.
+
         Args:
             point (Point): The point to remove.
 
         Raises:
             ValueError: If the point does not exist in the set.
+            TypeError: If the PointSet is memory-mapped.
+
+        """
+        self.__check_writable()
+        index = self.__get_index().pop(_coordinates(point), None)
+        if index is None:
+            raise ValueError("Point does not exist in the set.")
+        del self.__xs[index]
+        del self.__ys[index]
+        if index < len(self.__xs):
+            # The following points moved: rebuild the index when it is next needed
+            self.__index = None
+
+    def __contains__(self, point : object) -> bool:
+        """Check if a point is in the set.
+
+        Args:
+            point (object): The point to look for.
+
+        Returns:
+            bool: True if the point is in the set, False otherwise.
 
         """
-        if isinstance(point, tuple):
-            point = _Point(*point)
-        self.__points.remove(point)
+        if isinstance(point, _Point):
+            return (point.x, point.y) in self.__get_index()
+        return isinstance(point, tuple) and point in self.__get_index()
     
     def __iter__(self) -> Iterator[Point]:
         """Return an iterator over the points in the set.
@@ -57,7 +119,7 @@ class PointSet:
             Iterable[Point]: An iterator over the points in the set.
 
         """
-        return iter(self.__points)
+        return map(_Point, self.__xs, self.__ys)
     
     def nb_points(self) -> int:
         """Return the number of points in the set.
@@ -66,7 +128,7 @@ class PointSet:
             int: The number of points in the set.
 
         """
-        return len(self.__points)
+        return len(self.__xs)
     
     def __len__(self) -> int:
         """Return the number of points in the set.
@@ -90,7 +152,7 @@ class PointSet:
             Point: The point at the given index.
 
         """
-        return self.__points[index]
+        return _Point(self.__xs[index], self.__ys[index])
     
     def set_point(self, index: int, value: Point) -> None:
         """Set the point at the given index.
@@ -101,11 +163,45 @@ class PointSet:
 
         Raises:
             IndexError: If the index is out of bounds.
+            ValueError: If the point already exists in the set at another index.
+            TypeError: If the PointSet is memory-mapped.
+
+        """
+        self.__check_writable()
+        key = _coordinates(value)
+        index = range(len(self.__xs))[index]
+        lookup = self.__get_index()
+        if lookup.get(key, index) != index:
+            raise ValueError("Point already exists in the set.")
+        del lookup[(self.__xs[index], self.__ys[index])]
+        self.__xs[index], self.__ys[index] = key
+        lookup[key] = index
+
+    @property
+    def xs(self) -> Sequence[float]:
+        """Return the x coordinates of the points.
+
+        The array is the storage of the PointSet, shared without copying: it must not be modified.
+
+        Returns:
+            Sequence[float]: The x coordinates, as a contiguous array of floats,
+                or a read-only view decoding them from the file if the PointSet is memory-mapped.
+
+        """
+        return self.__xs
+
+    @property
+    def ys(self) -> Sequence[float]:
+        """Return the y coordinates of the points.
+
+        The array is the storage of the PointSet, shared without copying: it must not be modified.
+
+        Returns:
+            Sequence[float]: The y coordinates, as a contiguous array of floats,
+                or a read-only view decoding them from the file if the PointSet is memory-mapped.
 
         """
-        if isinstance(value, tuple):
-            value = _Point(*value)
-        self.__points[index] = value
+        return self.__ys
 
     def __eq__(self, other: object) -> bool:
         """Compare this PointSet with another PointSet for equality.
@@ -122,7 +218,7 @@ class PointSet:
         """
         if not isinstance(other, PointSet):
             raise TypeError("Can only compare PointSet with another PointSet.")
-        return self.__points == other.__points
+        return self.__xs == other.__xs and self.__ys == other.__ys
     
     def to_bytes(self) -> bytes:
         """Serialize the PointSet to bytes for transmission.
@@ -138,20 +234,107 @@ class PointSet:
             bytes: The serialized PointSet.
 
         """
-        data = pack('!L', len(self.__points))
-        for point in self.__points:
-            data += pack('!ff', point.x, point.y)
-        return data
+        return pack('!L', len(self.__xs)) + self.__pack(0, len(self.__xs))
+
+    def iter_bytes(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Serialize the PointSet in chunks, without building the whole payload.
+
+        Args:
+            chunk_size (int, optional): Number of points per chunk. Defaults to CHUNK_SIZE.
+
+        Returns:
+            Iterator[bytes]: The header, then the points by chunks. Joined, they are the output of `to_bytes`.
+
+        """
+        n = len(self.__xs)
+        yield pack('!L', n)
+        for start in range(0, n, chunk_size):
+            yield self.__pack(start, min(start + chunk_size, n))
+
+    def write_to(self, stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+        """Write the serialized PointSet to a binary file-like object, in chunks.
+
+        Args:
+            stream (BinaryIO): The object to write to.
+            chunk_size (int, optional): Number of points per chunk. Defaults to CHUNK_SIZE.
+
+        Returns:
+            int: The number of bytes written.
+
+        """
+        return _write_chunks(stream, self.iter_bytes(chunk_size))
+
+    def digest(self) -> bytes:
+        """Return a SHA-256 digest of the points, identifying the PointSet by its content.
+
+        The digest covers the coordinates at full precision, in order, so PointSets have the same digest
+        if and only if they are equal (barring hash collisions), whether they are in memory or memory-mapped.
+
+        Returns:
+            bytes: The 32-byte digest.
+
+        """
+        digest = hashlib.sha256(pack('!L', len(self.__xs)))
+        for column in (self.__xs, self.__ys):
+            for start in range(0, len(column), CHUNK_SIZE):
+                digest.update(_to_network_order(column[start:start + CHUNK_SIZE]))
+        return digest.digest()
+
+    def __pack(self, start: int, stop: int) -> bytes:
+        """Serialize the points start:stop, without the header."""
+        block = array('f', bytes(8 * (stop - start)))
+        block[0::2] = _to_float32(self.__xs[start:stop])
+        block[1::2] = _to_float32(self.__ys[start:stop])
+        return _to_network_order(block)
     
 
     @classmethod
-    def from_bytes_with_size(cls, data: bytes, nb_points) -> 'PointSet':
+    def from_coordinates(cls, xs: Sequence[float], ys: Sequence[float]) -> 'PointSet':
+        """Build a PointSet from its x and y coordinates, checking that the points are distinct in a single pass.
+
+        Args:
+            xs (Sequence[float]): The x coordinate of each point.
+            ys (Sequence[float]): The y coordinate of each point.
+
+        Raises:
+            ValueError: If xs and ys have different lengths.
+            ValueError: If the same point is given twice.
+
+        Returns:
+            PointSet: The PointSet, with the points in the given order.
+
+        """
+        if len(xs) != len(ys):
+            raise ValueError("There must be as many y coordinates as x coordinates.")
+        return cls.__from_columns(array('d', xs), array('d', ys))
+
+    @classmethod
+    def __from_columns(cls, xs: array, ys: array) -> 'PointSet':
+        """Build a PointSet that takes ownership of coordinate arrays of the same length.
+
+        The duplicate check uses a temporary set: the index is left to be built when first needed.
+
+        Raises:
+            ValueError: If the same point is given twice.
+
+        """
+        if len(set(zip(xs, ys, strict=True))) != len(xs):
+            raise ValueError("Point already exists in the set.")
+        pointset = cls()
+        pointset.__xs = xs
+        pointset.__ys = ys
+        pointset.__index = None
+        return pointset
+
+    @classmethod
+    def from_bytes_with_size(cls, data: bytes | memoryview, nb_points) -> 'PointSet':
         """Deserialize bytes to a PointSet object.
         
         Only handle the points data, nb_points must be provided.
+        The coordinates are decoded in one block, without copying the data.
 
         Args:
-            data (bytes): The bytes to deserialize.
+            data (bytes | memoryview): The bytes to deserialize.
             nb_points (int): The number of points to read from the data.
 
         Raises:
@@ -165,21 +348,16 @@ class PointSet:
         expected_size = nb_points * point_size
         if len(data) != expected_size:
             raise ValueError(f"Invalid data: size does not match number of points. (expected {expected_size}, got {len(data)})")
-        points = []
-        offset = 0
-        for _ in range(nb_points):
-            x, y = unpack('!ff', data[offset:offset + point_size])
-            points.append(_Point(x, y))
-            offset += point_size
-        return cls(points)
+        coordinates = _from_network_order('f', data)
+        return cls.__from_columns(array('d', coordinates[0::2]), array('d', coordinates[1::2]))
     
     
     @classmethod
-    def from_bytes(cls, data: bytes) -> 'PointSet':
+    def from_bytes(cls, data: bytes | memoryview) -> 'PointSet':
         """Deserialize bytes to a PointSet object.
 
         Args:
-            data (bytes): The bytes to deserialize.
+            data (bytes | memoryview): The bytes to deserialize.
 
         Raises:
             ValueError: If the data is invalid.
@@ -190,8 +368,44 @@ class PointSet:
         """
         if len(data) < 4:
             raise ValueError("Invalid data: too short to contain number of points.")
-        nb_points = unpack('!L', data[:4])[0]
-        return cls.from_bytes_with_size(data[4:], nb_points)
+        view = memoryview(data)
+        nb_points = unpack_from('!L', view)[0]
+        return cls.from_bytes_with_size(view[4:], nb_points)
+
+    @classmethod
+    def open_mmap(cls, path: str | os.PathLike) -> 'PointSet':
+        """Map a file holding a serialized PointSet (see `to_bytes`), without reading it.
+
+        Coordinates are decoded from the mapping when they are read, so memory use depends on the pages touched,
+        not on the size of the file. The PointSet is read-only, and is not checked for duplicates,
+        since that would read the whole file.
+
+        Args:
+            path (str | os.PathLike): The file to map.
+
+        Raises:
+            ValueError: If the size of the file does not match the number of points.
+
+        Returns:
+            PointSet: The read-only PointSet.
+
+        """
+        mapping = _map(path)
+        if len(mapping) < 4:
+            raise ValueError("Invalid data: too short to contain number of points.")
+        nb_points = unpack_from('!L', mapping)[0]
+        if len(mapping) != 4 + nb_points * calcsize('!ff'):
+            raise ValueError("Invalid data: size does not match number of points.")
+        return cls._from_mapping(mapping, 4, nb_points)
+
+    @classmethod
+    def _from_mapping(cls, mapping: mmap.mmap, offset: int, nb_points: int) -> 'PointSet':
+        """Build a read-only PointSet over the points serialized at offset in a mapping, without the header."""
+        pointset = cls()
+        pointset.__xs = _MappedArray(mapping, offset, nb_points, 'f', stride=2, result='d')
+        pointset.__ys = _MappedArray(mapping, offset + 4, nb_points, 'f', stride=2, result='d')
+        pointset.__index = None
+        return pointset
 
     def __repr__(self) -> str:
         """Return a string representation of the PointSet.
@@ -200,4 +414,131 @@ class PointSet:
             str: A string representation of the PointSet.
 
         """
-        return f"PointSet({self.__points})"
+        return f"PointSet({list(self)})"
+
+
+def _coordinates(point: Point) -> tuple[float, float]:
+    """Return the coordinates of a point given as a Point or a tuple."""
+    if isinstance(point, tuple):
+        x, y = point
+        return x, y
+    return point.x, point.y
+
+
+def _to_float32(values: array) -> array:
+    """Convert doubles to single precision floats, like struct does.
+
+    Raises:
+        OverflowError: If a finite value is too large for a float.
+
+    """
+    converted = array('f', values)
+    if (inf in converted or -inf in converted) and any(isinf(f) and not isinf(v) for f, v in zip(converted, values, strict=True)):
+        raise OverflowError("float too large to pack with f format")
+    return converted
+
+
+def _to_network_order(block: array) -> bytes:
+    """Return the bytes of a typed array in big-endian order, as struct's '!' formats write them.
+
+    The array is byte-swapped in place on little-endian machines: pass a copy.
+    """
+    if sys.byteorder == 'little':
+        block.byteswap()
+    return block.tobytes()
+
+
+class _MappedArray(Sequence):
+    """Read-only sequence of big-endian values in a memory-mapped file, decoded when they are read.
+
+    Args:
+        mapping (mmap.mmap): The mapped file.
+        offset (int): The position of the first value in the file, in bytes.
+        length (int): The number of values in the sequence.
+        typecode (str): The type of the values in the file, as an array typecode.
+        stride (int, optional): The number of values of the file from one item to the next. Defaults to 1.
+        result (str | None, optional): The typecode of the arrays returned by slices. Defaults to None, for typecode.
+
+    """
+
+    def __init__(self, mapping: mmap.mmap, offset: int, length: int, typecode: str, stride: int = 1, result: str | None = None) -> None:
+        """Initialize the view."""
+        self.__mapping = mapping
+        self.__offset = offset
+        self.__length = length
+        self.__typecode = typecode
+        self.__format = '!' + typecode
+        self.__stride = stride
+        self.__result = result or typecode
+        self.__step = stride * calcsize(self.__format)
+
+    def __len__(self) -> int:
+        """Return the number of values."""
+        return self.__length
+
+    def __getitem__(self, index: int | slice) -> float | array:
+        """Return a value, or an array of values for a slice, like an array does."""
+        if isinstance(index, slice):
+            indices = range(self.__length)[index]
+            if not indices:
+                return array(self.__result)
+            lo, hi = min(indices[0], indices[-1]), max(indices[0], indices[-1]) + 1
+            return self.__decode(lo, hi)[indices[0] - lo::indices.step]
+        index = range(self.__length)[index]
+        return unpack_from(self.__format, self.__mapping, self.__offset + index * self.__step)[0]
+
+    def __decode(self, start: int, stop: int) -> array:
+        """Decode the values start:stop, for 0 <= start < stop <= len(self)."""
+        begin = self.__offset + start * self.__step
+        end = self.__offset + (stop - 1) * self.__step + calcsize(self.__format)
+        block = _from_network_order(self.__typecode, memoryview(self.__mapping)[begin:end])[::self.__stride]
+        return block if self.__result == self.__typecode else array(self.__result, block)
+
+    def __iter__(self) -> Iterator:
+        """Iterate over the values, decoding them by chunks."""
+        for start in range(0, self.__length, CHUNK_SIZE):
+            yield from self[start:start + CHUNK_SIZE]
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the values with those of an array or another view."""
+        if not isinstance(other, (array, _MappedArray)):
+            return NotImplemented
+        return len(self) == len(other) and self[:] == other[:]
+
+    def tolist(self) -> list:
+        """Return the values in a list."""
+        return self[:].tolist()
+
+
+def _map(path: str | os.PathLike) -> mmap.mmap:
+    """Map a file in memory, read-only."""
+    with open(path, 'rb') as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _from_network_order(typecode: str, data: bytes | memoryview) -> array:
+    """Decode a block of big-endian values, as struct's '!' formats read them, into a typed array.
+
+    Raises:
+        ValueError: If the size of the data is not a multiple of the size of the values.
+
+    """
+    block = array(typecode)
+    block.frombytes(data)
+    if sys.byteorder == 'little':
+        block.byteswap()
+    return block
+
+
+def _write_chunks(stream: BinaryIO, chunks: Iterable[bytes]) -> int:
+    """Write chunks of bytes to a stream.
+
+    Returns:
+        int: The number of bytes written.
+
+    """
+    written = 0
+    for chunk in chunks:
+        stream.write(chunk)
+        written += len(chunk)
+    return written
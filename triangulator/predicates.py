@@ -0,0 +1,217 @@
+"""Geometric predicates shared by the triangulation engines.
+
+The predicates are filtered: they are evaluated in floating point first, and the result is trusted when it is
+larger than a bound on the rounding error (as in Shewchuk's "Adaptive Precision Floating-Point Arithmetic and
+Fast Robust Geometric Predicates"). Only the undecided cases are evaluated again with exact integer arithmetic,
+so the signs are exact (barring underflow, as in the paper) and near-degenerate inputs get consistent answers.
+
+The batched variants evaluate a predicate over whole arrays of candidates at once.
+They require NumPy, an optional dependency (``pip install triangulator[fast]``): check HAS_NUMPY before using them.
+"""
+
+from math import frexp, inf, ldexp, ulp
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Below this many candidates, the scalar predicates are faster than a NumPy round-trip
+BATCH_MIN_SIZE = 64
+
+# Relative error bounds of the floating-point evaluations, from Shewchuk's paper
+_MANTISSA_BITS = 53
+_EPSILON = ulp(1.0) / 2
+_ORIENTATION_BOUND = (3 + 16 * _EPSILON) * _EPSILON
+# The in-circle filter bounds Shewchuk's permanent by alift * blift + blift * clift + clift * alift
+# (Cauchy-Schwarz, then AM-GM), which needs no absolute values. The extra epsilon covers the rounding of that sum.
+_IN_CIRCLE_BOUND = (11 + 96 * _EPSILON) * _EPSILON
+
+
+def orientation(x0: float, y0: float, x1: float, y1: float, x2: float, y2: float) -> float:
+    """Return twice the signed area of the triangle (x0, y0), (x1, y1), (x2, y2).
+
+    The sign is exact, the magnitude is approximate.
+
+    Returns:
+        float: Positive if the triangle is counter-clockwise, negative if clockwise, 0 if the points are collinear.
+
+    """
+    left = (x1 - x0) * (y2 - y0)
+    right = (y1 - y0) * (x2 - x0)
+    det = left - right
+    if abs(det) > _ORIENTATION_BOUND * (abs(left) + abs(right)) or left == right == 0:
+        return det
+    return _orientation_exact(x0, y0, x1, y1, x2, y2)
+
+
+def _orientation_exact(x0: float, y0: float, x1: float, y1: float, x2: float, y2: float) -> float:
+    """Compute `orientation` with exact integer arithmetic.
+
+    Returns:
+        float: The determinant, rounded to a float of the same sign.
+
+    """
+    (x0, y0, x1, y1, x2, y2), exponent = _to_integers((x0, y0, x1, y1, x2, y2))
+    det = (x1 - x0) * (y2 - y0) - (y1 - y0) * (x2 - x0)
+    return _to_float(det, 2 * exponent)
+
+
+def in_circle_det(x0: float, y0: float, x1: float, y1: float, x2: float, y2: float, px: float, py: float) -> float:
+    """Return the in-circle determinant of (px, py) and the triangle (x0, y0), (x1, y1), (x2, y2).
+
+    Cheaper than `in_circle` when the orientation of the triangle is known.
+    The sign is exact, the magnitude is approximate.
+
+    Returns:
+        float: Positive if the point is strictly inside the circumcircle of a counter-clockwise triangle
+            (or strictly outside that of a clockwise triangle), negative in the opposite case, 0 if it is on the circle.
+
+    """
+    # Translate point to origin
+    ax = x0 - px
+    ay = y0 - py
+    bx = x1 - px
+    by = y1 - py
+    cx = x2 - px
+    cy = y2 - py
+
+    alift = ax * ax + ay * ay
+    blift = bx * bx + by * by
+    clift = cx * cx + cy * cy
+
+    # Calculate the determinant
+    det = alift * (bx * cy - cx * by) + blift * (cx * ay - ax * cy) + clift * (ax * by - bx * ay)
+    bound = _IN_CIRCLE_BOUND * (alift * blift + blift * clift + clift * alift)
+    if det > bound or -det > bound:
+        return det
+    return _in_circle_exact(x0, y0, x1, y1, x2, y2, px, py)
+
+
+def _in_circle_exact(x0: float, y0: float, x1: float, y1: float, x2: float, y2: float, px: float, py: float) -> float:
+    """Compute `in_circle_det` with exact integer arithmetic.
+
+    Returns:
+        float: The determinant, rounded to a float of the same sign.
+
+    """
+    (x0, y0, x1, y1, x2, y2, px, py), exponent = _to_integers((x0, y0, x1, y1, x2, y2, px, py))
+    ax, ay = x0 - px, y0 - py
+    bx, by = x1 - px, y1 - py
+    cx, cy = x2 - px, y2 - py
+    det = (ax * ax + ay * ay) * (bx * cy - cx * by) + \
+          (bx * bx + by * by) * (cx * ay - ax * cy) + \
+          (cx * cx + cy * cy) * (ax * by - bx * ay)
+    return _to_float(det, 4 * exponent)
+
+
+def _to_integers(values: tuple[float, ...]) -> tuple[list[int], int]:
+    """Write floats as integers sharing a power of two, so sums and products of them are exact.
+
+    Returns:
+        tuple[list[int], int]: The integers, and the exponent e such that each value is its integer times 2**e.
+
+    """
+    parts = [frexp(value) for value in values]
+    exponent = min(e for _, e in parts) - _MANTISSA_BITS
+    return [int(ldexp(m, _MANTISSA_BITS)) << (e - _MANTISSA_BITS - exponent) for m, e in parts], exponent
+
+
+def _to_float(value: int, exponent: int) -> float:
+    """Round value * 2**exponent to a float, without letting a non-zero value underflow to 0.
+
+    Returns:
+        float: The rounded value, infinite if it overflows.
+
+    """
+    if value == 0:
+        return 0.0
+    magnitude = abs(value)
+    dropped = max(magnitude.bit_length() - 2 * _MANTISSA_BITS, 0)
+    try:
+        result = ldexp(float(magnitude >> dropped), exponent + dropped) or 5e-324
+    except OverflowError:
+        result = inf
+    return result if value > 0 else -result
+
+
+def in_circle(x0: float, y0: float, x1: float, y1: float, x2: float, y2: float, px: float, py: float) -> bool:
+    """Check if (px, py) is inside the circumcircle of the triangle (x0, y0), (x1, y1), (x2, y2).
+
+    The triangle can have either orientation.
+
+    Returns:
+        bool: True if the point is strictly inside the circumcircle, False otherwise.
+
+    """
+    det = in_circle_det(x0, y0, x1, y1, x2, y2, px, py)
+
+    # If triangle is clockwise, flip the determinant sign
+    if orientation(x0, y0, x1, y1, x2, y2) < 0:
+        det = -det
+
+    return det > 0
+
+
+def orientation_batch(x0: Any, y0: Any, x1: Any, y1: Any, x2: Any, y2: Any) -> Any:
+    """Compute `orientation` for arrays of triangles.
+
+    Each argument is an array of coordinates (or a scalar, broadcast to all triangles).
+    Candidates the floating-point filter cannot decide are evaluated one by one with `orientation`.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+
+    Returns:
+        numpy.ndarray: Twice the signed area of each triangle, with an exact sign.
+
+    """
+    if np is None:
+        raise ImportError("NumPy is required for batched predicates.")
+    x0, y0, x1, y1, x2, y2 = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=np.float64)) for v in (x0, y0, x1, y1, x2, y2)))
+    left = (x1 - x0) * (y2 - y0)
+    right = (y1 - y0) * (x2 - x0)
+    det = left - right
+    undecided = (np.abs(det) <= _ORIENTATION_BOUND * (np.abs(left) + np.abs(right))) & ((left != 0) | (right != 0))
+    for i in zip(*np.nonzero(undecided), strict=True):
+        det[i] = _orientation_exact(x0[i], y0[i], x1[i], y1[i], x2[i], y2[i])
+    return det
+
+
+def in_circle_batch(x0: Any, y0: Any, x1: Any, y1: Any, x2: Any, y2: Any, px: Any, py: Any) -> Any:
+    """Compute `in_circle` for arrays of triangles and points.
+
+    Each argument is an array of coordinates (or a scalar, broadcast to all candidates).
+    Candidates the floating-point filter cannot decide are evaluated one by one with exact arithmetic,
+    so the answers are the same as `in_circle`.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+
+    Returns:
+        numpy.ndarray: A boolean array, True where the point is strictly inside the circumcircle.
+
+    """
+    if np is None:
+        raise ImportError("NumPy is required for batched predicates.")
+    x0, y0, x1, y1, x2, y2, px, py = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=np.float64)) for v in (x0, y0, x1, y1, x2, y2, px, py)))
+    ax = x0 - px
+    ay = y0 - py
+    bx = x1 - px
+    by = y1 - py
+    cx = x2 - px
+    cy = y2 - py
+
+    alift = ax * ax + ay * ay
+    blift = bx * bx + by * by
+    clift = cx * cx + cy * cy
+
+    det = alift * (bx * cy - cx * by) + blift * (cx * ay - ax * cy) + clift * (ax * by - bx * ay)
+    undecided = np.abs(det) <= _IN_CIRCLE_BOUND * (alift * blift + blift * clift + clift * alift)
+    for i in zip(*np.nonzero(undecided), strict=True):
+        det[i] = _in_circle_exact(x0[i], y0[i], x1[i], y1[i], x2[i], y2[i], px[i], py[i])
+    det = np.where(orientation_batch(x0, y0, x1, y1, x2, y2) < 0, -det, det)
+    return det > 0
@@ -0,0 +1,118 @@
+"""Coalescing of concurrent identical computations."""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from functools import partial
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Run one computation per key at a time, sharing its outcome with the concurrent callers of the same key.
+
+    A key is only in flight while its computation runs: a call made after it ended starts a new one.
+    The computations of `do` and `join` are in flight in the same table, so each joins the other's.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no computation in flight."""
+        self.__flights: dict[str, Future] = {}
+        self.__tasks: dict[str, asyncio.Future] = {}
+        self.__lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key: str, function: Callable[[], T]) -> T:
+        """Call a function, or wait for the computation in flight for the same key.
+
+        Args:
+            key (str): The key identifying the computation.
+            function (Callable[[], T]): The computation, called if none is in flight for the key.
+
+        Raises:
+            BaseException: The exception raised by the computation, in every caller sharing it.
+
+        Returns:
+            T: The result of the computation.
+
+        """
+        with self.__lock:
+            flight = self.__flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.__flights[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            return flight.result()
+        try:
+            result = function()
+        except BaseException as e:
+            self.__forget(key, flight)
+            flight.set_exception(e)
+            raise
+        self.__forget(key, flight)
+        flight.set_result(result)
+        return result
+
+    def join(self, key: str, start: Callable[[], 'Future[T]']) -> tuple['Future[T]', bool]:
+        """Start a computation running elsewhere, like a job submitted to a pool, or join the one in flight for the same key.
+
+        Args:
+            key (str): The key identifying the computation.
+            start (Callable[[], Future[T]]): A function starting the computation, called if none is in flight for the key.
+                It is called with a lock held, so it must return at once. Nothing is in flight if it raises.
+
+        Returns:
+            tuple[Future[T], bool]: The outcome of the computation, and whether this call started it.
+
+        """
+        with self.__lock:
+            flight = self.__flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.__flights[key] = start()
+            else:
+                self.shared += 1
+        if leader:
+            # Outside of the lock, as the callback runs at once if the computation is already over
+            flight.add_done_callback(partial(self.__forget, key))
+        return flight, leader
+
+    def __forget(self, key: str, flight: Future) -> None:
+        """Remove a finished computation from the ones in flight, unless another one replaced it."""
+        with self.__lock:
+            if self.__flights.get(key) is flight:
+                del self.__flights[key]
+
+    async def do_async(self, key: str, function: Callable[[], Awaitable[T]]) -> T:
+        """Await a coroutine function, or the call in flight for the same key, without blocking the event loop.
+
+        Calls are shared by the tasks of one event loop, separately from the calls of `do`.
+        A caller that is cancelled does not cancel the call shared with the others.
+
+        Args:
+            key (str): The key identifying the computation.
+            function (Callable[[], Awaitable[T]]): The computation, called if none is in flight for the key.
+
+        Raises:
+            BaseException: The exception raised by the computation, in every caller sharing it.
+
+        Returns:
+            T: The result of the computation.
+
+        """
+        task = self.__tasks.get(key)
+        if task is None:
+            task = self.__tasks[key] = asyncio.ensure_future(function())
+            task.add_done_callback(partial(self.__forget_task, key))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def __forget_task(self, key: str, task: asyncio.Future) -> None:
+        """Remove a finished call from the ones in flight, unless another one replaced it."""
+        if self.__tasks.get(key) is task:
+            del self.__tasks[key]
@@ -0,0 +1,88 @@
+"""Spatially coherent insertion orders for incremental triangulation."""
+
+from collections.abc import Sequence
+from random import Random
+
+HILBERT_BITS = 16
+
+
+def hilbert_keys(xs: Sequence[float], ys: Sequence[float], bits: int = HILBERT_BITS) -> list[int]:
+    """Compute the position of each point along a Hilbert curve covering their bounding box.
+
+    Args:
+        xs (Sequence[float]): x coordinates of the points.
+        ys (Sequence[float]): y coordinates of the points.
+        bits (int, optional): Resolution of the curve, in bits per axis. Defaults to HILBERT_BITS.
+
+    Returns:
+        list[int]: The Hilbert index of each point.
+
+    """
+    if not xs:
+        return []
+    min_x, min_y = min(xs), min(ys)
+    span = max(max(xs) - min_x, max(ys) - min_y)
+    side = 1 << bits
+    scale = (side - 1) / span if span > 0 else 0.0
+    keys = []
+    for x, y in zip(xs, ys, strict=True):
+        qx = int((x - min_x) * scale)
+        qy = int((y - min_y) * scale)
+        key = 0
+        s = side >> 1
+        while s:
+            rx = 1 if qx & s else 0
+            ry = 1 if qy & s else 0
+            key += s * s * ((3 * rx) ^ ry)
+            # Rotate the quadrant so the curve stays continuous
+            if ry == 0:
+                if rx == 1:
+                    qx = side - 1 - qx
+                    qy = side - 1 - qy
+                qx, qy = qy, qx
+            s >>= 1
+        keys.append(key)
+    return keys
+
+
+def hilbert_order(xs: Sequence[float], ys: Sequence[float]) -> list[int]:
+    """Return the point indices sorted along a Hilbert curve.
+
+    Args:
+        xs (Sequence[float]): x coordinates of the points.
+        ys (Sequence[float]): y coordinates of the points.
+
+    Returns:
+        list[int]: A permutation of the point indices.
+
+    """
+    keys = hilbert_keys(xs, ys)
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
+def brio_order(xs: Sequence[float], ys: Sequence[float], seed: int = 0) -> list[int]:
+    """Return the point indices in biased randomized insertion order (BRIO).
+
+    Each point is put in the last round with probability 1/2, in the one before with probability 1/4, and so on.
+    Rounds are inserted from the smallest to the largest, each one sorted along a Hilbert curve.
+
+    Args:
+        xs (Sequence[float]): x coordinates of the points.
+        ys (Sequence[float]): y coordinates of the points.
+        seed (int, optional): Seed of the round assignment, so the order is reproducible. Defaults to 0.
+
+    Returns:
+        list[int]: A permutation of the point indices.
+
+    """
+    keys = hilbert_keys(xs, ys)
+    n = len(keys)
+    last_round = max(n.bit_length() - 1, 0)
+    rng = Random(seed)
+    rounds = []
+    for _ in range(n):
+        r = last_round
+        while r > 0 and rng.random() < 0.5:
+            r -= 1
+        rounds.append(r)
+    return sorted(range(n), key=lambda i: (rounds[i], keys[i]))
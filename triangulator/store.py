@@ -0,0 +1,337 @@
+"""Persistent on-disk store of serialized triangulation results."""
+
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import BinaryIO
+
+from .PSM import RE_UUID
+
+# Default size of the store used by the triangulator, overridden by the environment variable TRIANGULATION_STORE_BYTES.
+# The store itself is only enabled when TRIANGULATION_STORE_DIR is set.
+DEFAULT_STORE_BYTES = 4 * 1024 * 1024 * 1024
+
+# Number of point set IDs whose result is not stored yet kept in memory, to be written along with it.
+# Past it, the oldest are forgotten: their point sets are retrieved again after a restart.
+MAX_PENDING_IDS = 65536
+
+RE_KEY = re.compile(r"^[0-9a-f]{64}$")
+_TEMPORARY_SUFFIX = ".tmp"
+_DIGEST_SIZE = 32
+
+
+class ResultStore:
+    """A store of serialized triangulations in a directory, which survives restarts.
+
+    Each result is a file of the ``results`` subdirectory, named by its key (the hex digest of its points,
+    see `PointSet.digest`), and the digest of each point set ID is a small file of the ``ids`` subdirectory.
+    Files are written under a temporary name and renamed once complete, so a crash never leaves a truncated
+    entry behind. When the results exceed max_bytes, the least recently used ones are deleted, recency being
+    the modification time of the files, updated on each hit. The sizes and recency of the results, and the IDs
+    pointing to each of them, are indexed in memory when the store is opened, so evictions do not scan the directory.
+    The digest of an ID is only written once its result is stored, so IDs of point sets that are never stored,
+    like invalid ones, leave nothing on disk.
+
+    Args:
+        directory (str | os.PathLike): The directory of the store, created if needed.
+        max_bytes (int): The maximum total size of the stored results, in bytes.
+
+    Raises:
+        ValueError: If max_bytes is negative.
+
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int) -> None:
+        """Open the store, and remove the temporary files left by an interrupted write."""
+        if max_bytes < 0:
+            raise ValueError("The store size must not be negative.")
+        self.max_bytes = max_bytes
+        self.__results = Path(directory) / "results"
+        self.__ids = Path(directory) / "ids"
+        self.__results.mkdir(parents=True, exist_ok=True)
+        self.__ids.mkdir(parents=True, exist_ok=True)
+        self.__lock = threading.Lock()
+        for folder in (self.__results, self.__ids):
+            for leftover in folder.glob("*" + _TEMPORARY_SUFFIX):
+                leftover.unlink(missing_ok=True)
+        # Size of each result by key, from the least to the most recently used, and their total
+        self.__sizes: OrderedDict[str, int] = OrderedDict()
+        for name, size, _ in sorted(self.__entries(), key=lambda entry: entry[2]):
+            self.__sizes[name] = size
+        self.__total = sum(self.__sizes.values())
+        # Key the digest of each ID points to, and the IDs pointing to each key
+        self.__keys: dict[str, str] = {}
+        self.__ids_of: dict[str, set[str]] = {}
+        for path in self.__ids.iterdir():
+            if RE_UUID.match(path.name):
+                with suppress(FileNotFoundError):
+                    key = path.read_bytes().hex()
+                    if key in self.__sizes:
+                        self.__index_id(path.name, key)
+                    else:
+                        # Left by a result that was evicted before being indexed
+                        path.unlink()
+        # Key of each ID whose result is not stored yet, from the oldest, and the IDs waiting for each key
+        self.__pending: OrderedDict[str, str] = OrderedDict()
+        self.__pending_of: dict[str, set[str]] = {}
+
+    @classmethod
+    def from_environment(cls) -> 'ResultStore | None':
+        """Open the store configured by the TRIANGULATION_STORE_DIR and TRIANGULATION_STORE_BYTES environment variables.
+
+        Raises:
+            ValueError: If TRIANGULATION_STORE_BYTES is not a valid number.
+
+        Returns:
+            ResultStore | None: The store, with DEFAULT_STORE_BYTES if the size is unset, or None if the directory is unset.
+
+        """
+        directory = os.getenv("TRIANGULATION_STORE_DIR")
+        if not directory:
+            return None
+        max_bytes = os.getenv("TRIANGULATION_STORE_BYTES")
+        return cls(directory, int(max_bytes) if max_bytes else DEFAULT_STORE_BYTES)
+
+    def open(self, key: str) -> BinaryIO | None:
+        """Open a stored result for reading, and mark it as the most recently used.
+
+        The open file stays readable even if the entry is evicted meanwhile.
+
+        Args:
+            key (str): The key of the result.
+
+        Raises:
+            ValueError: If the key is not a hex digest.
+
+        Returns:
+            BinaryIO | None: The file, positioned at the start of the result, or None if the result is not stored.
+
+        """
+        path = self.__results / _check_key(key)
+        try:
+            file = path.open("rb")
+        except FileNotFoundError:
+            return None
+        with suppress(FileNotFoundError):
+            os.utime(path)
+        with self.__lock:
+            if key in self.__sizes:
+                self.__sizes.move_to_end(key)
+        return file
+
+    def __contains__(self, key: object) -> bool:
+        """Check if a result is stored, without changing its recency.
+
+        Returns:
+            bool: True if the result is stored, False otherwise.
+
+        """
+        return isinstance(key, str) and RE_KEY.match(key) is not None and (self.__results / key).is_file()
+
+    def put(self, key: str, chunks: Iterable[bytes]) -> None:
+        """Store a result atomically, replacing any previous one, then evict results to stay within the size.
+
+        Args:
+            key (str): The key of the result.
+            chunks (Iterable[bytes]): The serialized result, in one or more chunks.
+
+        Raises:
+            ValueError: If the key is not a hex digest.
+
+        """
+        with self.writing(key) as file:
+            for chunk in chunks:
+                file.write(chunk)
+
+    @contextmanager
+    def writing(self, key: str) -> Iterator[BinaryIO]:
+        """Write a result through a temporary file, which becomes the entry only if the block completes.
+
+        If the block raises, or is a generator that is closed before the end, the temporary file is removed
+        and any previous entry is kept. So is it if the result is larger than the whole store.
+
+        Args:
+            key (str): The key of the result.
+
+        Raises:
+            ValueError: If the key is not a hex digest.
+
+        Returns:
+            Iterator[BinaryIO]: A context manager giving the file to write the result to.
+
+        """
+        path = self.__results / _check_key(key)
+        with self.__temporary(self.__results) as file:
+            yield file
+            if file.tell() > self.max_bytes:
+                return
+            _commit(file, path)
+        with self.__lock:
+            with suppress(FileNotFoundError):
+                size = path.stat().st_size
+                self.__total += size - self.__sizes.get(key, 0)
+                self.__sizes[key] = size
+                self.__sizes.move_to_end(key)
+            pending = self.__pending_of.pop(key, set())
+            for point_set_id in pending:
+                del self.__pending[point_set_id]
+            self.__evict()
+        for point_set_id in pending:
+            self.__write_id(point_set_id, key)
+
+    def digest_of(self, point_set_id: str) -> bytes | None:
+        """Return the digest stored for a point set ID.
+
+        Args:
+            point_set_id (str): The ID of the point set.
+
+        Returns:
+            bytes | None: The digest of the points of the point set, or None if it is unknown or the ID is malformed.
+
+        """
+        if not RE_UUID.match(point_set_id):
+            return None
+        try:
+            digest = (self.__ids / point_set_id).read_bytes()
+        except FileNotFoundError:
+            return None
+        return digest if len(digest) == _DIGEST_SIZE else None
+
+    def set_digest(self, point_set_id: str, digest: bytes) -> None:
+        """Store the digest of a point set ID atomically, once the result it points to is stored.
+
+        Until then, the ID is kept in memory, among the last MAX_PENDING_IDS ones. Nothing is written if the ID
+        already points to the same stored result.
+
+        Args:
+            point_set_id (str): The ID of the point set.
+            digest (bytes): The digest of its points.
+
+        Raises:
+            ValueError: If the ID is malformed, or the digest is not 32 bytes long.
+
+        """
+        if not RE_UUID.match(point_set_id):
+            raise ValueError(f"Malformed point set ID: {point_set_id}")
+        if len(digest) != _DIGEST_SIZE:
+            raise ValueError("A digest must be 32 bytes long.")
+        key = digest.hex()
+        with self.__lock:
+            self.__unpend_id(point_set_id)
+            if self.__keys.get(point_set_id) == key:
+                return
+            if key not in self.__sizes:
+                # A digest on disk for another result would outlive the change of the point set
+                if point_set_id in self.__keys:
+                    self.__unindex_id(point_set_id)
+                    (self.__ids / point_set_id).unlink(missing_ok=True)
+                self.__pending[point_set_id] = key
+                self.__pending_of.setdefault(key, set()).add(point_set_id)
+                if len(self.__pending) > MAX_PENDING_IDS:
+                    self.__unpend_id(next(iter(self.__pending)))
+                return
+        self.__write_id(point_set_id, key)
+
+    @property
+    def size(self) -> int:
+        """Return the total size of the stored results.
+
+        Returns:
+            int: The total size of the stored results, in bytes.
+
+        """
+        return self.__total
+
+    @contextmanager
+    def __temporary(self, folder: Path) -> Iterator[BinaryIO]:
+        """Create a temporary file in a folder of the store, removed unless it was renamed by the block."""
+        descriptor, name = tempfile.mkstemp(dir=folder, suffix=_TEMPORARY_SUFFIX)
+        os.close(descriptor)
+        try:
+            with open(name, "wb") as file:
+                yield file
+        finally:
+            with suppress(FileNotFoundError):
+                os.unlink(name)
+
+    def __entries(self) -> list[tuple[str, int, float]]:
+        """List the stored results on disk, with their key, size and last use."""
+        entries = []
+        for path in self.__results.iterdir():
+            if RE_KEY.match(path.name):
+                with suppress(FileNotFoundError):
+                    stat = path.stat()
+                    entries.append((path.name, stat.st_size, stat.st_mtime))
+        return entries
+
+    def __write_id(self, point_set_id: str, key: str) -> None:
+        """Write the digest of an ID, and index it unless its result was evicted meanwhile."""
+        path = self.__ids / point_set_id
+        with self.__temporary(self.__ids) as file:
+            file.write(bytes.fromhex(key))
+            _commit(file, path)
+        with self.__lock:
+            if key in self.__sizes:
+                self.__index_id(point_set_id, key)
+            else:
+                path.unlink(missing_ok=True)
+
+    def __index_id(self, point_set_id: str, key: str) -> None:
+        """Record the key the digest of an ID points to, in place of the previous one. Called with the lock held."""
+        self.__unindex_id(point_set_id)
+        self.__keys[point_set_id] = key
+        self.__ids_of.setdefault(key, set()).add(point_set_id)
+
+    def __unindex_id(self, point_set_id: str) -> None:
+        """Forget the key the digest of an ID points to, if any. Called with the lock held."""
+        previous = self.__keys.pop(point_set_id, None)
+        if previous is not None:
+            self.__ids_of[previous].discard(point_set_id)
+            if not self.__ids_of[previous]:
+                del self.__ids_of[previous]
+
+    def __unpend_id(self, point_set_id: str) -> None:
+        """Forget an ID waiting for its result to be stored, if it is. Called with the lock held."""
+        key = self.__pending.pop(point_set_id, None)
+        if key is not None:
+            self.__pending_of[key].discard(point_set_id)
+            if not self.__pending_of[key]:
+                del self.__pending_of[key]
+
+    def __evict(self) -> None:
+        """Delete the least recently used results until the store fits in max_bytes, and the IDs pointing to them.
+
+        Called with the lock held.
+        """
+        while self.__total > self.max_bytes:
+            key, size = self.__sizes.popitem(last=False)
+            (self.__results / key).unlink(missing_ok=True)
+            self.__total -= size
+            for point_set_id in self.__ids_of.pop(key, ()):
+                (self.__ids / point_set_id).unlink(missing_ok=True)
+                del self.__keys[point_set_id]
+
+
+def _commit(file: BinaryIO, path: Path) -> None:
+    """Flush a temporary file to disk, close it and move it to its final path, in one atomic step."""
+    file.flush()
+    os.fsync(file.fileno())
+    file.close()
+    os.replace(file.name, path)
+
+
+def _check_key(key: str) -> str:
+    """Return the key if it is a hex digest, safe to use as a file name.
+
+    Raises:
+        ValueError: If the key is not a hex digest.
+
+    """
+    if not RE_KEY.match(key):
+        raise ValueError(f"Malformed result key: {key}")
+    return key
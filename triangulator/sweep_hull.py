@@ -0,0 +1,346 @@
+"""Sweep-hull (s-hull) Delaunay triangulation.
+
+Points are added by increasing distance from a seed circumcircle. Each one only sees the current convex hull,
+which it extends with a fan of triangles, and Lawson edge flips restore the Delaunay property as triangles are created.
+As the distances are rounded, a point can end up on the hull or inside it (typically in nearly collinear sets):
+it then splits the triangle or the edge it lies on, found with the exact predicates, before the same flips.
+"""
+
+from array import array
+from math import ceil, inf, sqrt
+
+from .mesh import HalfEdgeMesh
+from .predicates import in_circle_det, orientation
+
+
+def sweep_hull(xs: list[float], ys: list[float]) -> HalfEdgeMesh:
+    """Compute the Delaunay triangulation of distinct points with the sweep-hull algorithm.
+
+    Args:
+        xs (list[float]): x coordinates of the points.
+        ys (list[float]): y coordinates of the points.
+
+    Returns:
+        HalfEdgeMesh: The clockwise triangles, covering the convex hull of the points.
+            Empty if there are fewer than 3 points or they are all collinear.
+
+    """
+    n = len(xs)
+    if n < 3:
+        return HalfEdgeMesh([])
+    seed = _seed_triangle(xs, ys)
+    if seed is None:
+        return HalfEdgeMesh([])
+    sweep = _Sweep(xs, ys, seed)
+    for i in sweep.order:
+        if i not in seed:
+            sweep.add(i)
+    return HalfEdgeMesh(array('I', sweep.triangles), array('i', sweep.halfedges))
+
+
+def _circumcircle(xs: list[float], ys: list[float], a: int, b: int, c: int) -> tuple[float, float, float]:
+    """Return the circumcenter and squared circumradius of triangle a, b, c (infinite if collinear)."""
+    dx, dy = xs[b] - xs[a], ys[b] - ys[a]
+    ex, ey = xs[c] - xs[a], ys[c] - ys[a]
+    cross = dx * ey - dy * ex
+    if cross == 0:
+        return inf, inf, inf
+    bl = dx * dx + dy * dy
+    cl = ex * ex + ey * ey
+    d = 0.5 / cross
+    x = (ey * bl - dy * cl) * d
+    y = (dx * cl - ex * bl) * d
+    return xs[a] + x, ys[a] + y, x * x + y * y
+
+
+def _seed_triangle(xs: list[float], ys: list[float]) -> tuple[int, int, int] | None:
+    """Pick a clockwise seed triangle near the center of the points, with the smallest circumcircle possible.
+
+    Returns:
+        tuple[int, int, int] | None: The seed triangle, or None if all points are collinear.
+
+    """
+    n = len(xs)
+    cx = (min(xs) + max(xs)) / 2
+    cy = (min(ys) + max(ys)) / 2
+    i0 = min(range(n), key=lambda i: (xs[i] - cx) ** 2 + (ys[i] - cy) ** 2)
+    x0, y0 = xs[i0], ys[i0]
+    i1 = min((i for i in range(n) if i != i0), key=lambda i: (xs[i] - x0) ** 2 + (ys[i] - y0) ** 2)
+    radius, i2 = min((_circumcircle(xs, ys, i0, i1, i)[2], i) for i in range(n) if i not in (i0, i1))
+    if radius == inf:
+        return None
+    if orientation(x0, y0, xs[i1], ys[i1], xs[i2], ys[i2]) > 0:
+        i1, i2 = i2, i1
+    return i0, i1, i2
+
+
+class _Sweep:
+    """State of a sweep: the triangles built so far and the convex hull around them.
+
+    Triangle ``t`` is made of the half-edges ``3 * t``, ``3 * t + 1`` and ``3 * t + 2``: half-edge ``e`` goes from
+    ``triangles[e]`` to the next vertex of its triangle, and ``halfedges[e]`` is its twin in the adjacent
+    triangle (-1 on the hull). The hull is a circular linked list of vertices, indexed by angle around the seed.
+
+    Args:
+        xs (list[float]): x coordinates of the points.
+        ys (list[float]): y coordinates of the points.
+        seed (tuple[int, int, int]): The clockwise seed triangle.
+
+    """
+
+    def __init__(self, xs: list[float], ys: list[float], seed: tuple[int, int, int]) -> None:
+        """Initialize the sweep with the seed triangle."""
+        self.xs = xs
+        self.ys = ys
+        n = len(xs)
+        i0, i1, i2 = seed
+        self.cx, self.cy, _ = _circumcircle(xs, ys, i0, i1, i2)
+        distances = [(x - self.cx) ** 2 + (y - self.cy) ** 2 for x, y in zip(xs, ys, strict=True)]
+        self.order = sorted(range(n), key=distances.__getitem__)
+
+        self.triangles: list[int] = []
+        self.halfedges: list[int] = []
+        self.hull_next = [0] * n
+        self.hull_prev = [0] * n
+        self.hull_tri = [0] * n
+        self.hash_size = ceil(sqrt(n))
+        self.hull_hash = [-1] * self.hash_size
+
+        self.hull_start = i0
+        self.hull_next[i0] = self.hull_prev[i2] = i1
+        self.hull_next[i1] = self.hull_prev[i0] = i2
+        self.hull_next[i2] = self.hull_prev[i1] = i0
+        self.hull_tri[i0], self.hull_tri[i1], self.hull_tri[i2] = 0, 1, 2
+        for i in seed:
+            self.hull_hash[self._hash_key(xs[i], ys[i])] = i
+        self._add_triangle(i0, i1, i2, -1, -1, -1)
+
+    def _hash_key(self, x: float, y: float) -> int:
+        """Return the hull hash bucket of a point, from its pseudo-angle around the seed circumcenter."""
+        dx = x - self.cx
+        dy = y - self.cy
+        p = dx / (abs(dx) + abs(dy))
+        angle = (3 - p if dy > 0 else 1 + p) / 4
+        return int(angle * self.hash_size) % self.hash_size
+
+    def _visible(self, i: int, a: int, b: int) -> bool:
+        """Check if vertex i sees the hull edge from a to b, i.e. lies strictly outside of it."""
+        xs, ys = self.xs, self.ys
+        return orientation(xs[i], ys[i], xs[a], ys[a], xs[b], ys[b]) > 0
+
+    def add(self, i: int) -> None:
+        """Add vertex i, outside the current hull, to the triangulation."""
+        hull_next, hull_prev, hull_tri = self.hull_next, self.hull_prev, self.hull_tri
+        x, y = self.xs[i], self.ys[i]
+
+        # Find a visible hull edge, starting near the point's angle
+        key = self._hash_key(x, y)
+        start = 0
+        for j in range(self.hash_size):
+            start = self.hull_hash[(key + j) % self.hash_size]
+            if start != -1 and start != hull_next[start]:
+                break
+        start = hull_prev[start]
+        e = start
+        while not self._visible(i, e, hull_next[e]):
+            e = hull_next[e]
+            if e == start:
+                # On the hull or inside it, as the sweep order is rounded
+                self._add_inside(i, hull_tri[start])
+                return
+
+        # Add the first triangle, then walk the hull both ways while edges stay visible
+        t = self._add_triangle(e, i, hull_next[e], -1, -1, hull_tri[e])
+        hull_tri[i] = self._legalize(t + 2)
+        hull_tri[e] = t
+
+        after = hull_next[e]
+        while self._visible(i, after, hull_next[after]):
+            q = hull_next[after]
+            t = self._add_triangle(after, i, q, hull_tri[i], -1, hull_tri[after])
+            hull_tri[i] = self._legalize(t + 2)
+            hull_next[after] = after  # removed from the hull
+            after = q
+
+        if e == start:
+            while self._visible(i, hull_prev[e], e):
+                q = hull_prev[e]
+                t = self._add_triangle(q, i, e, -1, hull_tri[e], hull_tri[q])
+                self._legalize(t + 2)
+                hull_tri[q] = t
+                hull_next[e] = e  # removed from the hull
+                e = q
+
+        self.hull_start = hull_prev[i] = e
+        hull_next[e] = hull_prev[after] = i
+        hull_next[i] = after
+        self.hull_hash[key] = i
+        self.hull_hash[self._hash_key(self.xs[e], self.ys[e])] = e
+
+    def _add_inside(self, i: int, start: int) -> None:
+        """Add vertex i, on the current hull or inside it, by splitting the triangle or the edge it lies on.
+
+        Args:
+            i (int): The vertex to add.
+            start (int): A half-edge near the vertex, to start looking for its triangle from.
+
+        """
+        h, on_edge = self._locate(i, start)
+        if not on_edge:
+            self._split_triangle(i, h)
+        elif self.halfedges[h] == -1:
+            self._split_hull_edge(i, h)
+        else:
+            self._split_edge(i, h)
+
+    def _locate(self, i: int, start: int) -> tuple[int, bool]:
+        """Find the triangle holding vertex i, walking towards it across the edges it lies beyond.
+
+        The walk ends as the triangulation is Delaunay, and stays inside the hull as vertex i does not see any hull edge.
+
+        Returns:
+            tuple[int, bool]: The half-edge that vertex i lies on, if any, and True; or the first half-edge
+                of the triangle vertex i lies strictly inside, and False.
+
+        """
+        triangles, halfedges, xs, ys = self.triangles, self.halfedges, self.xs, self.ys
+        x, y = xs[i], ys[i]
+        t = start - start % 3
+        while True:
+            on_edge = -1
+            for h in (t, t + 1, t + 2):
+                a, b = triangles[h], triangles[t + (h + 1) % 3]
+                side = orientation(xs[a], ys[a], xs[b], ys[b], x, y)
+                if side > 0:
+                    break
+                if side == 0:
+                    on_edge = h
+            else:
+                return (on_edge, True) if on_edge != -1 else (t, False)
+            t = halfedges[h] - halfedges[h] % 3
+
+    def _split_triangle(self, i: int, t: int) -> None:
+        """Split triangle t in three around vertex i, strictly inside it."""
+        triangles, halfedges = self.triangles, self.halfedges
+        a, b, c = triangles[t], triangles[t + 1], triangles[t + 2]
+        bc, ca = halfedges[t + 1], halfedges[t + 2]
+        # t becomes a, b, i, and the new triangles b, c, i and c, a, i
+        triangles[t + 2] = i
+        t1 = self._add_triangle(b, c, i, bc, -1, t + 1)
+        t2 = self._add_triangle(c, a, i, ca, t + 2, t1 + 1)
+        if bc == -1:
+            self.hull_tri[b] = t1
+        if ca == -1:
+            self.hull_tri[c] = t2
+        for e in (t, t1, t2):
+            self._legalize(e)
+
+    def _split_hull_edge(self, i: int, h: int) -> None:
+        """Split the hull half-edge h, from a to b, at vertex i, which becomes a hull vertex between them."""
+        triangles, halfedges = self.triangles, self.halfedges
+        h0 = h - h % 3
+        hb, hc = h0 + (h + 1) % 3, h0 + (h + 2) % 3
+        a, b, c = triangles[h], triangles[hb], triangles[hc]
+        bc = halfedges[hb]
+        # The triangle of h becomes a, i, c, and the new one i, b, c
+        triangles[hb] = i
+        t1 = self._add_triangle(i, b, c, -1, bc, hb)
+        if bc == -1:
+            self.hull_tri[b] = t1 + 1
+        self.hull_tri[i] = t1
+        self.hull_next[a] = self.hull_prev[b] = i
+        self.hull_prev[i] = a
+        self.hull_next[i] = b
+        self.hull_hash[self._hash_key(self.xs[i], self.ys[i])] = i
+        for e in (hc, t1 + 1):
+            self._legalize(e)
+
+    def _split_edge(self, i: int, h: int) -> None:
+        """Split the inner half-edge h, from a to b, and its twin at vertex i, making four triangles of two."""
+        triangles, halfedges = self.triangles, self.halfedges
+        g = halfedges[h]
+        h0, g0 = h - h % 3, g - g % 3
+        hb, hc = h0 + (h + 1) % 3, h0 + (h + 2) % 3
+        g1, g2 = g0 + (g + 1) % 3, g0 + (g + 2) % 3
+        a, b, c, d = triangles[h], triangles[hb], triangles[hc], triangles[g2]
+        bc, ad = halfedges[hb], halfedges[g1]
+        # The triangle of h becomes a, i, c, that of g becomes b, i, d, and the new ones are i, b, c and i, a, d
+        triangles[hb] = i
+        triangles[g1] = i
+        t1 = self._add_triangle(i, b, c, g, bc, hb)
+        t2 = self._add_triangle(i, a, d, h, ad, g1)
+        if bc == -1:
+            self.hull_tri[b] = t1 + 1
+        if ad == -1:
+            self.hull_tri[a] = t2 + 1
+        for e in (hc, t1 + 1, g2, t2 + 1):
+            self._legalize(e)
+
+    def _link(self, a: int, b: int) -> None:
+        """Make half-edges a and b twins."""
+        self.halfedges[a] = b
+        if b != -1:
+            self.halfedges[b] = a
+
+    def _add_triangle(self, i0: int, i1: int, i2: int, a: int, b: int, c: int) -> int:
+        """Add triangle i0, i1, i2, whose half-edges are twins of a, b and c.
+
+        Returns:
+            int: The first half-edge of the new triangle.
+
+        """
+        t = len(self.triangles)
+        self.triangles += (i0, i1, i2)
+        self.halfedges += (-1, -1, -1)
+        self._link(t, a)
+        self._link(t + 1, b)
+        self._link(t + 2, c)
+        return t
+
+    def _legalize(self, a: int) -> int:
+        """Flip half-edge a, and the edges it exposes, until they are all locally Delaunay.
+
+        Returns:
+            int: The half-edge that ends up where ``a + 1`` was, for the hull bookkeeping.
+
+        """
+        triangles, halfedges, xs, ys = self.triangles, self.halfedges, self.xs, self.ys
+        stack: list[int] = []
+        while True:
+            b = halfedges[a]
+            a0 = a - a % 3
+            ar = a0 + (a + 2) % 3
+            if b == -1:
+                if not stack:
+                    break
+                a = stack.pop()
+                continue
+
+            b0 = b - b % 3
+            al = a0 + (a + 1) % 3
+            bl = b0 + (b + 2) % 3
+            p0, pr, pl, p1 = triangles[ar], triangles[a], triangles[al], triangles[bl]
+            # p0, pr, pl is clockwise
+            if in_circle_det(xs[p0], ys[p0], xs[pr], ys[pr], xs[pl], ys[pl], xs[p1], ys[p1]) < 0:
+                triangles[a] = p1
+                triangles[b] = p0
+                hbl = halfedges[bl]
+                if hbl == -1:
+                    # The flipped edge was on the hull: fix the hull's reference to it
+                    e = self.hull_start
+                    while True:
+                        if self.hull_tri[e] == bl:
+                            self.hull_tri[e] = a
+                            break
+                        e = self.hull_prev[e]
+                        if e == self.hull_start:
+                            break
+                self._link(a, hbl)
+                self._link(b, halfedges[ar])
+                self._link(ar, bl)
+                stack.append(b0 + (b + 1) % 3)
+            else:
+                if not stack:
+                    break
+                a = stack.pop()
+        return ar
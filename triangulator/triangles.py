@@ -1,11 +1,15 @@
 """Module for managing a set of triangles defined by a PointSet and a list of triangles."""
 
-from collections.abc import Iterable, Iterator
-from struct import calcsize, pack, unpack
+import os
+import struct
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from struct import calcsize, pack, unpack_from
+from typing import BinaryIO
 
 from .data_types import Point as _Point
 from .data_types import Triangle as _Triangle
-from .pointset import PointSet
+from .pointset import CHUNK_SIZE, PointSet, _from_network_order, _map, _MappedArray, _to_network_order, _write_chunks
 
 type Point = _Point|tuple[float, float]
 type Triangle = _Triangle|tuple[int, int, int]
@@ -14,6 +18,11 @@ type Triangle = _Triangle|tuple[int, int, int]
 class Triangles:
     """A set of triangles defined by a PointSet and a list of triangles.
 
+    The vertex indices are stored in a flat array of unsigned 32-bit integers, three per triangle,
+    and Triangle objects are only created when triangles are read. A hash index from the sorted indices
+    of each triangle to its position is built when first needed, so duplicates are detected in constant time.
+    Triangles can also be read from a memory-mapped file (see `open_mmap`), in which case they are read-only.
+
     Args:
         points (Iterable[Point|tuple[float, float]] | None): An iterable of points to initialize the PointSet.
         triangles (Iterable[Triangle|tuple[int, int, int]] | None): An iterable of triangles to initialize the set of triangles.
@@ -36,12 +45,116 @@ class Triangles:
             triangles (Iterable[Triangle] | None, optional): _triangles to initialize the set of triangles. Defaults to None.
         
         """
-        self._points = PointSet(points) if points is not None else PointSet()
-        self._triangles : list[_Triangle] = []
+        if isinstance(points, PointSet):
+            self._points = PointSet.from_coordinates(points.xs, points.ys)
+        else:
+            self._points = PointSet(points) if points is not None else PointSet()
+        self._indices = array('I')
+        self._index : dict[tuple[int, int, int], int] | None = {}
         if triangles is not None:
+            indices = []
             for triangle in triangles:
-                self.add_triangle(triangle)
-        
+                indices.extend(_vertices(triangle))
+            self._set_indices(_to_indices(indices))
+
+    @classmethod
+    def from_indices(cls, points: Iterable[Point], indices: Iterable[int]) -> 'Triangles':
+        """Build a Triangles object from a flat sequence of vertex indices, validated all at once.
+
+        Args:
+            points (Iterable[Point]): The points of the triangles.
+            indices (Iterable[int]): The vertex indices, three per triangle.
+
+        Raises:
+            ValueError: If the number of indices is not a multiple of 3.
+            ValueError: If any index is out of bounds of the points set.
+            ValueError: If any triangle has non-distinct points.
+            ValueError: If duplicate triangles are found (regardless of the order of the points).
+
+        Returns:
+            Triangles: The triangles, in the given order.
+
+        """
+        triangles = cls(points)
+        triangles._set_indices(_to_indices(indices))
+        return triangles
+
+    @classmethod
+    def _from_trusted(cls, points: PointSet, indices: array) -> 'Triangles':
+        """Build a Triangles object from the output of a triangulation engine, without copying nor validating it.
+
+        The PointSet is shared with the caller, and the index array is owned by the result.
+
+        Args:
+            points (PointSet): The points of the triangles.
+            indices (array): The vertex indices of valid, distinct triangles, three per triangle, as unsigned 32-bit integers.
+
+        Returns:
+            Triangles: The triangles, in the given order.
+
+        """
+        triangles = cls()
+        triangles._points = points
+        triangles._indices = indices
+        triangles._index = None
+        return triangles
+
+    def _set_indices(self, indices: array) -> None:
+        """Replace all the triangles, after validating them, taking ownership of the index array.
+
+        The duplicate check uses a temporary set: the index is left to be built when first needed.
+
+        Raises:
+            ValueError: If the indices do not describe valid, distinct triangles.
+
+        """
+        if len(indices) % 3:
+            raise ValueError("The number of indices must be a multiple of 3.")
+        if indices and max(indices) >= len(self._points):
+            raise ValueError("Triangle index out of bounds of the points set.")
+        keys = set()
+        for triangle in _triples(indices):
+            key = _key(triangle)
+            if key is None:
+                raise ValueError("The three points of a triangle must be distinct.")
+            keys.add(key)
+        if len(keys) != len(indices) // 3:
+            raise ValueError("Triangle already exists in the set.")
+        self._indices = indices
+        self._index = None
+
+    def _get_index(self) -> dict[tuple[int, int, int], int]:
+        """Return the index from sorted vertex indices to triangle index, building it if needed."""
+        if self._index is None:
+            self._index = {_key(triangle): i for i, triangle in enumerate(_triples(self._indices))}
+        return self._index
+
+    def _check(self, triangle: tuple[int, int, int], error: type[Exception]) -> tuple[int, int, int]:
+        """Validate the vertex indices of a triangle.
+
+        Args:
+            triangle (tuple[int, int, int]): The vertex indices.
+            error (type[Exception]): The exception raised for an index out of bounds of the points set.
+
+        Raises:
+            ValueError: If the three points are not distinct.
+
+        Returns:
+            tuple[int, int, int]: The sorted vertex indices, key of the triangle in the index.
+
+        """
+        if not all(0 <= i < len(self._points) for i in triangle):
+            raise error("Triangle index out of bounds of the points set.")
+        key = _key(triangle)
+        if key is None:
+            raise ValueError("The three points of a triangle must be distinct.")
+        return key
+
+    def _check_writable(self) -> None:
+        """Raise TypeError if the Triangles are memory-mapped."""
+        if not isinstance(self._indices, array):
+            raise TypeError("Memory-mapped Triangles are read-only.")
+
     @property
     def points(self) -> PointSet:
         """Return the PointSet of points used in the triangles.
@@ -62,15 +175,22 @@ class Triangles:
             IndexError: If any index in the triangle is out of bounds of the points set.
             ValueError: If the three points are not distinct.
             ValueError: If a triangle with the same points already exists, regardless of the order of the points.
+            TypeError: If the Triangles are memory-mapped.
 
         Returns:
             int: The index of the added triangle.
 
         """
-        if not isinstance(triangle, _Triangle):
-            triangle = _Triangle(*triangle)
-        self._triangles.append(triangle)
-        return len(self._triangles) - 1
+        self._check_writable()
+        vertices = _vertices(triangle)
+        key = self._check(vertices, IndexError)
+        index = self._get_index()
+        if key in index:
+            raise ValueError("Triangle already exists in the set.")
+        position = len(self)
+        index[key] = position
+        self._indices.extend(vertices)
+        return position
     
     def remove_triangle(self, triangle_or_id : Triangle|int) -> None:
         """Remove a triangle from the set.
@@ -81,14 +201,41 @@ class Triangles:
         Raises:
             ValueError: If the triangle does not exist in the set.
             IndexError: If the index is out of bounds.
+            TypeError: If the Triangles are memory-mapped.
 
         """
+        self._check_writable()
         if isinstance(triangle_or_id, int):
-            del self._triangles[triangle_or_id]
+            index = range(len(self))[triangle_or_id]
+            self._get_index().pop(_key(self._triple(index)))
         else:
-            if not isinstance(triangle_or_id, _Triangle):
-                triangle_or_id = _Triangle(*triangle_or_id)
-            self._triangles.remove(triangle_or_id)
+            vertices = _vertices(triangle_or_id)
+            found = self._get_index().pop(_key(vertices), None)
+            if found is None:
+                raise ValueError("Triangle does not exist in the set.")
+            index = found
+        del self._indices[3 * index:3 * index + 3]
+        if index < len(self):
+            # The following triangles moved: rebuild the index when it is next needed
+            self._index = None
+
+    def _triple(self, index: int) -> tuple[int, int, int]:
+        """Return the vertex indices of the triangle at a non-negative index."""
+        indices = self._indices
+        return indices[3 * index], indices[3 * index + 1], indices[3 * index + 2]
+
+    @property
+    def indices(self) -> Sequence[int]:
+        """Return the vertex indices of the triangles.
+
+        The array is the storage of the Triangles, shared without copying: it must not be modified.
+
+        Returns:
+            Sequence[int]: The vertex indices, three per triangle, as a contiguous array of unsigned 32-bit integers,
+                or a read-only view decoding them from the file if the Triangles are memory-mapped.
+
+        """
+        return self._indices
     
     def __iter__(self) -> Iterator[Triangle]:
         """Return an iterator over the triangles in the set.
@@ -97,7 +244,8 @@ class Triangles:
             Iterable[Triangle]: An iterator over the triangles in the set.
 
         """
-        yield from self._triangles
+        for triangle in _triples(self._indices):
+            yield _Triangle(*triangle)
     
     def nb_triangles(self) -> int:
         """Return the number of triangles in the set.
@@ -106,7 +254,7 @@ class Triangles:
             int: The number of triangles in the set.
 
         """
-        return len(self._triangles)
+        return len(self._indices) // 3
     
     def __len__(self) -> int:
         """Return the number of triangles in the set.
@@ -130,7 +278,7 @@ class Triangles:
             Triangle: The triangle at the given index.
 
         """
-        return self._triangles[index]
+        return _Triangle(*self._triple(range(len(self))[index]))
     
     def set_triangle(self, index: int, value: Triangle) -> None:
         """Set the triangle at the given index.
@@ -144,11 +292,19 @@ class Triangles:
             ValueError: If any index in the triangle is out of bounds of the points set.
             ValueError: If the three points are not distinct.
             ValueError: If a triangle with the same points already exists, regardless of the order of the points.
+            TypeError: If the Triangles are memory-mapped.
 
         """
-        if not isinstance(value, _Triangle):
-            value = _Triangle(*value)
-        self._triangles[index] = value
+        self._check_writable()
+        index = range(len(self))[index]
+        vertices = _vertices(value)
+        key = self._check(vertices, ValueError)
+        lookup = self._get_index()
+        if lookup.get(key, index) != index:
+            raise ValueError("Triangle already exists in the set.")
+        del lookup[_key(self._triple(index))]
+        self._indices[3 * index:3 * index + 3] = array('I', vertices)
+        lookup[key] = index
     
     def __eq__(self, other: object) -> bool:
         """Check if two Triangles objects are equal.
@@ -164,7 +320,8 @@ class Triangles:
 
         """
         if isinstance(other, Triangles):
-            return self._points == other._points and self._triangles == other._triangles
+            return self._points == other._points and len(self) == len(other) and \
+                all(_key(a) == _key(b) for a, b in zip(_triples(self._indices), _triples(other._indices), strict=True))
         raise TypeError("Can only compare Triangles with another Triangles object.")
     
     def to_bytes(self) -> bytes:
@@ -182,19 +339,59 @@ class Triangles:
             bytes: The serialized Triangles.
 
         """
-        data = self._points.to_bytes()
-        data += pack('!L', len(self._triangles))
-        for triangle in self._triangles:
-            data += pack('!III', *triangle.indices)
-        return data
+        return self._points.to_bytes() + pack('!L', len(self)) + _to_network_order(self._indices[:])
+
+    def iter_bytes(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Serialize the Triangles in chunks, without building the whole payload.
+
+        Args:
+            chunk_size (int, optional): Number of points, or triangles, per chunk. Defaults to CHUNK_SIZE.
+
+        Returns:
+            Iterator[bytes]: The chunks of the PointSet, then the header and the triangles by chunks.
+                Joined, they are the output of `to_bytes`.
+
+        """
+        yield from self._points.iter_bytes(chunk_size)
+        yield from self.iter_triangle_bytes(chunk_size)
+
+    def iter_triangle_bytes(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Serialize the second part of the Triangles, describing the triangles, in chunks.
+
+        Args:
+            chunk_size (int, optional): Number of triangles per chunk. Defaults to CHUNK_SIZE.
+
+        Returns:
+            Iterator[bytes]: The header, then the triangles by chunks. Preceded by the chunks of the PointSet,
+                they are the output of `to_bytes`.
+
+        """
+        yield pack('!L', len(self))
+        for start in range(0, len(self._indices), 3 * chunk_size):
+            yield _to_network_order(self._indices[start:start + 3 * chunk_size])
+
+    def write_to(self, stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+        """Write the serialized Triangles to a binary file-like object, in chunks.
+
+        Args:
+            stream (BinaryIO): The object to write to.
+            chunk_size (int, optional): Number of points, or triangles, per chunk. Defaults to CHUNK_SIZE.
+
+        Returns:
+            int: The number of bytes written.
+
+        """
+        return _write_chunks(stream, self.iter_bytes(chunk_size))
 
     
     @classmethod
-    def from_bytes(cls, data: bytes) -> 'Triangles':
+    def from_bytes(cls, data: bytes | memoryview) -> 'Triangles':
         """Deserializes bytes to a Triangles object.
 
+        The points and the triangles are decoded in blocks, without copying the data.
+
         Args:
-            data (bytes): The serialized Triangles.
+            data (bytes | memoryview): The serialized Triangles.
 
         Raises:
             ValueError: If the data is invalid or corrupted.
@@ -206,22 +403,57 @@ class Triangles:
         offset = 0
         if len(data) < 4:
             raise ValueError("Invalid data: too short to contain number of points.")
-        nb_points = unpack('!L', data[:4])[0]
+        view = memoryview(data)
+        nb_points = unpack_from('!L', view)[0]
         point_size = calcsize('!ff')
-        pointset = PointSet.from_bytes_with_size(data[4:point_size * nb_points + 4], nb_points)
+        pointset = PointSet.from_bytes_with_size(view[4:point_size * nb_points + 4], nb_points)
         try:
             ps_size = 4 + nb_points * 8
             offset += ps_size
-            nb_triangles = unpack('!L', data[offset:offset + 4])[0]
+            nb_triangles = unpack_from('!L', view, offset)[0]
             offset += 4
-            triangles = []
-            for _ in range(nb_triangles):
-                p1, p2, p3 = unpack('!III', data[offset:offset + 12])
-                triangles.append((p1, p2, p3))
-                offset += 12
-            return cls(points=pointset, triangles=triangles)
+            indices = _from_network_order('I', view[offset:offset + 12 * nb_triangles])
+            if len(indices) != 3 * nb_triangles:
+                raise ValueError("Invalid data: size does not match number of triangles.")
+            triangles = cls()
+            triangles._points = pointset
+            triangles._set_indices(indices)
+            return triangles
         except Exception as e:
             raise ValueError("Invalid or corrupted data for Triangles deserialization.") from e
+
+    @classmethod
+    def open_mmap(cls, path: str | os.PathLike) -> 'Triangles':
+        """Map a file holding serialized Triangles (see `to_bytes`), without reading it.
+
+        Points and vertex indices are decoded from the mapping when they are read, so memory use depends on
+        the pages touched, not on the size of the file. The Triangles and their PointSet are read-only,
+        and are not validated, since that would read the whole file.
+
+        Args:
+            path (str | os.PathLike): The file to map.
+
+        Raises:
+            ValueError: If the size of the file does not match the number of points and triangles.
+
+        Returns:
+            Triangles: The read-only Triangles.
+
+        """
+        mapping = _map(path)
+        try:
+            nb_points = unpack_from('!L', mapping)[0]
+            offset = 4 + nb_points * calcsize('!ff')
+            nb_triangles = unpack_from('!L', mapping, offset)[0]
+        except struct.error as e:
+            raise ValueError("Invalid data: too short to contain the numbers of points and triangles.") from e
+        if len(mapping) != offset + 4 + nb_triangles * calcsize('!III'):
+            raise ValueError("Invalid data: size does not match numbers of points and triangles.")
+        triangles = cls()
+        triangles._points = PointSet._from_mapping(mapping, 4, nb_points)
+        triangles._indices = _MappedArray(mapping, offset + 4, 3 * nb_triangles, 'I')
+        triangles._index = None
+        return triangles
     
     def __repr__(self) -> str:
         """Return a string representation of the Triangles.
@@ -230,4 +462,48 @@ class Triangles:
             str: A string representation of the Triangles.
 
         """
-        return f"Triangles(points={self._points}, triangles={self._triangles})"
\ No newline at end of file
+        return f"Triangles(points={self._points}, triangles={list(self)})"
+
+
+def _vertices(triangle: Triangle) -> tuple[int, int, int]:
+    """Return the vertex indices of a triangle given as a Triangle or a tuple."""
+    if isinstance(triangle, _Triangle):
+        if len(triangle.indices) != 3:
+            raise ValueError("The three points of a triangle must be distinct.")
+        a, b, c = sorted(triangle.indices)
+        return a, b, c
+    a, b, c = triangle
+    return a, b, c
+
+
+def _to_indices(indices: Iterable[int]) -> array:
+    """Copy vertex indices into an array of unsigned 32-bit integers.
+
+    Raises:
+        ValueError: If an index is negative or too large.
+
+    """
+    try:
+        return array('I', indices)
+    except OverflowError as e:
+        raise ValueError("Triangle index out of bounds of the points set.") from e
+
+
+def _triples(indices: array) -> Iterator[tuple[int, int, int]]:
+    """Group a flat array of vertex indices by triangle."""
+    iterator = iter(indices)
+    return zip(iterator, iterator, iterator, strict=True)
+
+
+def _key(triangle: tuple[int, int, int]) -> tuple[int, int, int] | None:
+    """Return the sorted vertex indices of a triangle, or None if they are not distinct."""
+    a, b, c = triangle
+    if a > b:
+        a, b = b, a
+    if b > c:
+        b, c = c, b
+        if a > b:
+            a, b = b, a
+    if a == b or b == c:
+        return None
+    return a, b, c
@@ -1,50 +1,148 @@
 """Triangulator module."""
 
-from typing import cast
+import asyncio
+import os
+from array import array
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import BinaryIO
 
+from .cache import ResultCache
 from .data_types import Point as _Point
-from .pointset import PointSet
-from .PSM import PointSetManager
+from .mesh import HalfEdgeMesh
+from .parallel import MIN_PARTITION_SIZE, parallel_divide_and_conquer
+from .pointset import CHUNK_SIZE, PointSet
+from .predicates import BATCH_MIN_SIZE, HAS_NUMPY, in_circle, in_circle_batch, in_circle_det, np, orientation, orientation_batch
+from .PSM import ASYNC_CONNECTIONS, CONNECTIONS, PointSetManager
+from .singleflight import SingleFlight
+from .spatial_sort import brio_order, hilbert_order
+from .store import ResultStore
+from .sweep_hull import sweep_hull
 from .triangles import Triangles
+from .workers import WorkerPool
 
+INSERTION_ORDERS = ("input", "hilbert", "brio")
+ENGINES = ("bowyer-watson", "divide-and-conquer", "sweep-hull")
 
-def triangulate(points: PointSet) -> Triangles:
-    """Triangulate a set of points using Bowyer-Watson algorithm.
+# Serialized triangulations by digest of their points (see PointSet.digest), shared by get_and_compute and get_and_stream,
+# so point sets registered under several IDs are triangulated once
+RESULT_CACHE = ResultCache.from_environment()
+# Digests of the points retrieved for each point set ID, so cached results are found without retrieving the points again.
+# Entries expire with the results, which bounds how long a changed point set could be served stale.
+POINT_SET_DIGESTS = ResultCache(65536 * 32, RESULT_CACHE.ttl)
+# Persistent store of the serialized triangulations and of the digests of the IDs, with the same keys,
+# if TRIANGULATION_STORE_DIR is set. It is looked up after RESULT_CACHE, and filled along with it.
+RESULT_STORE = ResultStore.from_environment()
+# Retrievals of point sets by ID, and triangulations by digest, in flight: concurrent requests for the same point set
+# wait for the first one instead of retrieving and triangulating it again
+FETCHES = SingleFlight()
+TRIANGULATIONS = SingleFlight()
+# Worker processes running the triangulations of get_and_compute and get_and_stream on several cores,
+# if TRIANGULATION_WORKERS is set, failing with PoolFullError when too many are waiting. Triangulations run
+# in the calling thread otherwise.
+WORKERS = WorkerPool.from_environment()
+
+
+def triangulate(points: PointSet, order: str = "brio", engine: str = "bowyer-watson", workers: int | None = 1, min_partition_size: int = MIN_PARTITION_SIZE) -> Triangles:
+    """Triangulate a set of points.
+
+    Three engines are available:
+
+    - "bowyer-watson" inserts the points one by one in a super-triangle. Each point is located by walking
+      the triangle adjacency from the previous insertion, and the triangles it invalidates are found by
+      searching outwards from there. As the super-triangle is finite, thin triangles along the convex hull
+      can be missing from the result.
+    - "divide-and-conquer" is the Guibas-Stolfi algorithm, O(n log n) in the worst case. It always covers
+      the convex hull, and otherwise gives the same triangles as "bowyer-watson". With several workers,
+      the top levels of the recursion are split in vertical strips triangulated in parallel processes,
+      then merged in this process: the result is the same as with a single process.
+    - "sweep-hull" adds the points by distance from a seed, growing a convex hull with fans of triangles,
+      and restores the Delaunay property with edge flips. It gives the same triangles as "divide-and-conquer",
+      with the lowest constant factors, especially on large uniformly distributed sets.
+
+    Triangles are returned in canonical order (see `_canonical`), whatever the engine and insertion order.
 
     Args:
-        points (PointSet): The PointSet to triangulate.
+        points (PointSet): The PointSet to triangulate, possibly memory-mapped (see `PointSet.open_mmap`).
+        order (str, optional): Insertion order of the points for "bowyer-watson", one of INSERTION_ORDERS:
+            "input" keeps the PointSet order, "hilbert" follows a Hilbert curve and
+            "brio" inserts randomized rounds of growing size, each along a Hilbert curve. Defaults to "brio".
+        engine (str, optional): The triangulation engine, one of ENGINES. Defaults to "bowyer-watson".
+        workers (int | None, optional): Number of worker processes for "divide-and-conquer",
+            None for one per CPU. Defaults to 1, triangulating in this process.
+        min_partition_size (int, optional): Minimum number of points triangulated by a worker
+            for "divide-and-conquer". Defaults to MIN_PARTITION_SIZE.
 
     Returns:
         Triangles: The triangulated result.
 
     Raises:
         ValueError: If the point set has fewer than 3 points or all points are collinear.
+        ValueError: If the insertion order or the engine is unknown.
+        ValueError: If workers or min_partition_size is not positive.
 
     """
+    if order not in INSERTION_ORDERS:
+        raise ValueError(f"Unknown insertion order: {order}")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown triangulation engine: {engine}")
+    if workers is not None and workers < 1:
+        raise ValueError("The number of workers must be positive.")
+    if min_partition_size < 1:
+        raise ValueError("The minimum partition size must be positive.")
+
     n = len(points)
-    
-    # Validate input
-    if n < 3:
-        raise ValueError("At least 3 points are required for triangulation.")
-    
-    # Check if all points are collinear
-    if n >= 3 and _are_collinear(points):
-        raise ValueError("All points are collinear, cannot triangulate.")
+    _check_triangulable(points)
     
     # For 3 points, return a single triangle
     if n == 3:
-        return Triangles(points=points, triangles=[(0, 1, 2)])
-    
+        return Triangles._from_trusted(points, array('I', (0, 1, 2)))
+
+    # Lists index faster than arrays in the engines' loops
+    xs = points.xs.tolist()
+    ys = points.ys.tolist()
+    if engine == "divide-and-conquer":
+        mesh = parallel_divide_and_conquer(xs, ys, workers, min_partition_size)
+    elif engine == "sweep-hull":
+        mesh = sweep_hull(xs, ys)
+    else:
+        mesh = _bowyer_watson(xs, ys, order)
+    return mesh.to_triangles(points)
+
+
+def _check_triangulable(points: PointSet) -> None:
+    """Check that a PointSet can be triangulated.
+
+    Args:
+        points (PointSet): The PointSet to check.
+
+    Raises:
+        ValueError: If the point set has fewer than 3 points or all points are collinear.
+
+    """
+    if len(points) < 3:
+        raise ValueError("At least 3 points are required for triangulation.")
+    if _are_collinear(points):
+        raise ValueError("All points are collinear, cannot triangulate.")
+
+
+def _bowyer_watson(xs: list[float], ys: list[float], order: str) -> HalfEdgeMesh:
+    """Triangulate points with the Bowyer-Watson algorithm.
+
+    Args:
+        xs (list[float]): x coordinates of the points.
+        ys (list[float]): y coordinates of the points.
+        order (str): Insertion order of the points, one of INSERTION_ORDERS.
+
+    Returns:
+        HalfEdgeMesh: The clockwise triangles.
+
+    """
+    n = len(xs)
+
     # Create super-triangle that contains all points
-    min_x = min_y = float('inf')
-    max_x = max_y = float('-inf')
-    
-    for i in range(n):
-        point = cast(_Point, points.get_point(i))
-        min_x = min(min_x, point.x)
-        max_x = max(max_x, point.x)
-        min_y = min(min_y, point.y)
-        max_y = max(max_y, point.y)
+    min_x, max_x = min(xs), max(xs)
+    min_y, max_y = min(ys), max(ys)
     
     dx = max_x - min_x
     dy = max_y - min_y
@@ -52,71 +150,30 @@ def triangulate(points: PointSet) -> Triangles:
     mid_x = (min_x + max_x) / 2
     mid_y = (min_y + max_y) / 2
     
-    # Create super-triangle vertices
-    super_points = [
-        _Point(mid_x - 20 * delta_max, mid_y - delta_max),
-        _Point(mid_x, mid_y + 20 * delta_max),
-        _Point(mid_x + 20 * delta_max, mid_y - delta_max)
-    ]
-    
     # Build complete point set with super-triangle
-    all_points: list[_Point] = [cast(_Point, points.get_point(i)) for i in range(n)] + super_points
-    triangles_list = [(n, n + 1, n + 2)]  # Start with super-triangle
-    
+    all_xs = [*xs, mid_x - 20 * delta_max, mid_x, mid_x + 20 * delta_max]
+    all_ys = [*ys, mid_y - delta_max, mid_y + 20 * delta_max, mid_y - delta_max]
+    mesh = _AdjacencyMesh(all_xs, all_ys, (n, n + 1, n + 2))
+
     # Add each point one at a time
-    for i in range(n):
-        point = all_points[i]
-        bad_triangles = []
-        
-        # Find all triangles whose circumcircle contains the point
-        for tri_idx, tri in enumerate(triangles_list):
-            if _in_circumcircle(point, tri, all_points):
-                bad_triangles.append(tri_idx)
-        
-        # Find the boundary of the polygonal hole
-        polygon = []
-        for tri_idx in bad_triangles:
-            tri = triangles_list[tri_idx]
-            edges = [
-                (tri[0], tri[1]),
-                (tri[1], tri[2]),
-                (tri[2], tri[0])
-            ]
-            
-            for edge in edges:
-                # Check if edge is shared with another bad triangle
-                is_shared = False
-                for other_idx in bad_triangles:
-                    if other_idx == tri_idx:
-                        continue
-                    other_tri = triangles_list[other_idx]
-                    other_edges = [
-                        (other_tri[0], other_tri[1]),
-                        (other_tri[1], other_tri[2]),
-                        (other_tri[2], other_tri[0])
-                    ]
-                    if edge in other_edges or (edge[1], edge[0]) in other_edges:
-                        is_shared = True
-                        break
-                
-                if not is_shared:
-                    polygon.append(edge)
-        
-        # Remove bad triangles
-        for tri_idx in sorted(bad_triangles, reverse=True):
-            triangles_list.pop(tri_idx)
-        
-        # Re-triangulate the polygonal hole
-        for edge in polygon:
-            triangles_list.append((edge[0], edge[1], i))
-    
-    # Remove triangles that share a vertex with the super-triangle
-    final_triangles = []
-    for tri in triangles_list:
-        if tri[0] < n and tri[1] < n and tri[2] < n:
-            final_triangles.append(tri)
-    
-    return Triangles(points=points, triangles=final_triangles)
+    if order == "hilbert":
+        sequence = hilbert_order(xs, ys)
+    elif order == "brio":
+        sequence = brio_order(xs, ys)
+    else:
+        sequence = range(n)
+    for i in sequence:
+        mesh.insert(i)
+
+    # Remove triangles that share a vertex with the super-triangle, and free slots, which hold -1.
+    # The twins are only found if the mesh is queried for them, as exporting it does not need them.
+    vertices = mesh.vertices
+    kept = array('I')
+    for t in range(0, len(vertices), 3):
+        a, b, c = vertices[t:t + 3]
+        if 0 <= a < n and 0 <= b < n and 0 <= c < n:
+            kept.extend((a, b, c))
+    return HalfEdgeMesh(kept)
 
 
 def _are_collinear(points: PointSet) -> bool:
@@ -132,17 +189,14 @@ def _are_collinear(points: PointSet) -> bool:
     if len(points) < 3:
         return True
     
-    p0 = cast(_Point, points.get_point(0))
-    p1 = cast(_Point, points.get_point(1))
-    
-    for i in range(2, len(points)):
-        p2 = cast(_Point, points.get_point(i))
-        # Calculate cross product
-        cross = (p1.x - p0.x) * (p2.y - p0.y) - (p1.y - p0.y) * (p2.x - p0.x)
-        if abs(cross) > 1e-10:  # Not collinear
-            return False
+    xs, ys = points.xs, points.ys
+
+    if HAS_NUMPY and len(points) >= BATCH_MIN_SIZE:
+        # Slices of the columns are arrays of doubles, whether the points are in memory or memory-mapped
+        cross = orientation_batch(xs[0], ys[0], xs[1], ys[1], np.frombuffer(xs[2:]), np.frombuffer(ys[2:]))
+        return not bool(np.any(cross != 0))
     
-    return True
+    return all(orientation(xs[0], ys[0], xs[1], ys[1], xs[i], ys[i]) == 0 for i in range(2, len(points)))
 
 
 def _in_circumcircle(point: _Point, triangle: tuple[int, int, int], all_points: list[_Point]) -> bool:
@@ -160,41 +214,561 @@ def _in_circumcircle(point: _Point, triangle: tuple[int, int, int], all_points:
     p0 = all_points[triangle[0]]
     p1 = all_points[triangle[1]]
     p2 = all_points[triangle[2]]
-    
-    # Translate point to origin
-    ax = p0.x - point.x
-    ay = p0.y - point.y
-    bx = p1.x - point.x
-    by = p1.y - point.y
-    cx = p2.x - point.x
-    cy = p2.y - point.y
-    
-    # Calculate the determinant
-    det = (ax * ax + ay * ay) * (bx * cy - cx * by) - \
-          (bx * bx + by * by) * (ax * cy - cx * ay) + \
-          (cx * cx + cy * cy) * (ax * by - bx * ay)
-    
-    # Check triangle orientation and adjust
-    orientation = (p1.x - p0.x) * (p2.y - p0.y) - (p1.y - p0.y) * (p2.x - p0.x)
-    
-    # If triangle is clockwise, flip the determinant sign
-    if orientation < 0:
-        det = -det
-    
-    return det > 0
+    return in_circle(p0.x, p0.y, p1.x, p1.y, p2.x, p2.y, point.x, point.y)
+
+
+class _AdjacencyMesh:
+    """Triangle mesh with neighbour links, used by the Bowyer-Watson insertion loop.
+
+    Triangles are stored in slots: slot ``t`` has vertices ``vertices[3 * t:3 * t + 3]`` and
+    ``neighbours[3 * t + k]`` is the slot across the edge starting at its k-th vertex (-1 if none).
+    Slots freed by a cavity are reused by the triangles that fill it.
+
+    Args:
+        xs (list[float]): x coordinates of every vertex, super-triangle included.
+        ys (list[float]): y coordinates of every vertex, super-triangle included.
+        first (tuple[int, int, int]): The initial triangle, enclosing every other vertex.
+
+    """
+
+    def __init__(self, xs: list[float], ys: list[float], first: tuple[int, int, int]) -> None:
+        """Initialize the mesh with a single triangle."""
+        self.xs = xs
+        self.ys = ys
+        self.vertices: list[int] = list(first)
+        self.neighbours: list[int] = [-1, -1, -1]
+        self.free: list[int] = []
+        self.last = 0
+        self._arrays = None
+
+    def _contains(self, t: int, px: float, py: float) -> bool:
+        """Check if (px, py) lies in triangle t or on its boundary."""
+        xs, ys, vertices = self.xs, self.ys, self.vertices
+        base = 3 * t
+        for k in range(3):
+            a = vertices[base + k]
+            b = vertices[base + (k + 1) % 3]
+            if orientation(xs[a], ys[a], xs[b], ys[b], px, py) > 0:
+                return False
+        return True
+
+    def _in_circle(self, t: int, px: float, py: float) -> bool:
+        """Check if (px, py) is inside the circumcircle of triangle t."""
+        xs, ys, vertices = self.xs, self.ys, self.vertices
+        a, b, c = vertices[3 * t], vertices[3 * t + 1], vertices[3 * t + 2]
+        # Triangles are clockwise
+        return in_circle_det(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], px, py) < 0
+
+    def _in_circle_many(self, candidates: list[int], px: float, py: float) -> list[int]:
+        """Return the triangles among candidates whose circumcircle contains (px, py).
+
+        Large batches are evaluated at once with NumPy when it is available.
+        """
+        if not HAS_NUMPY or len(candidates) < BATCH_MIN_SIZE:
+            return [t for t in candidates if self._in_circle(t, px, py)]
+        if self._arrays is None:
+            self._arrays = (np.asarray(self.xs), np.asarray(self.ys))
+        xs, ys = self._arrays
+        vertices = self.vertices
+        corners = np.array([vertices[3 * t:3 * t + 3] for t in candidates])
+        a, b, c = corners[:, 0], corners[:, 1], corners[:, 2]
+        inside = in_circle_batch(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], px, py)
+        return [t for t, flag in zip(candidates, inside.tolist(), strict=True) if flag]
+
+    def locate(self, px: float, py: float) -> int:
+        """Find the triangle containing (px, py) by walking from the last created triangle.
+
+        Triangles are clockwise, so the point lies beyond an edge when it is on its left.
+
+        Returns:
+            int: The slot of the containing triangle.
+
+        """
+        xs, ys, vertices, neighbours = self.xs, self.ys, self.vertices, self.neighbours
+        t = self.last
+        for _ in range(len(self.neighbours) // 3):
+            base = 3 * t
+            for k in range(3):
+                a = vertices[base + k]
+                b = vertices[base + (k + 1) % 3]
+                nxt = neighbours[base + k]
+                if nxt != -1 and orientation(xs[a], ys[a], xs[b], ys[b], px, py) > 0:
+                    t = nxt
+                    break
+            else:
+                return t
+        # The walk can only cycle on numerically degenerate meshes: fall back to a full scan.
+        for t in range(len(self.neighbours) // 3):
+            if vertices[3 * t] != -1 and self._contains(t, px, py):
+                return t
+        return self.last
+
+    def insert(self, i: int) -> None:
+        """Insert vertex i, replacing the triangles whose circumcircle contains it.
+
+        Args:
+            i (int): The index of the vertex to insert.
+
+        """
+        vertices, neighbours = self.vertices, self.neighbours
+        px, py = self.xs[i], self.ys[i]
 
+        # Grow the cavity from the containing triangle across neighbours, one ring at a time
+        start = self.locate(px, py)
+        cavity = [start]
+        visited = {start}
+        ring = [start]
+        while ring:
+            candidates = []
+            for t in ring:
+                for k in range(3):
+                    other = neighbours[3 * t + k]
+                    if other != -1 and other not in visited:
+                        visited.add(other)
+                        candidates.append(other)
+            ring = self._in_circle_many(candidates, px, py)
+            cavity += ring
+        bad = set(cavity)
+
+        # Boundary edges of the cavity are the edges facing a triangle outside of it
+        boundary = []
+        for t in cavity:
+            base = 3 * t
+            for k in range(3):
+                other = neighbours[base + k]
+                if other not in bad:
+                    boundary.append((vertices[base + k], vertices[base + (k + 1) % 3], other))
+            vertices[base] = vertices[base + 1] = vertices[base + 2] = -1
+            self.free.append(t)
+
+        # Re-triangulate the cavity by joining each boundary edge to the new vertex
+        starting_at: dict[int, int] = {}
+        ending_at: dict[int, int] = {}
+        for a, b, other in boundary:
+            t = self._new_triangle(a, b, i)
+            neighbours[3 * t] = other
+            if other != -1:
+                # The shared edge runs from b to a in the outer triangle
+                base = 3 * other
+                for k in range(3):
+                    if vertices[base + k] == b:
+                        neighbours[base + k] = t
+                        break
+            starting_at[a] = t
+            ending_at[b] = t
+        for a, b, _ in boundary:
+            t = starting_at[a]
+            neighbours[3 * t + 1] = starting_at[b]
+            neighbours[3 * t + 2] = ending_at[a]
+            self.last = t
+
+    def _new_triangle(self, a: int, b: int, c: int) -> int:
+        """Store triangle (a, b, c) in a free slot, or a new one.
+
+        Returns:
+            int: The slot of the triangle.
+
+        """
+        if self.free:
+            t = self.free.pop()
+            self.vertices[3 * t:3 * t + 3] = (a, b, c)
+        else:
+            t = len(self.neighbours) // 3
+            self.vertices += (a, b, c)
+            self.neighbours += (-1, -1, -1)
+        return t
+
+    def triangles(self) -> list[tuple[int, int, int]]:
+        """Return the live triangles.
+
+        Returns:
+            list[tuple[int, int, int]]: The vertex indices of each triangle.
+
+        """
+        vertices = self.vertices
+        return [(vertices[t], vertices[t + 1], vertices[t + 2]) for t in range(0, len(vertices), 3) if vertices[t] != -1]
 
 
 def get_and_compute(point_set_id: str) -> bytes:
     """Retrieve a PointSet by its ID using the PointSetManager, triangulate it, and return the serialized Triangles.
 
+    Results are kept in RESULT_CACHE and RESULT_STORE, so a point set requested again is neither retrieved
+    nor triangulated again, and point sets with the same points under different IDs are triangulated once.
+    Concurrent calls for the same point set share one retrieval and one triangulation, and their errors.
+
     Args:
         point_set_id (str): The ID of the PointSet to retrieve and triangulate.
 
     Returns:
         bytes: The serialized Triangles object.
 
+    """
+    return _computed_result(*_find_result(point_set_id))
+
+
+async def get_and_compute_async(point_set_id: str) -> bytes:
+    """Do the same as `get_and_compute` from an event loop, without blocking it.
+
+    The PointSet is retrieved with `PointSetManager.get_point_set_async`, and the triangulation, or the read of a stored
+    result, runs in the default executor of the loop. Calls share RESULT_CACHE, RESULT_STORE, the retrievals in flight
+    with `get_and_stream_async`, and the triangulations in flight with every other call.
+
+    Args:
+        point_set_id (str): The ID of the PointSet to retrieve and triangulate.
+
+    Returns:
+        bytes: The serialized Triangles object.
+
+    """
+    result, known = _known_result(point_set_id)
+    if isinstance(result, bytes):
+        return result
+    point_set, key = None, None if known is None else known.hex()
+    if result is None:
+        point_set, digest = await FETCHES.do_async(point_set_id, lambda: _fetch_async(point_set_id))
+        key = digest.hex()
+        result = _cached_result(key) if digest != known else None
+        if isinstance(result, bytes):
+            return result
+    return await asyncio.get_running_loop().run_in_executor(None, _computed_result, result, point_set, key)
+
+
+def get_and_stream(point_set_id: str) -> tuple[Iterator[bytes] | BinaryIO, int | None]:
+    """Retrieve a PointSet by its ID, and serialize its triangulation in chunks while it is computed.
+
+    The PointSet is retrieved and checked by this call, so its errors are raised before anything is sent.
+    The chunks of the PointSet come first, then the triangulation is computed, and the triangles follow.
+    Results share RESULT_CACHE and RESULT_STORE with `get_and_compute`: a cached result is returned in one chunk,
+    and a stored one as an open file, to be sent from the disk as it is. Concurrent calls for the same point set
+    share one retrieval and one triangulation with each other and with `get_and_compute`: each call serializes
+    its own points, and only the triangles are kept in memory until the last call sent them.
+
+    Args:
+        point_set_id (str): The ID of the PointSet to retrieve and triangulate.
+
+    Returns:
+        tuple[Iterator[bytes] | BinaryIO, int | None]: The chunks of the serialized Triangles, or a file holding them,
+            and their total size if it is known beforehand, None otherwise.
+
+    """
+    return _stream_result(*_find_result(point_set_id))
+
+
+async def get_and_stream_async(point_set_id: str) -> tuple[Iterator[bytes] | BinaryIO, int | None]:
+    """Do the same as `get_and_stream` from an event loop, without blocking it.
+
+    The PointSet is retrieved with `PointSetManager.get_point_set_async`, and the CPU work runs in the default executor
+    of the loop. Calls share RESULT_CACHE, RESULT_STORE and the triangulations in flight with `get_and_stream`.
+
+    Args:
+        point_set_id (str): The ID of the PointSet to retrieve and triangulate.
+
+    Returns:
+        tuple[Iterator[bytes] | BinaryIO, int | None]: The chunks of the serialized Triangles, or a file holding them,
+            and their total size if it is known beforehand, None otherwise. Getting the next chunk may block
+            while the triangulation is computed, so it should be done in an executor too.
+
+    """
+    result, known = _known_result(point_set_id)
+    if result is not None:
+        return _stream_result(result, None, known.hex())
+    point_set, digest = await FETCHES.do_async(point_set_id, lambda: _fetch_async(point_set_id))
+    result = _cached_result(digest.hex()) if digest != known else None
+    return await asyncio.get_running_loop().run_in_executor(None, _stream_result, result, point_set, digest.hex())
+
+
+def compute_and_stream(point_set: PointSet) -> tuple[Iterator[bytes] | BinaryIO, int | None]:
+    """Do the same as `get_and_stream` for a PointSet the caller already has, without the PointSet API.
+
+    Results are looked up and kept by the digest of the points, so they are shared with the point sets retrieved by ID.
+
+    Args:
+        point_set (PointSet): The PointSet to triangulate.
+
+    Raises:
+        ValueError: If the point set has fewer than 3 points or all points are collinear.
+
+    Returns:
+        tuple[Iterator[bytes] | BinaryIO, int | None]: The chunks of the serialized Triangles, or a file holding them,
+            and their total size if it is known beforehand, None otherwise.
+
+    """
+    key = point_set.digest().hex()
+    return _stream_result(_cached_result(key), point_set, key)
+
+
+def get_and_compute_batch(point_set_ids: list[str], concurrency: int | None = None) -> Iterator[tuple[int, bytes | Exception]]:
+    """Do `get_and_compute` for several point sets at once, yielding each result as soon as it is complete.
+
+    The point sets are retrieved concurrently on the connections of CONNECTIONS, and triangulated in parallel
+    by WORKERS if it is enabled, with no more point sets at once than WORKERS takes jobs, so the batch alone
+    does not fill it. Nothing starts before the first result is requested, and the calls not started yet
+    are cancelled when the iterator is closed.
+
+    Args:
+        point_set_ids (list[str]): The IDs of the PointSets to retrieve and triangulate.
+        concurrency (int | None, optional): The number of point sets handled at once,
+            None for one per connection of CONNECTIONS. Defaults to None. It is capped by the capacity of WORKERS.
+
+    Returns:
+        Iterator[tuple[int, bytes | Exception]]: The index of each point set in point_set_ids, with its serialized Triangles
+            or the error `get_and_compute` raised for it, in completion order.
+
+    """
+    if not point_set_ids:
+        return
+    executor = ThreadPoolExecutor(_batch_concurrency(len(point_set_ids), concurrency or CONNECTIONS.max_connections))
+    try:
+        futures = {executor.submit(get_and_compute, point_set_id): index for index, point_set_id in enumerate(point_set_ids)}
+        for future in as_completed(futures):
+            error = future.exception()
+            yield futures[future], future.result() if error is None else error
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def get_and_compute_batch_async(point_set_ids: list[str], concurrency: int | None = None) -> AsyncIterator[tuple[int, bytes | Exception]]:
+    """Do the same as `get_and_compute_batch` from an event loop, with a task per point set doing `get_and_compute_async`.
+
+    The point sets are retrieved concurrently on the connections of ASYNC_CONNECTIONS, holding no thread meanwhile.
+    Nothing starts before the first result is requested, and the tasks not done yet are cancelled when the iterator is closed.
+
+    Args:
+        point_set_ids (list[str]): The IDs of the PointSets to retrieve and triangulate.
+        concurrency (int | None, optional): The number of point sets handled at once,
+            None for one per connection of ASYNC_CONNECTIONS. Defaults to None. It is capped by the capacity of WORKERS.
+
+    Returns:
+        AsyncIterator[tuple[int, bytes | Exception]]: The index of each point set in point_set_ids, with its serialized Triangles
+            or the error `get_and_compute_async` raised for it, in completion order.
+
+    """
+    if not point_set_ids:
+        return
+    slots = asyncio.Semaphore(_batch_concurrency(len(point_set_ids), concurrency or ASYNC_CONNECTIONS.max_connections))
+
+    async def compute(index: int, point_set_id: str) -> tuple[int, bytes | Exception]:
+        async with slots:
+            try:
+                return index, await get_and_compute_async(point_set_id)
+            except Exception as e:
+                return index, e
+
+    tasks = [asyncio.ensure_future(compute(index, point_set_id)) for index, point_set_id in enumerate(point_set_ids)]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _batch_concurrency(size: int, concurrency: int) -> int:
+    """Return the number of point sets of a batch handled at once, capped by its size and by the capacity of WORKERS, so the batch alone does not fill it."""
+    concurrency = min(size, concurrency)
+    if WORKERS is not None:
+        concurrency = min(concurrency, WORKERS.workers + WORKERS.max_pending)
+    return concurrency
+
+
+def _computed_result(result: bytes | BinaryIO | None, point_set: PointSet | None, key: str) -> bytes:
+    """Return what `get_and_compute` returns for a result found by `_find_result`, triangulating the point set if needed."""
+    if isinstance(result, bytes):
+        return result
+    if result is not None:
+        with result:
+            data = result.read()
+        RESULT_CACHE.put(key, data)
+        return data
+    job = _submit(key, point_set)
+    if job is None:
+        return TRIANGULATIONS.do(key, lambda: _compute(key, point_set))
+    return job[2] + _job_result(key, job)
+
+
+def _stream_result(result: bytes | BinaryIO | None, point_set: PointSet | None, key: str) -> tuple[Iterator[bytes] | BinaryIO, int | None]:
+    """Return what `get_and_stream` returns for a result found by `_find_result`, starting the triangulation stream if needed."""
+    if isinstance(result, bytes):
+        return iter([result]), len(result)
+    if result is not None:
+        return result, os.fstat(result.fileno()).st_size
+    _check_triangulable(point_set)
+    # The job is submitted before the response starts, so a full pool is reported with its own status
+    return _stream_triangulation(key, point_set, _submit(key, point_set)), None
+
+
+def _find_result(point_set_id: str) -> tuple[bytes | BinaryIO | None, PointSet | None, str]:
+    """Look up the triangulation of a point set in RESULT_CACHE, then in RESULT_STORE, by the digest of its points.
+
+    The point set is only retrieved when the digest of its ID is not known, or its triangulation is not cached nor stored.
+
+    Args:
+        point_set_id (str): The ID of the point set.
+
+    Returns:
+        tuple[bytes | BinaryIO | None, PointSet | None, str]: The cached triangulation, a file open on the stored one,
+            or None; the PointSet if it was retrieved (always the case when there is no triangulation) or None;
+            and the key of the triangulation.
+
+    """
+    result, known = _known_result(point_set_id)
+    if result is not None:
+        return result, None, known.hex()
+    point_set, digest = FETCHES.do(point_set_id, lambda: _fetch(point_set_id))
+    # The result of another ID with the same points may be cached
+    result = _cached_result(digest.hex()) if digest != known else None
+    return result, point_set, digest.hex()
+
+
+def _known_result(point_set_id: str) -> tuple[bytes | BinaryIO | None, bytes | None]:
+    """Look up the triangulation of a point set by the digest known for its ID, without retrieving it.
+
+    Returns:
+        tuple[bytes | BinaryIO | None, bytes | None]: The cached triangulation, a file open on the stored one, or None;
+            and the digest known for the ID, or None.
+
+    """
+    known = POINT_SET_DIGESTS.get(point_set_id)
+    if known is None and RESULT_STORE is not None:
+        known = RESULT_STORE.digest_of(point_set_id)
+        if known is not None:
+            POINT_SET_DIGESTS.put(point_set_id, known)
+    if known is None:
+        return None, None
+    return _cached_result(known.hex()), known
+
+
+def _fetch(point_set_id: str) -> tuple[PointSet, bytes]:
+    """Retrieve a point set, and record the digest of its points for its ID.
+
+    Returns:
+        tuple[PointSet, bytes]: The point set, and its digest.
+
     """
     point_set = PointSetManager.get_point_set(point_set_id)
-    triangles = triangulate(point_set)
-    return triangles.to_bytes()
\ No newline at end of file
+    return point_set, _record_digest(point_set_id, point_set)
+
+
+async def _fetch_async(point_set_id: str) -> tuple[PointSet, bytes]:
+    """Do the same as `_fetch` from an event loop, hashing the points in the default executor.
+
+    Returns:
+        tuple[PointSet, bytes]: The point set, and its digest.
+
+    """
+    point_set = await PointSetManager.get_point_set_async(point_set_id)
+    return point_set, await asyncio.get_running_loop().run_in_executor(None, _record_digest, point_set_id, point_set)
+
+
+def _record_digest(point_set_id: str, point_set: PointSet) -> bytes:
+    """Compute the digest of the points of a point set, and record it for its ID.
+
+    Returns:
+        bytes: The digest.
+
+    """
+    digest = point_set.digest()
+    POINT_SET_DIGESTS.put(point_set_id, digest)
+    if RESULT_STORE is not None:
+        RESULT_STORE.set_digest(point_set_id, digest)
+    return digest
+
+
+def _compute(key: str, points: PointSet) -> bytes:
+    """Triangulate a point set and keep the result, unless a call that just ended did.
+
+    Returns:
+        bytes: The serialized Triangles.
+
+    """
+    # The caller has already counted a miss for the key
+    data = RESULT_CACHE.get(key) if key in RESULT_CACHE else None
+    if data is not None:
+        return data
+    data = triangulate(points).to_bytes()
+    _keep(key, [data])
+    return data
+
+
+def _job_result(key: str, job: 'tuple[Future[bytes], bool, bytes]') -> bytes:
+    """Wait for a job returned by `_submit`, and keep its result if this call submitted it.
+
+    Returns:
+        bytes: The serialized triangles, without the points.
+
+    """
+    future, submitted, points = job
+    block = future.result()
+    if submitted:
+        _keep(key, [points, block])
+    return block
+
+
+def _keep(key: str, chunks: list[bytes]) -> None:
+    """Put a serialized triangulation in RESULT_CACHE if it fits, and in RESULT_STORE."""
+    if sum(len(chunk) for chunk in chunks) <= RESULT_CACHE.max_bytes:
+        RESULT_CACHE.put(key, b"".join(chunks))
+    if RESULT_STORE is not None:
+        RESULT_STORE.put(key, chunks)
+
+
+def _cached_result(key: str) -> bytes | BinaryIO | None:
+    """Return a triangulation from RESULT_CACHE, or else a file open on it in RESULT_STORE, or None if it is in neither."""
+    data = RESULT_CACHE.get(key)
+    if data is None and RESULT_STORE is not None:
+        return RESULT_STORE.open(key)
+    return data
+
+
+def _stream_triangulation(key: str, points: PointSet, job: 'tuple[Future[bytes], bool, bytes] | None') -> Iterator[bytes]:
+    """Serialize a PointSet in chunks, then wait for its triangulation in TRIANGULATIONS, and yield the triangles in chunks.
+
+    The points are serialized by each caller, so only the triangulation in flight is shared between them.
+    """
+    if job is None:
+        yield from points.iter_bytes()
+        data, start = TRIANGULATIONS.do(key, lambda: _compute(key, points)), 4 + 8 * len(points)
+    else:
+        # The points were already serialized for the job
+        yield from _slices(job[2])
+        data, start = _job_result(key, job), 0
+    yield from _slices(data, start)
+
+
+def _slices(data: bytes, start: int = 0) -> Iterator[bytes]:
+    """Split the end of a payload in chunks of as many bytes as Triangles.iter_triangle_bytes yields, three indices per triangle."""
+    for offset in range(start, len(data), 12 * CHUNK_SIZE):
+        yield data[offset:offset + 12 * CHUNK_SIZE]
+
+
+def _submit(key: str, points: PointSet) -> 'tuple[Future[bytes], bool, bytes] | None':
+    """Submit the triangulation of a point set to WORKERS, or join the one in flight in TRIANGULATIONS.
+
+    Raises:
+        PoolFullError: If the queue of WORKERS is full.
+
+    Returns:
+        tuple[Future[bytes], bool, bytes] | None: The serialized triangles, without the points; whether this call
+            submitted the job, so it keeps the result; and the serialized PointSet, for the caller to reuse.
+            None if WORKERS is disabled.
+
+    """
+    if WORKERS is None:
+        return None
+    # Serialized before joining, as TRIANGULATIONS holds its lock, for every key, while the job is submitted
+    payload = points.to_bytes()
+    future, submitted = TRIANGULATIONS.join(key, lambda: WORKERS.submit(_triangulate_in_worker, payload))
+    return future, submitted, payload
+
+
+def _triangulate_in_worker(data: bytes) -> bytes:
+    """Triangulate a PointSet in a worker process, receiving and returning the binary formats of the API.
+
+    Args:
+        data (bytes): The serialized PointSet.
+
+    Returns:
+        bytes: The serialized triangles of the Triangles, without the points, which the caller already has.
+
+    """
+    return b"".join(triangulate(PointSet.from_bytes(data)).iter_triangle_bytes())
@@ -0,0 +1,137 @@
+"""Bounded pool of worker processes, failing fast when it is full."""
+
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from typing import TypeVar
+
+# Defaults of the pool used by the triangulator, overridden by the environment variables TRIANGULATION_WORKERS
+# (the pool is only enabled when it is set and positive), TRIANGULATION_MAX_PENDING, TRIANGULATION_JOBS_PER_WORKER
+# and TRIANGULATION_RETRY_AFTER (in seconds)
+DEFAULT_MAX_PENDING_PER_WORKER = 2
+DEFAULT_JOBS_PER_WORKER = 100
+DEFAULT_RETRY_AFTER = 1
+
+T = TypeVar("T")
+
+
+class PoolFullError(Exception):
+    """Raised when a job is submitted to a WorkerPool whose queue is full.
+
+    Args:
+        retry_after (int): The number of seconds after which the client may retry.
+
+    """
+
+    def __init__(self, retry_after: int) -> None:
+        """Initialize the error."""
+        super().__init__(f"The triangulation queue is full, retry in {retry_after} seconds.")
+        self.retry_after = retry_after
+
+
+class WorkerPool:
+    """A pool of worker processes, with a bounded number of jobs waiting for a worker.
+
+    Jobs run outside the GIL of the calling process, so they use as many cores as there are workers.
+    A job submitted while all the workers are busy and max_pending jobs are already waiting is rejected
+    at once with PoolFullError, instead of queueing until clients time out. Each worker is replaced by a fresh
+    process after max_jobs_per_worker jobs, which returns the memory it fragmented to the system.
+
+    Args:
+        workers (int): The number of worker processes.
+        max_pending (int): The maximum number of jobs waiting for a worker.
+        max_jobs_per_worker (int, optional): The number of jobs after which a worker is replaced. Defaults to DEFAULT_JOBS_PER_WORKER.
+        retry_after (int, optional): The number of seconds to advertise to rejected clients. Defaults to DEFAULT_RETRY_AFTER.
+
+    Raises:
+        ValueError: If workers, max_jobs_per_worker or retry_after is not positive, or max_pending is negative.
+
+    """
+
+    def __init__(self, workers: int, max_pending: int, max_jobs_per_worker: int = DEFAULT_JOBS_PER_WORKER, retry_after: int = DEFAULT_RETRY_AFTER) -> None:
+        """Initialize the pool. Worker processes are started on demand."""
+        if workers < 1:
+            raise ValueError("The number of workers must be positive.")
+        if max_pending < 0:
+            raise ValueError("The number of pending jobs must not be negative.")
+        if max_jobs_per_worker < 1:
+            raise ValueError("The number of jobs per worker must be positive.")
+        if retry_after < 1:
+            raise ValueError("The retry delay must be positive.")
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.retry_after = retry_after
+        # Recycling workers requires them to be spawned rather than forked
+        self.__executor = ProcessPoolExecutor(workers, max_tasks_per_child=max_jobs_per_worker)
+        self.__slots = threading.BoundedSemaphore(workers + max_pending)
+        self.__lock = threading.Lock()
+        self.rejected = 0
+
+    @classmethod
+    def from_environment(cls) -> 'WorkerPool | None':
+        """Build a pool configured by the TRIANGULATION_WORKERS, TRIANGULATION_MAX_PENDING, TRIANGULATION_JOBS_PER_WORKER and TRIANGULATION_RETRY_AFTER environment variables.
+
+        Raises:
+            ValueError: If a variable is not a valid number.
+
+        Returns:
+            WorkerPool | None: The pool, with DEFAULT_MAX_PENDING_PER_WORKER pending jobs per worker, DEFAULT_JOBS_PER_WORKER
+                and DEFAULT_RETRY_AFTER for unset variables, or None if TRIANGULATION_WORKERS is unset or 0.
+
+        """
+        workers = int(os.getenv("TRIANGULATION_WORKERS") or 0)
+        if workers == 0:
+            return None
+        max_pending = os.getenv("TRIANGULATION_MAX_PENDING")
+        max_jobs_per_worker = os.getenv("TRIANGULATION_JOBS_PER_WORKER")
+        retry_after = os.getenv("TRIANGULATION_RETRY_AFTER")
+        return cls(workers,
+                   int(max_pending) if max_pending else workers * DEFAULT_MAX_PENDING_PER_WORKER,
+                   int(max_jobs_per_worker) if max_jobs_per_worker else DEFAULT_JOBS_PER_WORKER,
+                   int(retry_after) if retry_after else DEFAULT_RETRY_AFTER)
+
+    def submit(self, function: Callable[..., T], *args: object) -> 'Future[T]':
+        """Run a function in a worker process, if the queue has room for it.
+
+        Args:
+            function (Callable[..., T]): A function importable by the workers, as it is pickled by reference.
+            *args (object): The arguments of the function, pickled to the worker. Bytes cost the least.
+
+        Raises:
+            PoolFullError: If all the workers are busy and max_pending jobs are already waiting.
+
+        Returns:
+            Future[T]: The result of the function, or the exception it raised.
+
+        """
+        if not self.__slots.acquire(blocking=False):
+            with self.__lock:
+                self.rejected += 1
+            raise PoolFullError(self.retry_after)
+        try:
+            job = self.__executor.submit(function, *args)
+        except BaseException:
+            self.__slots.release()
+            raise
+        future: Future[T] = Future()
+        job.add_done_callback(partial(self.__release, future))
+        return future
+
+    def shutdown(self) -> None:
+        """Stop the workers once their jobs are done, cancelling the pending ones."""
+        self.__executor.shutdown(cancel_futures=True)
+
+    def __release(self, future: Future, job: Future) -> None:
+        """Free the slot of a finished or cancelled job, then pass its outcome on, so the callers it wakes can submit again at once."""
+        self.__slots.release()
+        if future.done():
+            return
+        if job.cancelled():
+            future.cancel()
+        elif job.exception() is not None:
+            future.set_exception(job.exception())
+        else:
+            future.set_result(job.result())